@@ -2,10 +2,8 @@ from flask import Flask
 from flask_cors import CORS
 from flask_pymongo import PyMongo
 from flask_jwt_extended import JWTManager
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
+import threading
+from config import Config
 
 mongo = PyMongo()
 jwt = JWTManager()
@@ -18,11 +16,29 @@ def create_app():
     app.config['JWT_COOKIE_CSRF_PROTECT'] = False  # Disable CSRF protection for simplicity in development
     
     # Load configuration
-    app.config['MONGO_URI'] = os.getenv('MONGO_URI')
-    app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY')
+    app.config['MONGO_URI'] = Config.MONGO_URI
+    app.config['JWT_SECRET_KEY'] = Config.JWT_SECRET_KEY
     
+    from app.utils.serialization import FastJSONProvider
+    app.json = FastJSONProvider(app)
+
     # Initialize extensions
-    mongo.init_app(app)
+    from app.utils import metrics
+    mongo.init_app(
+        app,
+        maxPoolSize=Config.MONGO_MAX_POOL_SIZE,
+        minPoolSize=Config.MONGO_MIN_POOL_SIZE,
+        waitQueueTimeoutMS=Config.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        serverSelectionTimeoutMS=Config.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        readPreference=Config.MONGO_READ_PREFERENCE,
+        event_listeners=[metrics.MongoCommandTimer()],
+    )
+    metrics.init_app(app)
+    if Config.ADMISSION_ENABLED:
+        from app.utils import admission
+        admission.init_app(app)
+    from app.utils import http_cache
+    http_cache.init_app(app)
     jwt.init_app(app)
     CORS(app, supports_credentials=True, origins=["*"])
     
@@ -33,12 +49,35 @@ def create_app():
     from app.routes.cd_routes import cd_bp
     from app.routes.user_routes import user_bp
     from app.routes.health_routes import health_bp
+    from app.routes.schedule_routes import schedule_bp
+    from app.routes.search_routes import search_bp
     
     app.register_blueprint(rmp_bp, url_prefix='/api/rmp')
     app.register_blueprint(sfuapi_bp, url_prefix='/api/sfuapi')
     app.register_blueprint(term_bp, url_prefix='/api/terms')
     app.register_blueprint(cd_bp, url_prefix='/api/cd')
     app.register_blueprint(user_bp, url_prefix='/api/user')
+    app.register_blueprint(schedule_bp, url_prefix='/api/schedules')
+    app.register_blueprint(search_bp, url_prefix='/api/search')
     app.register_blueprint(health_bp)
+
+    # Connect and build indexes in the background so an unreachable Mongo doesn't
+    # block startup; /ready reports not-ready until this has finished
+    from app.utils.startup import warm_up
+    threading.Thread(target=warm_up, daemon=True).start()
+
+    # Import everything that is otherwise loaded on first use, so pre-forked workers start warm
+    if Config.APP_PRELOAD:
+        from app.utils.startup import preload
+        preload()
+
+    # Page in the shared catalog files before a pre-forking server forks its workers
+    if Config.CATALOG_PRELOAD:
+        from app.utils.catalog_file import catalog_store
+        catalog_store.preload()
+
+    if Config.PREFETCH_ENABLED:
+        from app.utils.prefetch import prefetcher
+        prefetcher.start(Config.PREFETCH_INTERVAL)
     
     return app
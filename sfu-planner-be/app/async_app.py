@@ -0,0 +1,173 @@
+import asyncio
+import hashlib
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl
+from asgiref.sync import sync_to_async
+from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+from werkzeug.datastructures import Headers, MultiDict
+from werkzeug.http import parse_accept_header, parse_cookie, parse_etags
+from app import create_app
+from app.routes.async_routes import ASYNC_ROUTES
+from app.utils.admission import admit, retry_after_header
+from app.utils.async_client import async_sfu_client
+from app.utils.http_cache import CACHE_POLICIES, cache_control, encode_body
+from app.utils.metrics import RequestStats, current_request_stats, record_request
+from app.utils.serialization import loads
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Flask views run here rather than on asgiref's single shared thread, so slow views don't queue behind each other
+wsgi_executor = ThreadPoolExecutor(max_workers=Config.ASGI_WSGI_THREADS, thread_name_prefix='wsgi')
+
+
+class ThreadedWsgiToAsgiInstance(WsgiToAsgiInstance):
+    run_wsgi_app = sync_to_async(WsgiToAsgiInstance.__dict__['run_wsgi_app'].func, thread_sensitive=False, executor=wsgi_executor)
+
+
+class ThreadedWsgiToAsgi(WsgiToAsgi):
+    async def __call__(self, scope, receive, send):
+        await ThreadedWsgiToAsgiInstance(self.wsgi_application, self.duplicate_header_limit)(scope, receive, send)
+
+
+class AsyncRequest:
+    """The parts of a request that native routes and admission control read, built from an ASGI scope."""
+
+    def __init__(self, scope, body, blueprint):
+        self.method = scope['method']
+        self.path = scope['path']
+        self.blueprint = blueprint
+        self.args = MultiDict(parse_qsl(scope['query_string'].decode('latin-1'), keep_blank_values=True))
+        self.headers = Headers([(name.decode('latin-1'), value.decode('latin-1')) for name, value in scope['headers']])
+        self.cookies = parse_cookie(self.headers.get('Cookie', ''))
+        self.remote_addr = scope['client'][0] if scope.get('client') else None
+        self.body = body
+
+    @property
+    def json(self):
+        """The decoded body ({} if empty), or None if it isn't valid JSON."""
+        if not self.body:
+            return {}
+        try:
+            return loads(self.body)
+        except ValueError:
+            return None
+
+
+async def read_body(receive):
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get('body', b''))
+        if not message.get('more_body'):
+            return b''.join(chunks)
+
+
+class AsgiApp:
+    """The Flask app under an ASGI server, with ASYNC_ROUTES served natively on the event loop.
+
+    Every other route, including CORS preflights, goes to the Flask app on a thread pool.
+    Native routes get the same admission control, metrics, CORS and caching headers as
+    their Flask views.
+    """
+
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        self.wsgi = ThreadedWsgiToAsgi(flask_app)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self.lifespan(receive, send)
+        route = ASYNC_ROUTES.get((scope['method'], scope['path'])) if scope['type'] == 'http' else None
+        if route is None:
+            return await self.wsgi(scope, receive, send)
+        await self.dispatch(scope, receive, send, *route)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                # Share the upstream client's event loop with the server, so native routes await it directly
+                await async_sfu_client.bind_to_running_loop()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def dispatch(self, scope, receive, send, handler, blueprint, rule):
+        request = AsyncRequest(scope, await read_body(receive), blueprint)
+        start = time.perf_counter()
+        stats = RequestStats()
+        # Each ASGI request runs in its own task, so this doesn't leak into other requests
+        current_request_stats.set(stats)
+        headers = Headers()
+
+        body, status = await self.handle(request, handler, rule, headers)
+
+        # Rendered by the app's JSON provider, so bodies and ETags match the Flask views byte for byte
+        payload = self.flask_app.json.response(body).get_data()
+        headers['Content-Type'] = 'application/json'
+        payload, status = self.apply_http_caching(request, status, payload, headers)
+        self.apply_cors(request, headers)
+        headers['Server-Timing'] = record_request(rule, request.method, status, start, stats)
+        headers['Content-Length'] = str(len(payload))
+
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers.items()],
+        })
+        await send({'type': 'http.response.body', 'body': payload})
+
+    @staticmethod
+    async def handle(request, handler, rule, headers):
+        queue = None
+        if Config.ADMISSION_ENABLED:
+            # Waiting for a concurrency slot blocks, so it parks a worker thread rather than the event loop
+            queue, rejection = await asyncio.to_thread(admit, request)
+            if rejection is not None:
+                status, message, retry_after = rejection
+                headers['Retry-After'] = retry_after_header(retry_after)
+                return {'error': message}, status
+        try:
+            return await handler(request)
+        except Exception:
+            logger.exception("Unhandled error in %s %s", request.method, rule)
+            return {'error': 'Internal server error'}, 500
+        finally:
+            if queue is not None:
+                queue.release()
+
+    @staticmethod
+    def apply_http_caching(request, status, payload, headers):
+        policy = CACHE_POLICIES.get(request.blueprint)
+        if request.method != 'GET' or status != 200 or policy is None:
+            return payload, status
+
+        etag = hashlib.sha1(payload).hexdigest()
+        headers['ETag'] = f'W/"{etag}"'
+        headers['Cache-Control'] = cache_control(policy)
+        headers['Vary'] = 'Accept-Encoding'
+        if parse_etags(request.headers.get('If-None-Match')).contains_weak(etag):
+            del headers['Content-Type']
+            return b'', 304
+
+        payload, encoding = encode_body(payload, etag, policy[0], parse_accept_header(request.headers.get('Accept-Encoding')))
+        if encoding is not None:
+            headers['Content-Encoding'] = encoding
+        return payload, status
+
+    @staticmethod
+    def apply_cors(request, headers):
+        # Same as CORS(app, supports_credentials=True, origins=["*"]): the origin is echoed back
+        origin = request.headers.get('Origin')
+        if origin:
+            headers['Access-Control-Allow-Origin'] = origin
+            headers['Access-Control-Allow-Credentials'] = 'true'
+            headers.add('Vary', 'Origin')
+
+
+def create_asgi_app():
+    return AsgiApp(create_app())
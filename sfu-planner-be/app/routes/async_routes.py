@@ -0,0 +1,48 @@
+import asyncio
+from app.routes.cd_routes import parse_batch_request
+from app.routes.schedule_routes import parse_generate_request, offering_items, schedules_response
+from app.utils.cd_helpers import get_course_grades_async
+from app.utils.offerings import get_offerings_batch_async
+
+# Native versions of blueprint routes for SERVER_MODE=asgi. They share validation and
+# response building with the Flask views, but await Mongo and upstream calls on the
+# server's event loop, so in-flight waits don't each hold a thread. Handlers take an
+# AsyncRequest and return (JSON-serializable body, status).
+
+
+async def course_grade(request):
+    course = request.args.get("course")
+    if not course:
+        return {'error': 'No course parameter provided'}, 400
+
+    course_data = (await get_course_grades_async([course]))[course]
+    if course_data:
+        return course_data, 200
+    return {'error': 'Course not found'}, 404
+
+
+async def course_grades_batch(request):
+    courses, error = parse_batch_request(request.json)
+    if error:
+        return {'error': error}, 400
+
+    return await get_course_grades_async(courses), 200
+
+
+async def generate_schedules(request):
+    params, error = parse_generate_request(request.json)
+    if error:
+        return {"error": error}, 400
+    term_code, courses, limit, time_budget = params
+
+    offerings = await get_offerings_batch_async(offering_items(term_code, courses))
+    # Expanding and ranking the candidates is CPU-bound, so it runs off the event loop
+    return await asyncio.to_thread(schedules_response, term_code, courses, offerings, limit, time_budget)
+
+
+# (method, path) -> (handler, blueprint, URL rule), mirroring the blueprints' registration in create_app
+ASYNC_ROUTES = {
+    ('GET', '/api/cd/'): (course_grade, 'cd_bp', '/api/cd/'),
+    ('POST', '/api/cd/batch'): (course_grades_batch, 'cd_bp', '/api/cd/batch'),
+    ('POST', '/api/schedules/generate'): (generate_schedules, 'schedule_bp', '/api/schedules/generate'),
+}
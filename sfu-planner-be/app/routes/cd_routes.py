@@ -1,21 +1,40 @@
 from flask import Blueprint, request, jsonify
-from app import mongo
+from app.utils.cd_helpers import get_course_grades
+from config import Config
 
 cd_bp = Blueprint('cd_bp', __name__)
 
+def parse_batch_request(data):
+    """Validate a /batch body; returns (course names, None) or (None, error)."""
+    if not isinstance(data, dict):
+        return None, 'Request body must be a JSON object'
+    courses = data.get('courses')
+
+    if not isinstance(courses, list) or not all(isinstance(course, str) and course for course in courses):
+        return None, 'courses must be a list of course names'
+    if len(courses) > Config.CD_BATCH_MAX_COURSES:
+        return None, f'At most {Config.CD_BATCH_MAX_COURSES} courses per request'
+    return courses, None
+
 @cd_bp.route("/", methods=["GET"])
 def get_course_grade():
     course = request.args.get("course", None)
     
     if course:
-        # Fetch the document from the MongoDB collection where 'course_name' matches 'course'
-        course_data = mongo.db.mydatabase.find_one({"course_name": course})
+        # Fetch the document whose 'course_name' matches 'course'
+        course_data = get_course_grades([course])[course]
         
         if course_data:
-            # Convert ObjectId to string and exclude the '_id' field from the response
-            course_data['_id'] = str(course_data['_id'])
             return jsonify(course_data)
         else:
             return jsonify({'error': 'Course not found'}), 404
     else:
         return jsonify({'error': 'No course parameter provided'}), 400
+
+@cd_bp.route("/batch", methods=["POST"])
+def get_course_grades_batch():
+    courses, error = parse_batch_request(request.json or {})
+    if error:
+        return jsonify({'error': error}), 400
+
+    return jsonify(get_course_grades(courses))
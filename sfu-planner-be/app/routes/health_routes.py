@@ -1,7 +1,101 @@
-from flask import Blueprint, jsonify
+import math
+import time
+from flask import Blueprint, Response, jsonify, request
+from pymongo.errors import PyMongoError
+from app.utils.api_helpers import SFU_API_BASE_URL
+from app.utils.cache import api_cache
+from app.utils.http_client import sfu_client
+from app.utils.metrics import render_metrics, sample_stacks
+from app.utils.single_flight import course_flight
+from app.utils.startup import ping_mongo, warmed_up, warm_up_stats
+from config import Config
 
 health_bp = Blueprint('health_bp', __name__)
 
 @health_bp.route("/", methods=["GET"])
 def health_check():
     return jsonify({"status": "ok"})
+
+# Last upstream reachability result, so frequent probes don't all hit SFU
+upstream_check = {'checked_at': None, 'result': None}
+
+def check_upstream():
+    now = time.monotonic()
+    if upstream_check['checked_at'] is not None and now - upstream_check['checked_at'] < Config.READY_UPSTREAM_CHECK_INTERVAL:
+        return upstream_check['result']
+
+    # Straight through the pooled session: no retries, and the probe doesn't count against the breaker
+    import requests
+    start = time.perf_counter()
+    try:
+        response = sfu_client.session.get(SFU_API_BASE_URL, timeout=Config.READY_UPSTREAM_TIMEOUT)
+        response.close()
+        result = {'ok': response.status_code < 500, 'status': response.status_code}
+    except requests.RequestException as e:
+        result = {'ok': False, 'error': type(e).__name__}
+    result['latency_ms'] = round((time.perf_counter() - start) * 1000, 1)
+    result['breaker'] = sfu_client.breaker.state
+    upstream_check.update(checked_at=now, result=result)
+    return result
+
+@health_bp.route("/ready", methods=["GET"])
+def readiness_check():
+    """Ready once warm-up has finished and Mongo answers a ping (and, if required, SFU is reachable)."""
+    body = {'warmed_up': warmed_up.is_set(), 'warm_up': warm_up_stats}
+    ready = body['warmed_up']
+
+    try:
+        body['mongo'] = {'ok': True, 'latency_ms': round(ping_mongo() * 1000, 1)}
+    except PyMongoError as e:
+        body['mongo'] = {'ok': False, 'error': type(e).__name__}
+        ready = False
+
+    body['upstream'] = check_upstream()
+    if Config.READY_REQUIRE_UPSTREAM and not body['upstream']['ok']:
+        ready = False
+
+    body['status'] = 'ready' if ready else 'not ready'
+    return jsonify(body), 200 if ready else 503
+
+@health_bp.route("/cache/stats", methods=["GET"])
+def cache_stats():
+    stats = api_cache.get_stats()
+    stats['course_single_flight'] = course_flight.get_stats()
+    return jsonify(stats)
+
+@health_bp.route("/metrics", methods=["GET"])
+def metrics():
+    cache_lines = ["# HELP sfu_planner_cache_events_total Upstream response cache events.",
+                   "# TYPE sfu_planner_cache_events_total counter"]
+    stats = api_cache.get_stats()
+    for event in ('hits', 'shared_hits', 'misses', 'coalesced', 'evictions'):
+        cache_lines.append(f'sfu_planner_cache_events_total{{event="{event}"}} {stats[event]}')
+    cache_lines += ["# HELP sfu_planner_cache_bytes Bytes held by the in-process response cache.",
+                    "# TYPE sfu_planner_cache_bytes gauge",
+                    f"sfu_planner_cache_bytes {stats['bytes']}"]
+
+    # Coalescing: upstream URLs via the response cache, processed courses via course_flight
+    upstream_calls = stats['misses'] + stats['shared_hits'] + stats['coalesced']
+    flight_stats = course_flight.get_stats()
+    cache_lines += ["# HELP sfu_planner_single_flight_total Calls by single-flight outcome.",
+                    "# TYPE sfu_planner_single_flight_total counter"]
+    for outcome in ('leaders', 'followers', 'shared_followers'):
+        cache_lines.append(f'sfu_planner_single_flight_total{{flight="course",outcome="{outcome}"}} {flight_stats[outcome]}')
+    cache_lines += ["# HELP sfu_planner_coalescing_ratio Share of calls served by another caller's in-flight work.",
+                    "# TYPE sfu_planner_coalescing_ratio gauge",
+                    f'sfu_planner_coalescing_ratio{{flight="course"}} {flight_stats["coalescing_ratio"]}',
+                    f'sfu_planner_coalescing_ratio{{flight="upstream"}} {stats["coalesced"] / upstream_calls if upstream_calls else 0.0}']
+    return Response(render_metrics(cache_lines), mimetype='text/plain; version=0.0.4')
+
+@health_bp.route("/debug/profile", methods=["GET"])
+def profile():
+    if not Config.DEBUG_ENDPOINTS_ENABLED:
+        return jsonify({'error': 'Not found'}), 404
+    try:
+        seconds = float(request.args.get('seconds', 5))
+    except ValueError:
+        seconds = math.nan
+    if not math.isfinite(seconds) or seconds <= 0:
+        return jsonify({'error': 'seconds must be a positive number'}), 400
+    seconds = min(seconds, 60)
+    return Response(sample_stacks(seconds), mimetype='text/plain')
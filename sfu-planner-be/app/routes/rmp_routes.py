@@ -1,20 +1,27 @@
 from flask import Blueprint, request, jsonify
-import ratemyprofessor
+from app.utils.rmp_helpers import get_professor_ratings
+from config import Config
 
 rmp_bp = Blueprint('rmp_bp', __name__)
 
 @rmp_bp.route("/", methods=["GET"])
 def get_professor_rating():
     name = request.args.get("name", None)
-    professor = ratemyprofessor.get_professor_by_school_and_name(
-        ratemyprofessor.get_school_by_name("Simon Fraser University"), name)
-    if professor is None:
+    if not name:
         return jsonify({})
-                       
-    return jsonify({
-        'name': professor.name, 
-        'department': professor.department,
-        'rating': professor.rating,
-        'num_ratings': professor.num_ratings,
-        'difficulty': professor.difficulty,
-    })
+    rating = get_professor_ratings([name])[name]
+    if rating is None:
+        return jsonify({"error": "RateMyProfessor lookup failed"}), 502
+    return jsonify(rating)
+
+@rmp_bp.route("/batch", methods=["POST"])
+def get_professor_ratings_batch():
+    data = request.json or {}
+    names = data.get('names') if isinstance(data, dict) else None
+
+    if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
+        return jsonify({"error": "names must be a list of strings"}), 400
+    if len(names) > Config.RMP_BATCH_MAX_NAMES:
+        return jsonify({"error": f"At most {Config.RMP_BATCH_MAX_NAMES} names per request"}), 400
+
+    return jsonify(get_professor_ratings(names))
@@ -0,0 +1,67 @@
+from flask import Blueprint, request, jsonify
+from app.utils.offerings import batch_item_key, get_offerings_batch
+from app.utils.schedule_generator import course_candidates, ranked_schedules
+from config import Config
+
+schedule_bp = Blueprint('schedule_bp', __name__)
+
+MAX_COURSES = 8
+
+def parse_generate_request(data):
+    """Validate a /generate body; returns ((term_code, courses, limit, time_budget), None) or (None, error)."""
+    if not isinstance(data, dict):
+        return None, "Request body must be a JSON object"
+    term_code = data.get('termCode')
+    courses = data.get('courses')
+
+    if not isinstance(term_code, str) or not term_code or not isinstance(courses, list) or not 0 < len(courses) <= MAX_COURSES:
+        return None, f"termCode and a list of 1 to {MAX_COURSES} courses are required"
+    if not all(isinstance(course, dict) and isinstance(course.get('major'), str) and isinstance(course.get('course'), str)
+               and course['major'] and course['course'] for course in courses):
+        return None, "Each course needs a major and a course number"
+
+    try:
+        limit = int(data.get('limit', 20))
+        time_budget_ms = float(data.get('timeBudgetMs', 500))
+    except (TypeError, ValueError, OverflowError):
+        return None, "limit and timeBudgetMs must be numbers"
+    if limit < 1 or not time_budget_ms > 0:
+        return None, "limit and timeBudgetMs must be positive"
+    limit = min(limit, Config.SCHEDULE_GENERATOR_MAX_RESULTS)
+    time_budget = min(time_budget_ms / 1000, Config.SCHEDULE_GENERATOR_TIME_BUDGET)
+    return (term_code, courses, limit, time_budget), None
+
+def offering_items(term_code, courses):
+    # Load every course's offerings as one batch, so all courses share a single bounded fan-out
+    return [(term_code, course['major'], course['course'], None) for course in courses]
+
+def schedules_response(term_code, courses, offerings, limit, time_budget):
+    """The /generate response body and status for the courses' loaded offerings."""
+    names = {
+        batch_item_key(term_code, course['major'], course['course']): f"{course['major'].upper()} {course['course']}"
+        for course in courses
+    }
+    errors = {names[key]: result['error'] for key, result in offerings.items() if 'error' in result}
+    candidates = {names[key]: course_candidates(names[key], result['data'])
+                  for key, result in offerings.items() if 'data' in result}
+    if not candidates:
+        return {"error": "None of the courses could be loaded", "errors": errors}, 502
+
+    schedules, complete = ranked_schedules(candidates, limit, time_budget)
+    return {
+        'schedules': schedules,
+        'complete': complete,
+        'options': {name: len(course_options) for name, course_options in candidates.items()},
+        'errors': errors,
+    }, 200
+
+@schedule_bp.route("/generate", methods=["POST"])
+def generate():
+    params, error = parse_generate_request(request.json or {})
+    if error:
+        return jsonify({"error": error}), 400
+    term_code, courses, limit, time_budget = params
+
+    offerings = get_offerings_batch(offering_items(term_code, courses))
+    body, status = schedules_response(term_code, courses, offerings, limit, time_budget)
+    return jsonify(body), status
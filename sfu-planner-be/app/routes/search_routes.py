@@ -0,0 +1,87 @@
+from flask import Blueprint, request, jsonify
+from app.utils.api_helpers import DAY_NUMBERS
+from app.utils.occupancy import WEEK_MASK, window_mask
+from app.utils.section_index import get_section_index
+from app.utils.prereq_graph import get_prereq_graph, normalize_course
+
+search_bp = Blueprint('search_bp', __name__)
+
+def parse_minutes(time_str):
+    hours, minutes = (int(part) for part in time_str.split(':'))
+    # Out of range times would spill into the next day's slots
+    if not (0 <= hours <= 24 and 0 <= minutes <= 59) or hours * 60 + minutes > 24 * 60:
+        raise ValueError(time_str)
+    return hours * 60 + minutes
+
+@search_bp.route("/sections", methods=["GET"])
+def search_sections():
+    termCode = request.args.get("termCode", None)
+    depts = [dept for dept in request.args.get("dept", "").split(',') if dept]
+    days = [day.strip() for day in request.args.get("days", "").split(',') if day.strip()]
+    start = request.args.get("start", None)
+    end = request.args.get("end", None)
+    limit = request.args.get("limit", 200, type=int)
+
+    if not termCode:
+        return jsonify({"error": "termCode is required"}), 400
+    if any(day not in DAY_NUMBERS for day in days):
+        return jsonify({"error": "days must be a comma separated list of Mo, Tu, We, Th, Fr"}), 400
+
+    # Sections must fit entirely inside the window: the given days (all weekdays if none), between start and end
+    if days or start or end:
+        try:
+            start_minute = parse_minutes(start) if start else 0
+            end_minute = parse_minutes(end) if end else 24 * 60
+        except ValueError:
+            return jsonify({"error": "start and end must be HH:MM between 00:00 and 24:00"}), 400
+        if start_minute >= end_minute:
+            return jsonify({"error": "start must be before end"}), 400
+        allowed_mask = window_mask([DAY_NUMBERS[day] for day in days] or DAY_NUMBERS.values(), start_minute, end_minute)
+    else:
+        allowed_mask = WEEK_MASK
+
+    index = get_section_index(termCode)
+    if not index.sections:
+        return jsonify({"error": "No snapshot has been ingested for this term"}), 404
+
+    return jsonify(index.query(
+        depts=depts,
+        allowed_mask=allowed_mask,
+        instructor=request.args.get("instructor", None),
+        delivery_method=request.args.get("deliveryMethod", None),
+        section_code=request.args.get("type", None),
+        limit=limit,
+    ))
+
+@search_bp.route("/prereqs/eligible", methods=["GET"])
+def eligible_courses():
+    termCode = request.args.get("termCode", None)
+    completed = [course for course in request.args.get("completed", "").split(',') if course.strip()]
+    if not termCode:
+        return jsonify({"error": "termCode is required"}), 400
+
+    names = [normalize_course(course) for course in completed]
+    if None in names:
+        return jsonify({"error": "completed must be a comma separated list of courses like CMPT 120"}), 400
+
+    graph = get_prereq_graph(termCode)
+    if not graph.offered:
+        return jsonify({"error": "No snapshot has been ingested for this term"}), 404
+
+    return jsonify(graph.eligible(names, include_unrestricted=request.args.get("includeUnrestricted") == "true"))
+
+@search_bp.route("/prereqs/chain", methods=["GET"])
+def prerequisite_chain():
+    termCode = request.args.get("termCode", None)
+    course = normalize_course(request.args.get("course", ""))
+    if not termCode or not course:
+        return jsonify({"error": "termCode and course (like CMPT 225) are required"}), 400
+
+    graph = get_prereq_graph(termCode)
+    if not graph.offered:
+        return jsonify({"error": "No snapshot has been ingested for this term"}), 404
+
+    chain = graph.chain(course)
+    if chain is None:
+        return jsonify({"error": f"{course} is not in this term's prerequisite graph"}), 404
+    return jsonify(chain)
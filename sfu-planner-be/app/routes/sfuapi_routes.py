@@ -1,9 +1,30 @@
-from flask import Blueprint, request, jsonify
-from app.utils.api_helpers import parse_term_code, fetch_data_from_api, process_course_number_data, process_course_section_data, process_course_number_and_section_data
-import os
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
+from app.utils.api_helpers import parse_term_code, fetch_data_from_api, process_course_number_data, process_course_section_data, iter_course_number_and_section_data
+from app.utils.http_client import CircuitOpenError
+from app.utils.snapshot import find_snapshot
+from app.utils.prefetch import record_course_request
+from app.utils.offerings import load_course_offerings, get_offerings_batch, describe_error
+from app.utils.serialization import negotiated_response
+from config import Config
 
 sfuapi_bp = Blueprint('sfuapi_bp', __name__)
-SFU_API_BASE_URL = os.getenv('SFU_API_BASE_URL')
+SFU_API_BASE_URL = Config.SFU_API_BASE_URL
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+def wants_stream():
+    return request.args.get("stream") == "1" or NDJSON_MIMETYPE in request.headers.get("Accept", "")
+
+def ndjson_response(items):
+    # One JSON document per line, flushed as each item is ready
+    def generate():
+        try:
+            for item in items:
+                yield current_app.json.dumps(item) + "\n"
+        except Exception as e:
+            # The 200 has already gone out, so end with an error line rather than a silently short list
+            current_app.logger.exception("NDJSON stream failed")
+            yield current_app.json.dumps({"error": describe_error(e)}) + "\n"
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
 
 @sfuapi_bp.route("/", methods=["GET"])
 def get_api_response():
@@ -11,7 +32,17 @@ def get_api_response():
     major = request.args.get("major", None)
     course_number = request.args.get("course", None)
     course_section = request.args.get("section", None)
+    if course_number:
+        record_course_request(termCode, major, course_number)
+    # Lists can be streamed as NDJSON; a single section is always one JSON object
+    stream = wants_stream() and not course_section
     
+    # Serve straight from the ingested term snapshot when we have one
+    if Config.SFU_SNAPSHOT_ENABLED and termCode:
+        snapshot = find_snapshot(termCode, major, course_number, course_section)
+        if snapshot is not None:
+            return ndjson_response(snapshot) if stream else negotiated_response(snapshot)
+
     semester = parse_term_code(termCode)
     year, term = semester[0], semester[1]
 
@@ -20,8 +51,10 @@ def get_api_response():
         response = fetch_data_from_api(f"{SFU_API_BASE_URL}{year}/{term}/{major}/{course_number}/{course_section}")
         response = process_course_section_data(response)
     elif course_number:
-        response = fetch_data_from_api(f"{SFU_API_BASE_URL}{year}/{term}/{major}/{course_number}")
-        response = process_course_number_and_section_data(response, year, term, major, course_number)
+        if stream:
+            response = fetch_data_from_api(f"{SFU_API_BASE_URL}{year}/{term}/{major}/{course_number}")
+            return ndjson_response(iter_course_number_and_section_data(response, year, term, major, course_number))
+        response = load_course_offerings(year, term, major, course_number)
     elif major:
         response = fetch_data_from_api(f"{SFU_API_BASE_URL}{year}/{term}/{major}")
     elif termCode:
@@ -30,4 +63,43 @@ def get_api_response():
     if not response:
         return jsonify({"error": "No valid parameters provided"}), 400
 
-    return jsonify(response)
+    if stream:
+        return ndjson_response(response)
+    return negotiated_response(response)
+
+def parse_batch_item(item):
+    """[termCode, major, course(, section)] or the same as an object -> 4-tuple, or None if malformed."""
+    if isinstance(item, dict):
+        item = [item.get("termCode"), item.get("major"), item.get("course"), item.get("section")]
+    if not isinstance(item, list) or not 3 <= len(item) <= 4:
+        return None
+    term_code, major, course_number, section = (item + [None])[:4]
+    if not all(isinstance(part, str) and part for part in (term_code, major, course_number)):
+        return None
+    if section is not None and not (isinstance(section, str) and section):
+        return None
+    return term_code, major, course_number, section
+
+@sfuapi_bp.route("/batch", methods=["POST"])
+def get_api_response_batch():
+    data = request.json or {}
+    items = data.get("items") if isinstance(data, dict) else None
+
+    if not isinstance(items, list):
+        return jsonify({"error": "items must be a list of [termCode, major, course, section?] entries"}), 400
+    if len(items) > Config.SFU_BATCH_MAX_ITEMS:
+        return jsonify({"error": f"At most {Config.SFU_BATCH_MAX_ITEMS} items per request"}), 400
+    parsed = [parse_batch_item(item) for item in items]
+    if any(item is None for item in parsed):
+        return jsonify({"error": "items must be a list of [termCode, major, course, section?] entries"}), 400
+
+    for term_code, major, course_number, section in parsed:
+        if not section:
+            record_course_request(term_code, major, course_number)
+    return negotiated_response(get_offerings_batch(parsed))
+
+@sfuapi_bp.errorhandler(CircuitOpenError)
+def handle_upstream_unavailable(error):
+    response = jsonify({"error": "SFU course outline API is unavailable, please try again shortly"})
+    response.headers['Retry-After'] = str(int(error.retry_after))
+    return response, 503
@@ -33,14 +33,19 @@ def generate_term_codes():
 
 @term_bp.route("/terms", methods=["GET"])
 def available_semesters():
+    # Return response
+    return jsonify([format_term(*semester) for semester in current_and_next_semesters()])
+
+# Define semester mappings
+semester_codes = {1: "Spring", 4: "Summer", 7: "Fall"}
+
+def current_and_next_semesters(current_date=None):
     # Get current date and year
-    current_date = datetime.datetime.now()
+    if current_date is None:
+        current_date = datetime.datetime.now()
     current_year = current_date.year
     current_month = current_date.month
 
-    # Define semester mappings
-    semester_codes = {1: "Spring", 4: "Summer", 7: "Fall"}
-
     # Determine current and next semesters
     if 1 <= current_month <= 3:  # Jan–Mar
         current_semester = (current_year, 1)  # Spring of current year
@@ -55,15 +60,10 @@ def available_semesters():
         current_semester = (current_year + 1, 1)  # Spring of next year
         next_semester = (current_year + 1, 4)  # Summer of next year
 
-    # Generate term code and label
-    def format_term(year, semester_code):
-        term_code = f"1{str(year % 100).zfill(2)}{semester_code}"
-        label = f"{semester_codes[semester_code]} {year}"
-        return {"value": term_code, "label": label}
+    return [current_semester, next_semester]
 
-    # Return response
-    response = [
-        format_term(*current_semester),
-        format_term(*next_semester)
-    ]
-    return jsonify(response)
\ No newline at end of file
+# Generate term code and label
+def format_term(year, semester_code):
+    term_code = f"1{str(year % 100).zfill(2)}{semester_code}"
+    label = f"{semester_codes[semester_code]} {year}"
+    return {"value": term_code, "label": label}
@@ -1,5 +1,6 @@
-from flask import Blueprint, request, jsonify, make_response
+from flask import Blueprint, Response, request, jsonify, make_response
 from app import mongo
+from app.utils.schedule_store import ScheduleLimitError, save_user_schedule, delete_user_schedule
 import uuid
 import re
 from bson.objectid import ObjectId
@@ -57,25 +58,10 @@ def save_schedule():
     if not all(is_valid_string(course_id['offering']) for course_id in course_ids):
         return jsonify({"error": "Invalid course IDs"}), 400
 
-    user = mongo.db.schedules.find_one({"user_id": user_uuid})
-    if user:
-        schedules = user.get('schedules', [])
-        if len(schedules) >= 4:
-            return jsonify({"error": "Maximum number of schedules reached (4)"}), 400
-
-        for schedule in schedules:
-            if schedule['name'] == schedule_name:
-                schedule['term'] = term
-                schedule['course_ids'] = course_ids
-                break
-        else:
-            schedules.append({"name": schedule_name, "term": term, "course_ids": course_ids})
-        mongo.db.schedules.update_one({"user_id": user_uuid}, {"$set": {"schedules": schedules}})
-    else:
-        mongo.db.schedules.insert_one({
-            "user_id": user_uuid,
-            "schedules": [{"name": schedule_name, "term": term, "course_ids": course_ids}]
-        })
+    try:
+        save_user_schedule(user_uuid, schedule_name, term, course_ids)
+    except ScheduleLimitError as e:
+        return jsonify({"error": str(e)}), 400
 
     return jsonify({"message": "Schedule saved successfully"})
 
@@ -124,10 +110,40 @@ def delete_schedule():
     if not schedule_name or not is_valid_string(schedule_name):
         return jsonify({"error": "Invalid or missing schedule name"}), 400
 
-    user = mongo.db.schedules.find_one({"user_id": user_uuid})
-    if user:
-        schedules = [schedule for schedule in user.get('schedules', []) if schedule['name'] != schedule_name]
-        mongo.db.schedules.update_one({"user_id": user_uuid}, {"$set": {"schedules": schedules}})
+    if delete_user_schedule(user_uuid, schedule_name):
         return jsonify({"message": "Schedule deleted successfully"})
 
     return jsonify({"error": "Schedule not found"}), 404
+
+# Export one saved schedule as an iCalendar file
+@user_bp.route('/export', methods=['GET'])
+def export_schedule():
+    user_uuid = ensure_uuid()
+    if isinstance(user_uuid, tuple):  # Error response from ensure_uuid
+        return user_uuid
+
+    schedule_name = request.args.get('name')
+    if not schedule_name or not is_valid_string(schedule_name):
+        return jsonify({"error": "Invalid or missing schedule name"}), 400
+
+    user = mongo.db.schedules.find_one({"user_id": user_uuid}, {"schedules": 1})
+    schedule = next((s for s in (user or {}).get('schedules', []) if s.get('name') == schedule_name), None)
+    if schedule is None:
+        return jsonify({"error": "Schedule not found"}), 404
+
+    from app.utils.ical import export_schedules
+    response = Response(export_schedules([schedule])[schedule_name], mimetype='text/calendar')
+    filename = re.sub(r"[^a-zA-Z0-9_\-]+", "_", schedule_name)
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}.ics"'
+    return response
+
+# Export every saved schedule in one pass, as a map of schedule name -> .ics text
+@user_bp.route('/export/all', methods=['GET'])
+def export_all_schedules():
+    user_uuid = ensure_uuid()
+    if isinstance(user_uuid, tuple):  # Error response from ensure_uuid
+        return user_uuid
+
+    from app.utils.ical import export_schedules
+    user = mongo.db.schedules.find_one({"user_id": user_uuid}, {"schedules": 1})
+    return jsonify(export_schedules((user or {}).get('schedules', [])))
@@ -0,0 +1,160 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from flask import g, jsonify, request
+from app.utils.metrics import admission_rejections, admission_queue_wait
+from config import Config
+
+# Health, readiness and metrics must answer even when everything else is shedding load
+EXEMPT_BLUEPRINTS = {'health_bp'}
+# Routes that fan out into many upstream calls or scrapes; everything else is cheap
+EXPENSIVE_BLUEPRINTS = {'schedule_bp'}
+
+
+def route_class(req):
+    if req.blueprint in EXEMPT_BLUEPRINTS or req.method == 'OPTIONS':
+        return None
+    if req.blueprint in EXPENSIVE_BLUEPRINTS:
+        return 'expensive'
+    # The frontend looks up one rating per course card, each a single cached scrape; batches fan out
+    if req.blueprint == 'rmp_bp' and req.path.endswith('/batch'):
+        return 'expensive'
+    # Term and department lists are one cached upstream call; courses and batches fan out
+    if req.blueprint == 'sfuapi_bp' and (req.args.get('course') or req.path.endswith('/batch')):
+        return 'expensive'
+    return 'cheap'
+
+
+def client_key(req):
+    return req.cookies.get('user_uuid') or req.remote_addr or 'unknown'
+
+
+class TokenBuckets:
+    """Per-client token buckets, keeping only the most recently seen `max_clients` clients."""
+
+    def __init__(self, rate, burst, max_clients=10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets = OrderedDict()  # client -> (tokens, updated_at)
+        self._lock = threading.Lock()
+
+    def take(self, client):
+        """Spend one token; returns 0 if allowed, otherwise seconds until a token is available."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(client, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0
+            else:
+                wait = (1 - tokens) / self.rate
+            self._buckets[client] = (tokens, now)
+            if len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        return wait
+
+
+class AdmissionQueue:
+    """At most `limit` requests of a class in flight, with up to `max_waiting` queued for `timeout` seconds."""
+
+    def __init__(self, limit, max_waiting, timeout):
+        self.limit = limit
+        self.max_waiting = max_waiting
+        self.timeout = timeout
+        self.active = 0
+        self.waiting = 0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        """Returns None once admitted, or 'full' / 'timeout' if the request should be shed."""
+        with self._condition:
+            if self.active < self.limit and self.waiting == 0:
+                self.active += 1
+                return None
+            if self.waiting >= self.max_waiting:
+                return 'full'
+            self.waiting += 1
+            deadline = time.monotonic() + self.timeout
+            try:
+                while self.active >= self.limit:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        # Pass on a wake-up we may have consumed, so no other waiter misses a free slot
+                        self._condition.notify()
+                        return 'timeout'
+                    self._condition.wait(remaining)
+                self.active += 1
+                return None
+            finally:
+                self.waiting -= 1
+
+    def release(self):
+        with self._condition:
+            self.active -= 1
+            self._condition.notify()
+
+
+buckets = {
+    'cheap': TokenBuckets(Config.ADMISSION_CHEAP_RATE, Config.ADMISSION_CHEAP_BURST),
+    'expensive': TokenBuckets(Config.ADMISSION_EXPENSIVE_RATE, Config.ADMISSION_EXPENSIVE_BURST),
+}
+queues = {
+    'cheap': AdmissionQueue(Config.ADMISSION_CHEAP_CONCURRENCY, Config.ADMISSION_CHEAP_QUEUE, Config.ADMISSION_CHEAP_QUEUE_TIMEOUT),
+    'expensive': AdmissionQueue(Config.ADMISSION_EXPENSIVE_CONCURRENCY, Config.ADMISSION_EXPENSIVE_QUEUE, Config.ADMISSION_EXPENSIVE_QUEUE_TIMEOUT),
+}
+
+
+def admit(req):
+    """Take a rate-limit token and a concurrency slot for the request; blocks while queued.
+
+    Returns (queue to release when done, None), or (None, (status, message, retry_after)) if the request is shed.
+    """
+    cls = route_class(req)
+    if cls is None:
+        return None, None
+
+    wait = buckets[cls].take(client_key(req))
+    if wait:
+        admission_rejections.inc(route_class=cls, reason='rate_limited')
+        return None, (429, "Too many requests, please slow down", wait)
+
+    queue = queues[cls]
+    start = time.perf_counter()
+    outcome = queue.acquire()
+    admission_queue_wait.observe(time.perf_counter() - start, route_class=cls)
+    if outcome is not None:
+        admission_rejections.inc(route_class=cls, reason=f'queue_{outcome}')
+        # Nothing frees up faster than a queue timeout, so that is the soonest a retry can help
+        return None, (503, "Server is busy, please try again shortly", queue.timeout)
+    return queue, None
+
+
+def retry_after_header(retry_after):
+    return str(max(1, math.ceil(retry_after)))
+
+
+def reject(status, message, retry_after):
+    response = jsonify({"error": message})
+    response.status_code = status
+    response.headers['Retry-After'] = retry_after_header(retry_after)
+    return response
+
+
+def init_app(app):
+    """Rate limit each client and cap in-flight requests per route class, shedding load with 429/503."""
+
+    @app.before_request
+    def admit_request():
+        queue, rejection = admit(request)
+        if rejection is not None:
+            return reject(*rejection)
+        g.admission_queue = queue
+
+    @app.teardown_request
+    def release_admission(exc):
+        queue = g.pop('admission_queue', None)
+        if queue is not None:
+            queue.release()
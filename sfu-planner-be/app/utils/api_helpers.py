@@ -1,17 +1,16 @@
-import requests
 import datetime
-import pytz
-from dateutil.rrule import rrule, WEEKLY
-from dateutil.parser import parse
-from constants.days import days_mapping
-from constants.holidays import bc_holidays_2024
-import os
-from dotenv import load_dotenv
 import uuid
-
-load_dotenv()
-SFU_API_BASE_URL = os.getenv('SFU_API_BASE_URL')
-SFU_OUTLINE_URL = os.getenv('SFU_OUTLINE_URL')
+import sys
+import functools
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from config import Config
+from app.utils.cache import api_cache, ttl_for_url
+from app.utils.http_client import sfu_client
+from app.utils.metrics import timed
+
+SFU_API_BASE_URL = Config.SFU_API_BASE_URL
+SFU_OUTLINE_URL = Config.SFU_OUTLINE_URL
 
 def parse_custom_date(date_str):
     # Extract the timezone abbreviation and date-time part
@@ -30,7 +29,7 @@ def parse_custom_date(date_str):
     utc_dt = dt - datetime.timedelta(hours=7)
 
     # Add UTC timezone information
-    utc_dt = pytz.utc.localize(utc_dt)
+    utc_dt = utc_dt.replace(tzinfo=datetime.timezone.utc)
 
     return utc_dt.isoformat()
 
@@ -60,11 +59,58 @@ def parse_term_code(term_code):
 
     return year, term
 
-def fetch_data_from_api(url):
-    """Fetch data from an external API."""
-    response = requests.get(url)
-    response.raise_for_status()  # Raises an HTTPError for bad responses
-    return response.json()
+def parse_offering_path(offering):
+    """Split a saved offering into (year, term, dept, number, section), or None if it isn't one.
+
+    Accepts the outline URL ('https://www.sfu.ca/outlines.html?2024/fall/cmpt/120/d100'),
+    its path, or the dashed form the frontend stores ('2024-fall-cmpt-120-d100').
+    """
+    path = offering.split('?', 1)[-1].strip('/')
+    parts = path.split('/') if '/' in path else path.split('-')
+    if len(parts) != 5 or not all(parts):
+        return None
+    return tuple(part.lower() for part in parts)
+
+def fetch_data_from_api(url, timeout=None):
+    """Fetch data from an external API, serving repeat requests from the response cache."""
+    return api_cache.get_or_fetch(url, ttl_for_url(url, SFU_API_BASE_URL), lambda: request_json(url, timeout))
+
+def request_json(url, timeout=None):
+    """Fetch data from an external API, bypassing the cache."""
+    return sfu_client.get_json(url, timeout)
+
+def fetch_many_from_api(urls, max_concurrency=None, timeout=None, fetch=fetch_data_from_api):
+    """Fetch several URLs concurrently and return a dict of url -> data.
+
+    Duplicate URLs are only requested once. If any request fails, the first
+    failing URL (in input order) re-raises its exception.
+    """
+    if max_concurrency is None:
+        max_concurrency = Config.SFU_API_MAX_CONCURRENCY
+
+    unique_urls = list(dict.fromkeys(urls))
+    if not unique_urls:
+        return {}
+    if Config.SFU_API_CLIENT == 'async' and fetch is fetch_data_from_api:
+        return fetch_many_from_api_async(unique_urls, timeout)
+    if len(unique_urls) == 1 or max_concurrency <= 1:
+        return {url: fetch(url, timeout) for url in unique_urls}
+
+    workers = min(max_concurrency, len(unique_urls))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # Run each fetch in a copy of the caller's context so request metrics follow it into the pool
+        futures = [(url, executor.submit(contextvars.copy_context().run, fetch, url, timeout)) for url in unique_urls]
+        # Results are collected in submission order so the merge stays deterministic
+        return {url: future.result() for url, future in futures}
+
+def fetch_many_from_api_async(urls, timeout=None):
+    """Cached fetch of several URLs, with the misses multiplexed on the shared async client."""
+    from app.utils.async_client import async_sfu_client
+    return api_cache.get_many_or_fetch(
+        urls,
+        lambda url: ttl_for_url(url, SFU_API_BASE_URL),
+        lambda missing: async_sfu_client.get_many_json(missing, timeout),
+    )
 
 def process_course_number_data(data):
     lectures = {}
@@ -126,11 +172,16 @@ def process_course_section_data(data):
 
     return formatted_data
 
+def section_event_key(data):
+    """Stable identifier for a section's events, used to derive deterministic event IDs."""
+    info = data.get('info', {})
+    return f"{info.get('term')}|{info.get('dept')}|{info.get('number')}|{info.get('section')}"
+
 def process_lab_tut_section_data(data):
     formatted_data = {}
     formatted_data['lectures'] = []
     schedule = data.get('courseSchedule', [])
-    events = create_events(schedule)
+    events = create_events(schedule, section_event_key(data))
     section = data.get('info', {}).get('section', '')
 
     # Add 'section' field to each event
@@ -146,18 +197,9 @@ def remove_duplicates(events):
     for event in events:
         day = int(event['day'])
     
-        start_time_str = event['startTime'].strip()
-        end_time_str = event['endTime'].strip()
-    
-        # Parse the times into datetime objects
-        start_time_dt = datetime.datetime.fromisoformat(start_time_str)
-        end_time_dt = datetime.datetime.fromisoformat(end_time_str)
-    
-        # Extract hour and minute components
-        start_hour = start_time_dt.hour
-        start_minute = start_time_dt.minute
-        end_hour = end_time_dt.hour
-        end_minute = end_time_dt.minute
+        # Extract hour and minute components (parsed once per distinct time string)
+        start_hour, start_minute = iso_hour_minute(event['startTime'])
+        end_hour, end_minute = iso_hour_minute(event['endTime'])
     
         # Create key using day, start hour and minute, end hour and minute
         key = (day, start_hour, start_minute, end_hour, end_minute)
@@ -195,108 +237,172 @@ def remove_timezone(date_str):
     else:
         return date_str
 
-def create_events(courseSchedule):
-    day_mapping = {
-        'Mo': 1,
-        'Tu': 2,
-        'We': 3,
-        'Th': 4,
-        'Fr': 5
-    }
-    lectures = []
-
-    # Define the fixed timezone offset for PDT (-07:00)
-    pdt = datetime.timezone(datetime.timedelta(hours=-7))
+# Define the fixed timezone offset for PDT (-07:00)
+PDT = datetime.timezone(datetime.timedelta(hours=-7))
+
+DAY_NUMBERS = {
+    'Mo': 1,
+    'Tu': 2,
+    'We': 3,
+    'Th': 4,
+    'Fr': 5
+}
+
+# Namespace for event IDs, so the same meeting always gets the same ID
+EVENT_ID_NAMESPACE = uuid.UUID('6f1c1a52-3b8e-4d59-9a63-5f0e3d2c8b71')
+
+# The same handful of date and time strings repeat across every section of a term,
+# so each distinct string is only ever parsed once
+@functools.lru_cache(maxsize=4096)
+def parse_schedule_date(date_str):
+    try:
+        return datetime.datetime.strptime(remove_timezone(date_str), '%a %b %d %H:%M:%S %Y')
+    except ValueError:
+        return None
+
+@functools.lru_cache(maxsize=4096)
+def schedule_time_iso(time_str):
+    """'10:30' -> '1970-01-01T10:30:00-07:00', interned so every event shares one string object."""
+    try:
+        time_obj = datetime.datetime.strptime(time_str, '%H:%M')
+    except ValueError:
+        return None
+    time_dt = datetime.datetime(1970, 1, 1, time_obj.hour, time_obj.minute, tzinfo=PDT)
+    return sys.intern(time_dt.isoformat(timespec='seconds'))
+
+@functools.lru_cache(maxsize=4096)
+def iso_hour_minute(iso_str):
+    time_dt = datetime.datetime.fromisoformat(iso_str.strip())
+    return time_dt.hour, time_dt.minute
+
+def normalize_schedule(courseSchedule):
+    """Turn raw courseSchedule rows into compact (day, startTime, endTime) meeting tuples."""
+    meetings = []
 
     for schedule in courseSchedule:
-        # Parse startDate and endDate
-        start_date_str = schedule.get('startDate', '')
-        end_date_str = schedule.get('endDate', '')
-
-        # Remove timezone from date strings
-        start_date_str_no_tz = remove_timezone(start_date_str)
-        end_date_str_no_tz = remove_timezone(end_date_str)
-
         # Convert date strings to datetime objects
-        try:
-            start_date = datetime.datetime.strptime(start_date_str_no_tz, '%a %b %d %H:%M:%S %Y')
-            end_date = datetime.datetime.strptime(end_date_str_no_tz, '%a %b %d %H:%M:%S %Y')
-        except ValueError:
+        start_date = parse_schedule_date(schedule.get('startDate', ''))
+        end_date = parse_schedule_date(schedule.get('endDate', ''))
+        if start_date is None or end_date is None:
             # If date parsing fails, skip this schedule entry
             continue
 
-        # Check if the date range is 0 days
+        # Skip schedule entries with a date range of 0 days
         if start_date.date() == end_date.date():
-            # Skip this schedule entry
             continue
 
-        days_str = schedule.get('days', '')
-        # Split the 'days' string into a list of day abbreviations
-        days = [day.strip() for day in days_str.split(',')]
-
-        # Parse the startTime and endTime strings
-        start_time_str = schedule.get('startTime', '')
-        end_time_str = schedule.get('endTime', '')
-
-        # Convert startTime and endTime to datetime objects with fixed date and timezone
-        try:
-            start_time_obj = datetime.datetime.strptime(start_time_str, '%H:%M')
-            start_datetime = datetime.datetime(1970, 1, 1, start_time_obj.hour, start_time_obj.minute, tzinfo=pdt)
-
-            end_time_obj = datetime.datetime.strptime(end_time_str, '%H:%M')
-            end_datetime = datetime.datetime(1970, 1, 1, end_time_obj.hour, end_time_obj.minute, tzinfo=pdt)
-        except ValueError:
+        # Convert startTime and endTime to ISO8601 strings with a fixed date and timezone
+        start_iso = schedule_time_iso(schedule.get('startTime', ''))
+        end_iso = schedule_time_iso(schedule.get('endTime', ''))
+        if start_iso is None or end_iso is None:
             # If time parsing fails, skip this schedule entry
             continue
 
-        # Format datetime objects into ISO8601 strings
-        start_iso = start_datetime.isoformat(timespec='seconds')
-        end_iso = end_datetime.isoformat(timespec='seconds')
-
-        for day_abbr in days:
-            day_number = day_mapping.get(day_abbr)
+        # Split the 'days' string into a list of day abbreviations
+        for day_abbr in schedule.get('days', '').split(','):
+            day_number = DAY_NUMBERS.get(day_abbr.strip())
             if day_number is not None:
-                lecture = {
-                    'id': uuid.uuid4(),
-                    'day': day_number,
-                    'startTime': start_iso,
-                    'endTime': end_iso,
-                }
-                lectures.append(lecture)
+                meetings.append((day_number, start_iso, end_iso))
+
+    return meetings
+
+@timed('create_events')
+def create_events(courseSchedule, event_key=''):
+    lectures = []
+
+    for index, (day_number, start_iso, end_iso) in enumerate(normalize_schedule(courseSchedule)):
+        lecture = {
+            'id': uuid.uuid5(EVENT_ID_NAMESPACE, f"{event_key}|{index}|{day_number}|{start_iso}|{end_iso}"),
+            'day': day_number,
+            'startTime': start_iso,
+            'endTime': end_iso,
+        }
+        lectures.append(lecture)
 
     return lectures
 
-def process_course_number_and_section_data(course_number_data, year, term, major, course_number):
+def course_section_urls(nested_classes, section_url):
+    """Every lecture, lab and tutorial section URL for a course, grouped per lecture."""
+    return [
+        [section_url(cls['text'])]
+        + [section_url(lab) for lab in cls.get('labs', [])]
+        + [section_url(tut) for tut in cls.get('tutorials', [])]
+        for cls in nested_classes
+    ]
+
+def assemble_lecture(cls, section_responses, section_url):
+    """Fill in a lecture's events, section details, labs and tutorials from fetched section data."""
+    section = cls['text']
+    section_data = section_responses[section_url(section)]
+    specific_data = process_course_section_data(section_data)
+    schedule_data = section_data.get('courseSchedule', [])
+    events = create_events(schedule_data, section_event_key(section_data))
+    cls['lectures'] = events
+    cls['specificData'] = specific_data
+
+    # Collect all lab events
+    all_lab_events = []
+    for lab in cls.get('labs', []):
+        lab_section_data = section_responses[section_url(lab)]
+        lab_events = process_lab_tut_section_data(lab_section_data)
+        all_lab_events.extend(lab_events)
+    # Remove duplicates across all lab events
+    cls['labs'] = remove_duplicates(all_lab_events)
+
+    # Collect all tutorial events
+    all_tut_events = []
+    for tut in cls.get('tutorials', []):
+        tut_section_data = section_responses[section_url(tut)]
+        tut_events = process_lab_tut_section_data(tut_section_data)
+        all_tut_events.extend(tut_events)
+    # Remove duplicates across all tutorial events
+    cls['tutorials'] = remove_duplicates(all_tut_events)
+    return cls
+
+@timed('process_course_number_and_section_data')
+def process_course_number_and_section_data(course_number_data, year, term, major, course_number, fetch=fetch_data_from_api):
     nested_classes = process_course_number_data(course_number_data)
 
+    def section_url(section):
+        return f"{SFU_API_BASE_URL}{year}/{term}/{major}/{course_number}/{section}"
+
+    # Fetch every lecture, lab and tutorial section for the course in one concurrent batch
+    urls = [url for lecture_urls in course_section_urls(nested_classes, section_url) for url in lecture_urls]
+    section_responses = fetch_many_from_api(urls, fetch=fetch)
+
     for cls in nested_classes:
-        section = cls['text']
-        section_data = fetch_data_from_api(f"{SFU_API_BASE_URL}{year}/{term}/{major}/{course_number}/{section}")
-        specific_data = process_course_section_data(section_data)
-        schedule_data = section_data.get('courseSchedule', [])
-        events = create_events(schedule_data)
-        cls['lectures'] = events
-        cls['specificData'] = specific_data
-
-        # Collect all lab events
-        all_lab_events = []
-        for lab in cls.get('labs', []):
-            lab_section = lab
-            lab_section_data = fetch_data_from_api(f"{SFU_API_BASE_URL}{year}/{term}/{major}/{course_number}/{lab_section}")
-            lab_events = process_lab_tut_section_data(lab_section_data)
-            all_lab_events.extend(lab_events)
-        # Remove duplicates across all lab events
-        cls['labs'] = remove_duplicates(all_lab_events)
-
-        # Collect all tutorial events
-        all_tut_events = []
-        for tut in cls.get('tutorials', []):
-            tut_section = tut
-            tut_section_data = fetch_data_from_api(f"{SFU_API_BASE_URL}{year}/{term}/{major}/{course_number}/{tut_section}")
-            tut_events = process_lab_tut_section_data(tut_section_data)
-            all_tut_events.extend(tut_events)
-        # Remove duplicates across all tutorial events
-        cls['tutorials'] = remove_duplicates(all_tut_events)
+        assemble_lecture(cls, section_responses, section_url)
 
     # print(nested_classes)
-    return nested_classes
\ No newline at end of file
+    return nested_classes
+
+def iter_course_number_and_section_data(course_number_data, year, term, major, course_number, max_concurrency=None, timeout=None):
+    """Streaming version of process_course_number_and_section_data.
+
+    All section fetches start at once, but each lecture is yielded, in the usual
+    order, as soon as its own section, lab and tutorial data have arrived.
+    """
+    if max_concurrency is None:
+        max_concurrency = Config.SFU_API_MAX_CONCURRENCY
+    nested_classes = process_course_number_data(course_number_data)
+
+    def section_url(section):
+        return f"{SFU_API_BASE_URL}{year}/{term}/{major}/{course_number}/{section}"
+
+    grouped_urls = course_section_urls(nested_classes, section_url)
+    unique_urls = list(dict.fromkeys(url for lecture_urls in grouped_urls for url in lecture_urls))
+    if not unique_urls:
+        return
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(unique_urls))))
+    try:
+        futures = {
+            url: executor.submit(contextvars.copy_context().run, fetch_data_from_api, url, timeout)
+            for url in unique_urls
+        }
+        for cls, lecture_urls in zip(nested_classes, grouped_urls):
+            section_responses = {url: futures[url].result() for url in lecture_urls}
+            yield assemble_lecture(cls, section_responses, section_url)
+    finally:
+        # Stop queued fetches if the client goes away mid-stream
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,116 @@
+import asyncio
+import threading
+import httpx
+from config import Config
+from app.utils.http_client import RETRY_STATUS_CODES, sfu_client
+from app.utils.metrics import current_request_stats, record_upstream
+
+
+class AsyncUpstreamClient:
+    """Multiplexes upstream fetches from every request thread onto one shared event loop.
+
+    Instead of parking a pool thread per in-flight section request, all waits share a
+    single httpx.AsyncClient, so one process can keep hundreds of them open at once.
+    Retry, backoff and circuit breaker behaviour is shared with the sync client.
+    """
+
+    def __init__(self, max_connections, connect_timeout, read_timeout, max_retries, sync_client):
+        self.max_connections = max_connections
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.breaker = sync_client.breaker
+        self._backoff = sync_client._backoff
+        self._retry_after = sync_client._retry_after
+        self._loop = None
+        self._client = None
+        self._semaphore = None
+        self._start_lock = threading.Lock()
+
+    def get_many_json(self, urls, timeout=None):
+        """Fetch every URL concurrently; returns a dict of url -> decoded JSON or the exception it raised."""
+        loop = self._ensure_loop()
+        stats = current_request_stats.get()
+        future = asyncio.run_coroutine_threadsafe(self._gather(urls, timeout, stats), loop)
+        return future.result()
+
+    async def fetch_many(self, urls, timeout=None):
+        """Awaitable get_many_json for coroutines, such as the ASGI mode's native routes."""
+        stats = current_request_stats.get()
+        if self._loop is asyncio.get_running_loop():
+            return await self._gather(urls, timeout, stats)
+        # The client's connections belong to another loop, so run there and wait without blocking this one
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self._gather(urls, timeout, stats), self._ensure_loop()))
+
+    async def bind_to_running_loop(self):
+        """Open the client on the server's own event loop, so requests there don't hop to a helper thread."""
+        with self._start_lock:
+            if self._loop is not None:
+                return
+            self._loop = asyncio.get_running_loop()
+        await self._open()
+
+    def _ensure_loop(self):
+        with self._start_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name='sfu-upstream-loop', daemon=True).start()
+                asyncio.run_coroutine_threadsafe(self._open(), loop).result()
+                self._loop = loop
+            return self._loop
+
+    async def _open(self):
+        self._client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections),
+            timeout=httpx.Timeout(self.read_timeout, connect=self.connect_timeout),
+        )
+        self._semaphore = asyncio.Semaphore(self.max_connections)
+
+    async def _gather(self, urls, timeout, stats):
+        # Attribute these calls to the request that asked for them
+        current_request_stats.set(stats)
+        results = await asyncio.gather(*(self._get_json(url, timeout) for url in urls), return_exceptions=True)
+        return dict(zip(urls, results))
+
+    async def _get_json(self, url, timeout):
+        read_timeout = self.read_timeout if timeout is None else timeout
+        attempt = 0
+        while True:
+            self.breaker.before_call()
+            start = asyncio.get_running_loop().time()
+            try:
+                async with self._semaphore:
+                    response = await self._client.get(url, timeout=httpx.Timeout(read_timeout, connect=self.connect_timeout))
+            except httpx.TransportError:
+                record_upstream(asyncio.get_running_loop().time() - start, failed=True)
+                self.breaker.record_failure()
+                if attempt >= self.max_retries:
+                    raise
+                retry_after = None
+            except BaseException:
+                # Other errors and cancellation aren't retried but must still settle the breaker
+                record_upstream(asyncio.get_running_loop().time() - start, failed=True)
+                self.breaker.record_failure()
+                raise
+            else:
+                record_upstream(asyncio.get_running_loop().time() - start, failed=response.status_code >= 400)
+                if response.status_code not in RETRY_STATUS_CODES:
+                    self.breaker.record_success()
+                    response.raise_for_status()
+                    return response.json()
+                self.breaker.record_failure()
+                if attempt >= self.max_retries:
+                    response.raise_for_status()
+                retry_after = self._retry_after(response)
+
+            await asyncio.sleep(self._backoff(attempt, retry_after))
+            attempt += 1
+
+
+async_sfu_client = AsyncUpstreamClient(
+    max_connections=Config.SFU_API_POOL_SIZE,
+    connect_timeout=Config.SFU_API_CONNECT_TIMEOUT,
+    read_timeout=Config.SFU_API_TIMEOUT,
+    max_retries=Config.SFU_API_MAX_RETRIES,
+    sync_client=sfu_client,
+)
@@ -0,0 +1,45 @@
+import asyncio
+from app import mongo
+from app.utils.metrics import MongoCommandTimer
+from config import Config
+
+try:
+    import motor.motor_asyncio as motor_asyncio
+except ImportError:
+    motor_asyncio = None
+
+# Cleared by the benchmark stand-ins, whose in-memory database motor can't reach
+use_motor = motor_asyncio is not None
+
+# One motor client per event loop, since its connections are bound to the loop that opened them
+_clients = {}
+
+
+def async_db():
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = _clients[loop] = motor_asyncio.AsyncIOMotorClient(
+            Config.MONGO_URI,
+            maxPoolSize=Config.MONGO_MAX_POOL_SIZE,
+            minPoolSize=Config.MONGO_MIN_POOL_SIZE,
+            waitQueueTimeoutMS=Config.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+            serverSelectionTimeoutMS=Config.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+            readPreference=Config.MONGO_READ_PREFERENCE,
+            event_listeners=[MongoCommandTimer()],
+        )
+    return client.get_default_database()
+
+
+async def find(collection, query, projection=None):
+    """Every matching document, awaited on motor rather than blocking the event loop."""
+    if not use_motor:
+        # Without motor, fall back to the sync driver on the default executor
+        return await asyncio.to_thread(lambda: list(mongo.db[collection].find(query, projection)))
+    return await async_db()[collection].find(query, projection).to_list(None)
+
+
+async def find_one(collection, query, projection=None):
+    if not use_motor:
+        return await asyncio.to_thread(mongo.db[collection].find_one, query, projection)
+    return await async_db()[collection].find_one(query, projection)
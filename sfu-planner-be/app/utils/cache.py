@@ -0,0 +1,332 @@
+import asyncio
+import datetime
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from config import Config
+from app.utils.serialization import dumps, loads
+
+
+class LRUCache:
+    """Thread-safe in-process LRU cache bounded by the total size of its values in bytes."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # key -> (payload bytes, expires_at)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            payload, expires_at = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return payload
+
+    def set(self, key, payload, ttl):
+        if len(payload) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (payload, time.monotonic() + ttl)
+            self.current_bytes += len(payload)
+            # Evict least recently used entries until we are back under budget
+            while self.current_bytes > self.max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _remove(self, key):
+        payload, _ = self._entries.pop(key)
+        self.current_bytes -= len(payload)
+
+
+class MongoCacheTier:
+    """Shared cache tier stored in MongoDB so every worker process sees the same entries."""
+
+    def __init__(self, collection_name='api_cache'):
+        self.collection_name = collection_name
+        self._indexed = False
+
+    @property
+    def collection(self):
+        from app import mongo
+        if mongo.db is None:
+            return None
+        collection = mongo.db[self.collection_name]
+        if not self._indexed:
+            # Let Mongo expire stale entries on its own
+            collection.create_index('expires_at', expireAfterSeconds=0)
+            self._indexed = True
+        return collection
+
+    def get(self, key):
+        collection = self.collection
+        if collection is None:
+            return None
+        doc = collection.find_one({'_id': key}, {'payload': 1, 'expires_at': 1})
+        if not doc or doc['expires_at'] <= datetime.datetime.utcnow():
+            return None
+        return doc['payload'], (doc['expires_at'] - datetime.datetime.utcnow()).total_seconds()
+
+    def set(self, key, payload, ttl):
+        collection = self.collection
+        if collection is None:
+            return
+        expires_at = datetime.datetime.utcnow() + datetime.timedelta(seconds=ttl)
+        collection.replace_one({'_id': key}, {'_id': key, 'payload': payload, 'expires_at': expires_at}, upsert=True)
+
+
+class ResponseCache:
+    """Two-tier cache for upstream JSON responses.
+
+    Values are stored as encoded JSON so every caller gets its own copy to mutate.
+    Concurrent misses for the same key share a single upstream request.
+    """
+
+    def __init__(self, max_bytes, shared_tier=None):
+        self.local = LRUCache(max_bytes)
+        self.shared = shared_tier
+        self.stats = {'hits': 0, 'shared_hits': 0, 'misses': 0, 'coalesced': 0}
+        self._in_flight = {}
+        self._async_in_flight = {}
+        self._lock = threading.Lock()
+
+    def get_or_fetch(self, key, ttl, fetch):
+        payload = self.local.get(key)
+        if payload is not None:
+            self._count('hits')
+            return loads(payload)
+
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._in_flight[key] = future
+            else:
+                self.stats['coalesced'] += 1
+
+        if not leader:
+            return loads(future.result())
+
+        try:
+            payload = self._load(key, ttl, fetch)
+            future.set_result(payload)
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+        return loads(payload)
+
+    def get_many_or_fetch(self, keys, ttl_for, fetch_many):
+        """Batch version of get_or_fetch.
+
+        `fetch_many` is only given the keys that are neither cached nor already being
+        loaded by another caller, and must return a dict of key -> data or exception.
+        If any key fails, the first failing key (in input order) re-raises.
+        """
+        payloads = {}
+        owned = {}
+        waiting = {}
+        for key in keys:
+            payload = self.local.get(key)
+            if payload is not None:
+                self._count('hits')
+                payloads[key] = payload
+                continue
+            with self._lock:
+                future = self._in_flight.get(key)
+                if future is None:
+                    future = self._in_flight[key] = Future()
+                    owned[key] = future
+                else:
+                    self.stats['coalesced'] += 1
+                    waiting[key] = future
+
+        if owned:
+            try:
+                loaded = self._load_many(list(owned), ttl_for, fetch_many)
+            except Exception as e:
+                loaded = {key: e for key in owned}
+            for key, future in owned.items():
+                if isinstance(loaded[key], Exception):
+                    future.set_exception(loaded[key])
+                else:
+                    future.set_result(loaded[key])
+            with self._lock:
+                for key in owned:
+                    self._in_flight.pop(key, None)
+
+        for key in keys:
+            if key not in payloads:
+                payloads[key] = (owned.get(key) or waiting[key]).result()
+        return {key: loads(payloads[key]) for key in keys}
+
+    async def get_many_settled_async(self, keys, ttl_for, fetch_many):
+        """get_many_or_fetch for coroutines on one event loop, such as the ASGI mode's routes.
+
+        `fetch_many` is awaited, the shared tier is read on a worker thread, and a failing
+        key maps to its exception instead of raising. Concurrent misses from coroutines
+        share one fetch per key.
+        """
+        payloads = {}
+        owned = []
+        waiting = {}
+        for key in dict.fromkeys(keys):
+            payload = self.local.get(key)
+            if payload is not None:
+                self._count('hits')
+                payloads[key] = payload
+            elif key in self._async_in_flight:
+                self._count('coalesced')
+                waiting[key] = self._async_in_flight[key]
+            else:
+                owned.append(key)
+
+        if owned:
+            loop = asyncio.get_running_loop()
+            futures = {key: loop.create_future() for key in owned}
+            self._async_in_flight.update(futures)
+            try:
+                loaded = await self._load_many_async(owned, ttl_for, fetch_many)
+            except Exception as e:
+                loaded = {key: e for key in owned}
+            finally:
+                for key in owned:
+                    self._async_in_flight.pop(key, None)
+            for key, future in futures.items():
+                future.set_result(loaded[key])
+                payloads[key] = loaded[key]
+
+        for key, future in waiting.items():
+            payloads[key] = await future
+        return {key: payload if isinstance(payload, Exception) else loads(payload) for key, payload in payloads.items()}
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+        stats['entries'] = len(self.local)
+        stats['bytes'] = self.local.current_bytes
+        stats['max_bytes'] = self.local.max_bytes
+        stats['evictions'] = self.local.evictions
+        return stats
+
+    def clear(self):
+        self.local.clear()
+
+    def _load(self, key, ttl, fetch):
+        if self.shared is not None:
+            shared_entry = self.shared.get(key)
+            if shared_entry is not None:
+                payload, remaining_ttl = shared_entry
+                self._count('shared_hits')
+                self.local.set(key, payload, remaining_ttl)
+                return payload
+
+        self._count('misses')
+        payload = dumps(fetch())
+        self.local.set(key, payload, ttl)
+        if self.shared is not None:
+            self.shared.set(key, payload, ttl)
+        return payload
+
+    def _load_many(self, keys, ttl_for, fetch_many):
+        loaded = {}
+        missing = []
+        for key in keys:
+            shared_entry = self.shared.get(key) if self.shared is not None else None
+            if shared_entry is None:
+                missing.append(key)
+                continue
+            payload, remaining_ttl = shared_entry
+            self._count('shared_hits')
+            self.local.set(key, payload, remaining_ttl)
+            loaded[key] = payload
+
+        if missing:
+            with self._lock:
+                self.stats['misses'] += len(missing)
+            for key, data in fetch_many(missing).items():
+                if isinstance(data, Exception):
+                    loaded[key] = data
+                    continue
+                payload = dumps(data)
+                self.local.set(key, payload, ttl_for(key))
+                if self.shared is not None:
+                    self.shared.set(key, payload, ttl_for(key))
+                loaded[key] = payload
+        return loaded
+
+    async def _load_many_async(self, keys, ttl_for, fetch_many):
+        loaded = {}
+        missing = keys
+        if self.shared is not None:
+            entries = await asyncio.to_thread(lambda: {key: self.shared.get(key) for key in keys})
+            missing = []
+            for key, shared_entry in entries.items():
+                if shared_entry is None:
+                    missing.append(key)
+                    continue
+                payload, remaining_ttl = shared_entry
+                self._count('shared_hits')
+                self.local.set(key, payload, remaining_ttl)
+                loaded[key] = payload
+
+        if missing:
+            with self._lock:
+                self.stats['misses'] += len(missing)
+            stored = {}
+            for key, data in (await fetch_many(missing)).items():
+                if isinstance(data, Exception):
+                    loaded[key] = data
+                    continue
+                payload = stored[key] = dumps(data)
+                self.local.set(key, payload, ttl_for(key))
+                loaded[key] = payload
+            if self.shared is not None and stored:
+                await asyncio.to_thread(lambda: [self.shared.set(key, payload, ttl_for(key)) for key, payload in stored.items()])
+        return loaded
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+
+def ttl_for_url(url, base_url):
+    """Pick a TTL based on how deep into the course-outline hierarchy the URL points."""
+    path = url[len(base_url):] if base_url and url.startswith(base_url) else url
+    depth = len([part for part in path.split('/') if part])
+
+    # year / term -> departments -> courses -> sections list -> section detail
+    if depth <= 1:
+        return Config.SFU_API_CACHE_TTL_TERMS
+    elif depth == 2:
+        return Config.SFU_API_CACHE_TTL_DEPARTMENTS
+    elif depth == 3:
+        return Config.SFU_API_CACHE_TTL_COURSES
+    return Config.SFU_API_CACHE_TTL_SECTIONS
+
+
+api_cache = ResponseCache(
+    Config.SFU_API_CACHE_MAX_BYTES,
+    MongoCacheTier() if Config.SFU_API_CACHE_SHARED else None,
+)
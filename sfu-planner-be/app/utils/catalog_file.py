@@ -0,0 +1,168 @@
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from app.utils.serialization import dumps, loads
+from config import Config
+
+# File layout:
+#   header   magic, entry count, keys offset, index offset
+#   payloads JSON documents, back to back
+#   keys     UTF-8 route keys, back to back
+#   index    fixed-width entries sorted by key: key offset/length, payload offset/length
+MAGIC = b'SFUCAT01'
+HEADER = struct.Struct('<8sQQQ')
+ENTRY = struct.Struct('<IIQI')
+CATALOG_SUFFIX = '.sfucat'
+
+
+def catalog_key(dept=None, number=None, section=None):
+    """Route key within a term: '' for the department list, then 'cmpt', 'cmpt/120', 'cmpt/120/d100'."""
+    return '/'.join(part.lower() for part in (dept, number, section) if part)
+
+
+def catalog_path(term_code, directory=None):
+    return os.path.join(directory or Config.CATALOG_DIR, f"{term_code}{CATALOG_SUFFIX}")
+
+
+def write_catalog(path, entries):
+    """Write {route key: payload} to a catalog file, atomically replacing any existing one.
+
+    Readers that already mapped the old file keep using it until they notice the swap.
+    """
+    items = sorted((key.encode('utf-8'), dumps(payload)) for key, payload in entries.items())
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(b'\0' * HEADER.size)
+            offsets = []
+            for _, payload in items:
+                offsets.append(f.tell())
+                f.write(payload)
+
+            keys_offset = f.tell()
+            key_offsets = []
+            for key, _ in items:
+                key_offsets.append(f.tell() - keys_offset)
+                f.write(key)
+
+            index_offset = f.tell()
+            for (key, payload), key_offset, payload_offset in zip(items, key_offsets, offsets):
+                f.write(ENTRY.pack(key_offset, len(key), payload_offset, len(payload)))
+
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, len(items), keys_offset, index_offset))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return len(items)
+
+
+class CatalogFile:
+    """Read-only view of one catalog file.
+
+    Lookups binary-search the on-disk index and decode straight from the mapping, so
+    nothing but the mmap itself is held per process and the pages are shared by every
+    worker through the OS page cache.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            self.identity = (stat.st_ino, stat.st_mtime_ns)
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, self._keys_offset, self._index_offset = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a catalog file")
+        self._view = memoryview(self._map)
+
+    def _key_at(self, i):
+        key_offset, key_length, _, _ = ENTRY.unpack_from(self._map, self._index_offset + i * ENTRY.size)
+        start = self._keys_offset + key_offset
+        return self._map[start:start + key_length]
+
+    def raw(self, key):
+        """The stored JSON bytes for a route key, as a memoryview into the mapping, or None."""
+        target = key.encode('utf-8')
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            if self._key_at(mid) < target:
+                low = mid + 1
+            else:
+                high = mid
+        if low == self.count or self._key_at(low) != target:
+            return None
+        _, _, payload_offset, payload_length = ENTRY.unpack_from(self._map, self._index_offset + low * ENTRY.size)
+        return self._view[payload_offset:payload_offset + payload_length]
+
+    def get(self, key):
+        payload = self.raw(key)
+        if payload is None:
+            return None
+        try:
+            return loads(payload)
+        except TypeError:
+            # The stdlib json fallback can't read a memoryview
+            return loads(bytes(payload))
+
+    def preload(self):
+        # Ask the kernel to read the whole file into the page cache ahead of the first request
+        if hasattr(self._map, 'madvise') and hasattr(mmap, 'MADV_WILLNEED'):
+            self._map.madvise(mmap.MADV_WILLNEED)
+
+
+class CatalogStore:
+    """Per-term catalog files from CATALOG_DIR, re-mapped when a file is swapped on disk."""
+
+    def __init__(self, directory, check_interval):
+        self.directory = directory
+        self.check_interval = check_interval
+        self._files = {}  # term code -> (CatalogFile or None, checked_at)
+        self._lock = threading.Lock()
+
+    def get_file(self, term_code):
+        if not self.directory:
+            return None
+        now = time.monotonic()
+        entry = self._files.get(term_code)
+        if entry is not None and now - entry[1] < self.check_interval:
+            return entry[0]
+
+        with self._lock:
+            current = entry[0] if entry is not None else None
+            path = catalog_path(term_code, self.directory)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                current = None
+            else:
+                if current is None or current.identity != (stat.st_ino, stat.st_mtime_ns):
+                    # Old mappings are left for in-flight readers and freed once unreferenced
+                    current = CatalogFile(path)
+            self._files[term_code] = (current, now)
+            return current
+
+    def get(self, term_code, dept=None, number=None, section=None):
+        catalog = self.get_file(term_code)
+        return catalog.get(catalog_key(dept, number, section)) if catalog is not None else None
+
+    def preload(self):
+        """Map and page in every catalog, e.g. in the master process before workers fork."""
+        if not self.directory or not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            if name.endswith(CATALOG_SUFFIX):
+                catalog = self.get_file(name[:-len(CATALOG_SUFFIX)])
+                if catalog is not None:
+                    catalog.preload()
+
+
+catalog_store = CatalogStore(Config.CATALOG_DIR, Config.CATALOG_CHECK_INTERVAL)
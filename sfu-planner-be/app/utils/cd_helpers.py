@@ -0,0 +1,83 @@
+import logging
+from pymongo.errors import PyMongoError
+from app import mongo
+from app.utils import async_mongo
+from app.utils.cache import LRUCache
+from app.utils.serialization import dumps, loads
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Only the fields the frontend's CourseGrade type reads
+COURSE_GRADE_PROJECTION = {
+    'course_name': 1,
+    'median_grade': 1,
+    'fail_rate': 1,
+    'a_plus_percentage': 1,
+    'a_percentage': 1,
+    'a_minus_percentage': 1,
+    'b_plus_percentage': 1,
+    'b_percentage': 1,
+    'b_minus_percentage': 1,
+    'c_plus_percentage': 1,
+    'c_grade_percentage': 1,
+    'c_minus_percentage': 1,
+    'd_percentage': 1,
+}
+
+# Grade distributions only change once a term, so they're safe to keep in process
+grade_cache = LRUCache(Config.CD_CACHE_MAX_BYTES)
+
+
+def ensure_course_grade_indexes():
+    try:
+        mongo.db.mydatabase.create_index('course_name', unique=True, name='course_name_unique')
+    except PyMongoError:
+        logger.exception("Could not ensure the unique course_name index on mydatabase")
+
+
+def cached_course_grades(course_names):
+    """Split course names into ({name: cached document}, [names to query])."""
+    grades = {}
+    missing = []
+    for name in dict.fromkeys(course_names):
+        payload = grade_cache.get(name)
+        if payload is None:
+            missing.append(name)
+        else:
+            grades[name] = loads(payload)
+    return grades, missing
+
+
+def store_course_grades(grades, missing, docs):
+    found = {}
+    for doc in docs:
+        # Convert ObjectId to string so the document can be serialized
+        doc['_id'] = str(doc['_id'])
+        found[doc['course_name']] = doc
+    for name in missing:
+        doc = found.get(name)
+        # Unknown courses are cached as null so they don't hit Mongo every time
+        grade_cache.set(name, dumps(doc), Config.CD_CACHE_TTL)
+        grades[name] = doc
+    return grades
+
+
+def get_course_grades(course_names):
+    """Grade documents for many courses as a dict of course name -> document (None if not found).
+
+    Cached courses are served from memory; the rest are fetched with a single $in query.
+    """
+    grades, missing = cached_course_grades(course_names)
+    if missing:
+        store_course_grades(grades, missing, mongo.db.mydatabase.find({'course_name': {'$in': missing}}, COURSE_GRADE_PROJECTION))
+    return grades
+
+
+async def get_course_grades_async(course_names):
+    """get_course_grades for the ASGI mode, querying through motor."""
+    grades, missing = cached_course_grades(course_names)
+    if missing:
+        docs = await async_mongo.find('mydatabase', {'course_name': {'$in': missing}}, COURSE_GRADE_PROJECTION)
+        store_course_grades(grades, missing, docs)
+    return grades
@@ -0,0 +1,195 @@
+import sys
+import uuid
+
+# Bump when the packed layout changes so stale cache entries are never misread
+COMPACT_VERSION = 1
+
+# Keys of a processed lecture that get their own structure; every other key is passed through
+LECTURE_KEYS = ('lectures', 'labs', 'tutorials', 'specificData')
+
+
+class StringTable:
+    """Interns the scalar values of a course (mostly repeated strings) into one shared list."""
+
+    __slots__ = ('values', '_index')
+
+    def __init__(self, values=None):
+        self.values = list(values or [])
+        self._index = {}
+
+    def add(self, value):
+        # Key on the type too, so 1, 1.0 and True don't collapse into one entry
+        key = (type(value), value)
+        index = self._index.get(key)
+        if index is None:
+            index = self._index[key] = len(self.values)
+            self.values.append(sys.intern(value) if isinstance(value, str) else value)
+        return index
+
+    def __getitem__(self, index):
+        return self.values[index]
+
+
+def is_scalar(value):
+    return value is None or isinstance(value, (str, int, float, bool))
+
+
+def pack_pairs(mapping, table):
+    """Flatten a dict of scalars to [key, value, key, value, ...] table indexes."""
+    pairs = []
+    for key, value in mapping.items():
+        pairs.append(table.add(key))
+        pairs.append(table.add(value))
+    return pairs
+
+
+def unpack_pairs(pairs, table):
+    return {table[pairs[i]]: table[pairs[i + 1]] for i in range(0, len(pairs), 2)}
+
+
+class Meeting:
+    """One weekly meeting of a lecture, lab or tutorial."""
+
+    __slots__ = ('id', 'day', 'start_time', 'end_time', 'section', 'sections')
+
+    def __init__(self, id, day, start_time, end_time, section=None, sections=None):
+        self.id = id
+        self.day = day
+        self.start_time = start_time
+        self.end_time = end_time
+        self.section = section
+        self.sections = sections
+
+    @classmethod
+    def from_dict(cls, event):
+        return cls(event['id'], event['day'], event['startTime'], event['endTime'],
+                   event.get('section'), event.get('sections'))
+
+    def to_dict(self):
+        event = {'id': self.id, 'day': self.day, 'startTime': self.start_time, 'endTime': self.end_time}
+        if self.section is not None:
+            event['section'] = self.section
+        if self.sections is not None:
+            event['sections'] = list(self.sections)
+        return event
+
+    def pack(self, table):
+        # UUIDs pack as 32 hex chars, which no other id (including str(uuid)) is
+        event_id = self.id.hex if isinstance(self.id, uuid.UUID) else self.id
+        sections = [table.add(section) for section in self.sections] if self.sections is not None else None
+        section = table.add(self.section) if self.section is not None else -1
+        return [event_id, self.day, table.add(self.start_time), table.add(self.end_time), section, sections]
+
+    @classmethod
+    def unpack(cls, row, table):
+        event_id, day, start, end, section, sections = row
+        return cls(uuid.UUID(hex=event_id) if len(event_id) == 32 else event_id, day, table[start], table[end],
+                   table[section] if section >= 0 else None,
+                   [table[i] for i in sections] if sections is not None else None)
+
+
+class Lecture:
+    """A lecture section with its meetings, section details and merged lab and tutorial meetings.
+
+    `fields` holds the scalar keys that come straight from the course listing (text,
+    title, sectionCode, ...) and `extra` anything else it carries through unchanged.
+    """
+
+    __slots__ = ('fields', 'extra', 'lectures', 'labs', 'tutorials', 'specific')
+
+    def __init__(self, fields, extra, lectures, labs, tutorials, specific):
+        self.fields = fields
+        self.extra = extra
+        self.lectures = lectures
+        self.labs = labs
+        self.tutorials = tutorials
+        self.specific = specific
+
+    @classmethod
+    def from_dict(cls, lecture):
+        fields, extra = {}, {}
+        for key, value in lecture.items():
+            if key in LECTURE_KEYS:
+                continue
+            (fields if is_scalar(value) else extra)[key] = value
+        return cls(
+            fields, extra,
+            [Meeting.from_dict(event) for event in lecture.get('lectures', [])],
+            [Meeting.from_dict(event) for event in lecture.get('labs', [])],
+            [Meeting.from_dict(event) for event in lecture.get('tutorials', [])],
+            lecture.get('specificData'),
+        )
+
+    def to_dict(self):
+        lecture = dict(self.fields)
+        lecture.update(self.extra)
+        lecture['lectures'] = [meeting.to_dict() for meeting in self.lectures]
+        lecture['labs'] = [meeting.to_dict() for meeting in self.labs]
+        lecture['tutorials'] = [meeting.to_dict() for meeting in self.tutorials]
+        if self.specific is not None:
+            lecture['specificData'] = self.specific
+        return lecture
+
+    def pack(self, table, professors):
+        return [
+            pack_pairs(self.fields, table),
+            self.extra,
+            [meeting.pack(table) for meeting in self.lectures],
+            [meeting.pack(table) for meeting in self.labs],
+            [meeting.pack(table) for meeting in self.tutorials],
+            pack_specific(self.specific, table, professors) if self.specific is not None else None,
+        ]
+
+    @classmethod
+    def unpack(cls, row, table, professors):
+        fields, extra, lectures, labs, tutorials, specific = row
+        return cls(
+            unpack_pairs(fields, table), extra,
+            [Meeting.unpack(meeting, table) for meeting in lectures],
+            [Meeting.unpack(meeting, table) for meeting in labs],
+            [Meeting.unpack(meeting, table) for meeting in tutorials],
+            unpack_specific(specific, table, professors) if specific is not None else None,
+        )
+
+
+def pack_specific(specific, table, professors):
+    """specificData: instructors become indexes into the course-wide professor list."""
+    professor_ids = []
+    for professor in specific.get('professor', []):
+        professor_ids.append(professors.add(tuple(table.add(professor.get(key))
+                                                  for key in ('firstName', 'lastName', 'name'))))
+    return [professor_ids, pack_pairs(specific.get('info', {}), table),
+            specific.get('schedule', []), specific.get('requiredText', [])]
+
+
+def unpack_specific(row, table, professors):
+    professor_ids, info, schedule, required_text = row
+    return {
+        'professor': [dict(zip(('firstName', 'lastName', 'name'), (table[i] for i in professors[pid])))
+                      for pid in professor_ids],
+        'schedule': schedule,
+        'info': unpack_pairs(info, table),
+        'requiredText': required_text,
+    }
+
+
+class ProfessorTable(StringTable):
+    """Distinct (firstName, lastName, name) index triples, shared by every section of a course."""
+
+    __slots__ = ()
+
+
+def to_compact(lectures):
+    """Processed course offerings -> nested lists of ints over one shared value table."""
+    table, professors = StringTable(), ProfessorTable()
+    rows = [Lecture.from_dict(lecture).pack(table, professors) for lecture in lectures]
+    return [COMPACT_VERSION, table.values, [list(professor) for professor in professors.values], rows]
+
+
+def from_compact(compact):
+    """Inverse of to_compact; returns None for a layout this version can't read."""
+    version, values, professors, rows = compact
+    if version != COMPACT_VERSION:
+        return None
+    table = StringTable(values)
+    return [Lecture.unpack(row, table, professors).to_dict() for row in rows]
@@ -0,0 +1,89 @@
+import gzip
+import hashlib
+from config import Config
+from app.utils.cache import LRUCache
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Per-blueprint (max-age, stale-while-revalidate) in seconds. Blueprints not listed,
+# such as the per-user schedule routes, get no caching headers.
+CACHE_POLICIES = {
+    'sfuapi_bp': (300, 3600),
+    'term_bp': (3600, 86400),
+    'cd_bp': (86400, 7 * 86400),
+    'rmp_bp': (86400, 7 * 86400),
+    'search_bp': (300, 3600),
+}
+
+COMPRESSIBLE_MIMETYPES = {'application/json', 'application/x-ndjson', 'text/plain', 'text/calendar', 'application/msgpack'}
+
+# Compressed bodies keyed by (ETag, encoding), so hot payloads are only compressed once
+compressed_cache = LRUCache(Config.HTTP_COMPRESSION_CACHE_BYTES)
+
+
+def compress(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6)
+
+
+def choose_encoding(accept_encodings):
+    if brotli is not None and accept_encodings['br']:
+        return 'br'
+    if accept_encodings['gzip']:
+        return 'gzip'
+    return None
+
+
+def cache_control(policy):
+    max_age, stale_while_revalidate = policy
+    return f'public, max-age={max_age}, stale-while-revalidate={stale_while_revalidate}'
+
+
+def encode_body(body, etag, max_age, accept_encodings):
+    """(body, encoding) for the client: compressed once per ETag and cached, or (body, None) if not worth it."""
+    encoding = choose_encoding(accept_encodings)
+    if encoding is None or len(body) < Config.HTTP_COMPRESSION_MIN_BYTES:
+        return body, None
+
+    cache_key = f'{etag}:{encoding}'
+    compressed = compressed_cache.get(cache_key)
+    if compressed is None:
+        compressed = compress(body, encoding)
+        compressed_cache.set(cache_key, compressed, max_age)
+    return compressed, encoding
+
+
+def init_app(app):
+    """Add ETag / If-None-Match handling, Cache-Control policies and response compression."""
+    from flask import request
+
+    @app.after_request
+    def apply_http_caching(response):
+        if request.method != 'GET' or response.status_code != 200 or response.direct_passthrough or response.is_streamed:
+            return response
+
+        policy = CACHE_POLICIES.get(request.blueprint)
+        if policy is None:
+            return response
+
+        body = response.get_data()
+        # Weak ETag: the same representation is served gzip, brotli or identity encoded
+        etag = hashlib.sha1(body).hexdigest()
+        response.set_etag(etag, weak=True)
+        response.headers['Cache-Control'] = cache_control(policy)
+        response.vary.add('Accept-Encoding')
+
+        response.make_conditional(request)
+        if response.status_code != 200 or response.mimetype not in COMPRESSIBLE_MIMETYPES:
+            return response
+
+        compressed, encoding = encode_body(body, etag, policy[0], request.accept_encodings)
+        if encoding is None:
+            return response
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = encoding
+        return response
@@ -0,0 +1,153 @@
+import random
+import threading
+import time
+from config import Config
+from app.utils.metrics import record_upstream
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """Raised when the circuit breaker is open and upstream calls are being short-circuited."""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Upstream unavailable, retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Opens after `threshold` consecutive failures and lets one trial call through after `cooldown` seconds."""
+
+    def __init__(self, threshold, cooldown):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self.opened_at is None:
+                return 'closed'
+            if time.monotonic() - self.opened_at < self.cooldown:
+                return 'open'
+            return 'half-open'
+
+    def before_call(self):
+        with self._lock:
+            if self.opened_at is None:
+                return
+            remaining = self.cooldown - (time.monotonic() - self.opened_at)
+            if remaining > 0 or self._trial_in_flight:
+                raise CircuitOpenError(max(remaining, 1))
+            # Half-open: let a single trial request through
+            self._trial_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.opened_at is not None or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+
+
+class UpstreamClient:
+    """Shared, thread-safe HTTP client with connection pooling, timeouts, retries and a circuit breaker."""
+
+    def __init__(self, pool_size, connect_timeout, read_timeout, max_retries,
+                 backoff_base, backoff_max, breaker_threshold, breaker_cooldown):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = CircuitBreaker(breaker_threshold, breaker_cooldown)
+        self.pool_size = pool_size
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        # Built on first use so importing this module doesn't import requests
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size, pool_block=True)
+                    session.mount('http://', adapter)
+                    session.mount('https://', adapter)
+                    self._session = session
+        return self._session
+
+    def get_json(self, url, timeout=None):
+        """GET a URL and decode its JSON body, retrying 429/5xx and connection errors with jittered backoff."""
+        import requests
+        read_timeout = self.read_timeout if timeout is None else timeout
+        attempt = 0
+        while True:
+            self.breaker.before_call()
+            start = time.perf_counter()
+            try:
+                response = self.session.get(url, timeout=(self.connect_timeout, read_timeout))
+            except (requests.ConnectionError, requests.Timeout):
+                record_upstream(time.perf_counter() - start, failed=True)
+                self.breaker.record_failure()
+                if attempt >= self.max_retries:
+                    raise
+                retry_after = None
+            except Exception:
+                # Anything else (bad chunking, redirect loops, ...) isn't retried but must still
+                # settle the breaker, or a failed half-open trial would leave it stuck open
+                record_upstream(time.perf_counter() - start, failed=True)
+                self.breaker.record_failure()
+                raise
+            else:
+                record_upstream(time.perf_counter() - start, failed=response.status_code >= 400)
+                if response.status_code not in RETRY_STATUS_CODES:
+                    # 4xx other than 429 means the upstream is healthy, we just asked for something bad
+                    self.breaker.record_success()
+                    response.raise_for_status()
+                    return response.json()
+                self.breaker.record_failure()
+                if attempt >= self.max_retries:
+                    response.raise_for_status()
+                retry_after = self._retry_after(response)
+                response.close()
+
+            time.sleep(self._backoff(attempt, retry_after))
+            attempt += 1
+
+    def _backoff(self, attempt, retry_after=None):
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        # Full jitter exponential backoff
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    @staticmethod
+    def _retry_after(response):
+        try:
+            return float(response.headers.get('Retry-After'))
+        except (TypeError, ValueError):
+            return None
+
+
+sfu_client = UpstreamClient(
+    pool_size=Config.SFU_API_POOL_SIZE,
+    connect_timeout=Config.SFU_API_CONNECT_TIMEOUT,
+    read_timeout=Config.SFU_API_TIMEOUT,
+    max_retries=Config.SFU_API_MAX_RETRIES,
+    backoff_base=Config.SFU_API_BACKOFF_BASE,
+    backoff_max=Config.SFU_API_BACKOFF_MAX,
+    breaker_threshold=Config.SFU_API_BREAKER_THRESHOLD,
+    breaker_cooldown=Config.SFU_API_BREAKER_COOLDOWN,
+)
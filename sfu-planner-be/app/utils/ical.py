@@ -0,0 +1,152 @@
+import datetime
+import logging
+import uuid
+import pytz
+from dateutil.rrule import rrule, WEEKLY
+from constants.days import days_mapping
+from constants.holidays import bc_holidays
+from app.utils.api_helpers import SFU_API_BASE_URL, parse_offering_path, parse_schedule_date
+from app.utils.cache import LRUCache
+from app.utils.offerings import fetch_settled
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+VANCOUVER = pytz.timezone('America/Vancouver')
+ICS_UID_NAMESPACE = uuid.UUID('0b6f2d8e-4c1a-4f7e-9d35-7a2e9c1b5f60')
+SECTION_TYPES = {'LEC': 'Lecture', 'LAB': 'Lab', 'TUT': 'Tutorial', 'SEM': 'Seminar'}
+
+# VEVENT text for each section URL, so re-exports only join cached fragments
+fragment_cache = LRUCache(Config.ICS_CACHE_MAX_BYTES)
+
+
+def escape_text(value):
+    return (value or '').replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,').replace('\n', '\\n')
+
+
+def fold_line(line):
+    """Split a content line into 75-octet pieces joined by CRLF + space, as RFC 5545 requires."""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line
+    pieces = []
+    while encoded:
+        limit = 75 if not pieces else 74
+        cut = min(limit, len(encoded))
+        # Don't split a multi-byte character
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        pieces.append(encoded[:cut].decode('utf-8'))
+        encoded = encoded[cut:]
+    return '\r\n '.join(pieces)
+
+
+def utc_stamp(dt):
+    return dt.astimezone(pytz.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def meeting_occurrences(row):
+    """Local (start, end) datetimes of one courseSchedule row, with statutory holidays left out."""
+    start_date = parse_schedule_date(row.get('startDate', ''))
+    end_date = parse_schedule_date(row.get('endDate', ''))
+    try:
+        start_time = datetime.datetime.strptime(row.get('startTime', ''), '%H:%M').time()
+        end_time = datetime.datetime.strptime(row.get('endTime', ''), '%H:%M').time()
+    except ValueError:
+        return []
+    if start_date is None:
+        return []
+
+    days = [days_mapping[day.strip()] for day in row.get('days', '').split(',') if day.strip() in days_mapping]
+    if row.get('isExam') or end_date is None or start_date.date() == end_date.date() or not days:
+        # Exams and other one-off meetings
+        dates = [start_date.date()]
+    else:
+        dates = [dt.date() for dt in rrule(WEEKLY, byweekday=days, dtstart=start_date, until=end_date)]
+
+    return [
+        (VANCOUVER.localize(datetime.datetime.combine(day, start_time)),
+         VANCOUVER.localize(datetime.datetime.combine(day, end_time)))
+        for day in dates
+        if day not in bc_holidays(day.year)
+    ]
+
+
+def section_fragment(section_url, data):
+    """Every meeting of a section, expanded to one VEVENT per occurrence."""
+    info = data.get('info', {})
+    course = f"{info.get('dept', '')} {info.get('number', '')}".strip()
+    stamp = utc_stamp(datetime.datetime.now(pytz.utc))
+    lines = []
+    for row_index, row in enumerate(data.get('courseSchedule', [])):
+        kind = 'Exam' if row.get('isExam') else SECTION_TYPES.get(row.get('sectionCode'), row.get('sectionCode') or '')
+        summary = f"{course} {info.get('section', '')} {kind}".strip()
+        for start, end in meeting_occurrences(row):
+            lines += [
+                'BEGIN:VEVENT',
+                f"UID:{uuid.uuid5(ICS_UID_NAMESPACE, f'{section_url}|{row_index}|{start.isoformat()}')}@sfu-planner",
+                f'DTSTAMP:{stamp}',
+                f'DTSTART:{utc_stamp(start)}',
+                f'DTEND:{utc_stamp(end)}',
+                f'SUMMARY:{escape_text(summary)}',
+                f"LOCATION:{escape_text(row.get('campus'))}",
+                f"DESCRIPTION:{escape_text(info.get('title'))}",
+                'END:VEVENT',
+            ]
+    return '\r\n'.join(fold_line(line) for line in lines)
+
+
+def schedule_section_urls(schedule):
+    """Upstream section URLs a saved schedule refers to: each offering plus its chosen lab and tutorial."""
+    urls = []
+    for course in schedule.get('course_ids', []):
+        parsed = parse_offering_path(course.get('offering') or '')
+        if parsed is None:
+            continue
+        year, term, dept, number, section = parsed
+        base_url = f"{SFU_API_BASE_URL}{year}/{term}/{dept}/{number}"
+        urls.append(f"{base_url}/{section}")
+        for choice in (course.get('lab'), course.get('tutorial')):
+            if choice:
+                # Labs that meet at the same time are saved as 'D101/D102'; any one of them has the times
+                urls.append(f"{base_url}/{choice.split('/')[0].strip().lower()}")
+    return urls
+
+
+def load_fragments(urls):
+    """Cached VEVENT fragments for section URLs, building the missing ones from one batch of fetches."""
+    fragments = {}
+    missing = []
+    for url in dict.fromkeys(urls):
+        fragment = fragment_cache.get(url)
+        if fragment is None:
+            missing.append(url)
+        else:
+            fragments[url] = fragment.decode('utf-8')
+
+    for url, data in fetch_settled(missing).items():
+        if isinstance(data, Exception):
+            logger.warning("Leaving %s out of the calendar export: %s", url, data)
+            continue
+        fragment = section_fragment(url, data)
+        fragment_cache.set(url, fragment.encode('utf-8'), Config.SFU_API_CACHE_TTL_SECTIONS)
+        fragments[url] = fragment
+    return fragments
+
+
+def assemble_calendar(name, urls, fragments):
+    lines = ['BEGIN:VCALENDAR', 'VERSION:2.0', 'PRODID:-//SFU Planner//Schedule Export//EN',
+             'CALSCALE:GREGORIAN', fold_line(f'X-WR-CALNAME:{escape_text(name)}')]
+    lines += [fragments[url] for url in dict.fromkeys(urls) if fragments.get(url)]
+    lines.append('END:VCALENDAR')
+    return '\r\n'.join(lines) + '\r\n'
+
+
+def export_schedules(schedules):
+    """Calendars for many saved schedules in one pass, as a dict of schedule name -> .ics text.
+
+    Sections shared between schedules are fetched and expanded once.
+    """
+    urls_by_name = {schedule['name']: schedule_section_urls(schedule) for schedule in schedules}
+    fragments = load_fragments([url for urls in urls_by_name.values() for url in urls])
+    return {name: assemble_calendar(name, urls, fragments) for name, urls in urls_by_name.items()}
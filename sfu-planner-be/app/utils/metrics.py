@@ -0,0 +1,219 @@
+import bisect
+import contextvars
+import functools
+import sys
+import threading
+import time
+from collections import Counter as StackCounter
+from pymongo import monitoring
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+def _format_labels(labels, extra=None):
+    items = list(labels) + ([extra] if extra else [])
+    if not items:
+        return ''
+    return '{' + ','.join(f'{key}="{str(value).replace(chr(34), chr(39))}"' for key, value in items) + '}'
+
+
+class Histogram:
+    """Prometheus-style cumulative histogram, keyed by a tuple of (label, value) pairs."""
+
+    def __init__(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {key: (list(counts), total, count) for key, (counts, total, count) in self._series.items()}
+        for key, (counts, total, count) in sorted(series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{_format_labels(key, ('le', bound))} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(key, ('le', '+Inf'))} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {count}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help_text = help_text
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = dict(self._values)
+        for key, value in sorted(values.items()):
+            lines.append(f"{self.name}{_format_labels(key)} {value}")
+        return lines
+
+
+request_latency = Histogram('sfu_planner_request_duration_seconds', 'Request latency by route.')
+upstream_latency = Histogram('sfu_planner_upstream_duration_seconds', 'SFU course-outline API call latency.')
+upstream_calls_per_request = Histogram('sfu_planner_upstream_calls_per_request', 'Upstream calls made while serving one request.', COUNT_BUCKETS)
+upstream_errors = Counter('sfu_planner_upstream_errors_total', 'Upstream calls that raised.')
+mongo_latency = Histogram('sfu_planner_mongo_duration_seconds', 'MongoDB command latency.')
+span_latency = Histogram('sfu_planner_span_duration_seconds', 'Time spent in instrumented helpers.')
+admission_queue_wait = Histogram('sfu_planner_admission_queue_seconds', 'Time requests waited for an admission slot.')
+admission_rejections = Counter('sfu_planner_admission_rejections_total', 'Requests shed by admission control.')
+
+# Per-request stats, copied into executor threads so fan-out calls are attributed to their request
+current_request_stats = contextvars.ContextVar('current_request_stats', default=None)
+
+
+class RequestStats:
+    def __init__(self):
+        self.upstream_calls = 0
+        self.upstream_seconds = 0.0
+        self.mongo_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def add_upstream(self, duration):
+        with self._lock:
+            self.upstream_calls += 1
+            self.upstream_seconds += duration
+
+    def add_mongo(self, duration):
+        with self._lock:
+            self.mongo_seconds += duration
+
+
+def record_upstream(duration, failed=False):
+    upstream_latency.observe(duration)
+    if failed:
+        upstream_errors.inc()
+    stats = current_request_stats.get()
+    if stats is not None:
+        stats.add_upstream(duration)
+
+
+def timed(span_name):
+    """Decorator recording how long a helper takes in the span histogram."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                span_latency.observe(time.perf_counter() - start, span=span_name)
+        return wrapper
+    return decorator
+
+
+class MongoCommandTimer(monitoring.CommandListener):
+    """pymongo command listener feeding the Mongo latency histogram."""
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self._record(event, 'ok')
+
+    def failed(self, event):
+        self._record(event, 'error')
+
+    @staticmethod
+    def _record(event, outcome):
+        duration = event.duration_micros / 1e6
+        mongo_latency.observe(duration, command=event.command_name, outcome=outcome)
+        stats = current_request_stats.get()
+        if stats is not None:
+            stats.add_mongo(duration)
+
+
+def record_request(route, method, status, start, stats):
+    """Record a finished request's latency and upstream calls; returns its Server-Timing header."""
+    duration = time.perf_counter() - start
+    request_latency.observe(duration, route=route, method=method, status=status)
+    upstream_calls_per_request.observe(stats.upstream_calls, route=route)
+
+    # Lets the browser devtools show how much of a request was spent waiting on upstream / Mongo
+    return (
+        f'upstream;dur={stats.upstream_seconds * 1000:.1f};desc="{stats.upstream_calls} calls", '
+        f'mongo;dur={stats.mongo_seconds * 1000:.1f}, '
+        f'total;dur={duration * 1000:.1f}'
+    )
+
+
+def render_metrics(extra_lines=()):
+    lines = []
+    for metric in (request_latency, upstream_latency, upstream_calls_per_request, upstream_errors, mongo_latency, span_latency,
+                   admission_queue_wait, admission_rejections):
+        lines.extend(metric.render())
+    lines.extend(extra_lines)
+    return '\n'.join(lines) + '\n'
+
+
+def sample_stacks(seconds, interval=0.005):
+    """Poor man's sampling profiler: collapsed stacks of every other thread, flamegraph.pl compatible."""
+    samples = StackCounter()
+    me = threading.get_ident()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == me:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(f"{frame.f_code.co_name} ({frame.f_code.co_filename}:{frame.f_lineno})")
+                frame = frame.f_back
+            samples[';'.join(reversed(stack))] += 1
+        time.sleep(interval)
+    return '\n'.join(f"{stack} {count}" for stack, count in samples.most_common()) + '\n'
+
+
+def init_app(app):
+    """Register request timing hooks on the app."""
+    from flask import g, request
+
+    @app.before_request
+    def start_request_timer():
+        g.request_start = time.perf_counter()
+        g.request_stats = RequestStats()
+        g.request_stats_token = current_request_stats.set(g.request_stats)
+
+    @app.after_request
+    def record_request_timing(response):
+        start = g.pop('request_start', None)
+        stats = g.pop('request_stats', None)
+        if start is None:
+            return response
+
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        response.headers['Server-Timing'] = record_request(route, request.method, response.status_code, start, stats)
+        return response
+
+    @app.teardown_request
+    def reset_request_stats(exc):
+        token = g.pop('request_stats_token', None)
+        if token is not None:
+            current_request_stats.reset(token)
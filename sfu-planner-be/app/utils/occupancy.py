@@ -0,0 +1,62 @@
+import datetime
+
+# A week is packed into one int: 5 weekdays x 288 five-minute slots, Monday in the lowest bits
+SLOT_MINUTES = 5
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+DAYS_PER_WEEK = 5
+DAY_MASK = (1 << SLOTS_PER_DAY) - 1
+
+
+def minutes_since_midnight(time_str):
+    time = datetime.datetime.fromisoformat(time_str.strip())
+    return time.hour * 60 + time.minute
+
+
+def slot_range_mask(day, start_minute, end_minute):
+    """Bitmask covering [start_minute, end_minute) on a weekday numbered 1 (Mon) to 5 (Fri)."""
+    if not 1 <= day <= DAYS_PER_WEEK or end_minute <= start_minute:
+        return 0
+    start_slot = start_minute // SLOT_MINUTES
+    end_slot = -(-end_minute // SLOT_MINUTES)  # round partial slots up
+    width = end_slot - start_slot
+    return ((1 << width) - 1) << ((day - 1) * SLOTS_PER_DAY + start_slot)
+
+
+def event_mask(event):
+    """Bitmask for a single event dict produced by create_events."""
+    return slot_range_mask(
+        int(event['day']),
+        minutes_since_midnight(event['startTime']),
+        minutes_since_midnight(event['endTime']),
+    )
+
+
+WEEK_MASK = (1 << (SLOTS_PER_DAY * DAYS_PER_WEEK)) - 1
+
+
+def events_mask(events):
+    mask = 0
+    for event in events:
+        mask |= event_mask(event)
+    return mask
+
+
+def day_masks(mask):
+    """Split a weekly mask into one per-day mask, Monday first."""
+    return [(mask >> (day * SLOTS_PER_DAY)) & DAY_MASK for day in range(DAYS_PER_WEEK)]
+
+
+def day_span_minutes(day_mask):
+    """Minutes between the first and last occupied slot of a day, 0 if the day is free."""
+    if not day_mask:
+        return 0
+    first_slot = (day_mask & -day_mask).bit_length() - 1
+    return (day_mask.bit_length() - first_slot) * SLOT_MINUTES
+
+
+def window_mask(days, start_minute, end_minute):
+    """Mask allowing [start_minute, end_minute) on each of `days` (1 = Mon ... 5 = Fri)."""
+    mask = 0
+    for day in days:
+        mask |= slot_range_mask(day, start_minute, end_minute)
+    return mask
@@ -0,0 +1,208 @@
+import asyncio
+import copy
+from app.utils.api_helpers import (
+    SFU_API_BASE_URL, parse_term_code, fetch_data_from_api, fetch_many_from_api, process_course_number_data,
+    process_course_section_data, process_course_number_and_section_data, course_section_urls, assemble_lecture,
+)
+from app.utils.cache import LRUCache, api_cache, ttl_for_url
+from app.utils.course_model import to_compact, from_compact
+from app.utils.http_client import CircuitOpenError
+from app.utils.serialization import pack, unpack
+from app.utils.single_flight import course_flight
+from app.utils.snapshot import find_snapshot, find_snapshot_async
+from config import Config
+
+# Processed courses packed with a shared value table: repeated times, sections and
+# instructors are stored once per course rather than once per event
+course_cache = LRUCache(Config.COURSE_CACHE_MAX_BYTES)
+
+
+def course_key(year, term, major, course_number):
+    return f"{year}/{term}/{major}/{course_number}".lower()
+
+
+def cached_course(key):
+    payload = course_cache.get(key)
+    return from_compact(unpack(payload)) if payload is not None else None
+
+
+def cache_course(key, lectures):
+    course_cache.set(key, pack(to_compact(lectures)), Config.SFU_API_CACHE_TTL_SECTIONS)
+
+
+def load_course_offerings(year, term, major, course_number, fetch=fetch_data_from_api):
+    """Live processed offerings for one course.
+
+    Concurrent requests for the same course share one computation. The result is
+    shared between callers and must be treated as read-only. `fetch` loads each
+    upstream URL on a miss, so the prefetcher can rate limit its own calls.
+    """
+    key = course_key(year, term, major, course_number)
+    lectures = cached_course(key)
+    if lectures is not None:
+        return lectures
+
+    def compute():
+        course_number_data = fetch(f"{SFU_API_BASE_URL}{year}/{term}/{major}/{course_number}")
+        lectures = process_course_number_and_section_data(course_number_data, year, term, major, course_number, fetch=fetch)
+        cache_course(key, lectures)
+        return lectures
+
+    return course_flight.do(key, compute)
+
+
+def batch_item_key(term_code, major, course_number, section=None):
+    return '/'.join(part for part in (term_code, major, course_number, section) if part).lower()
+
+
+def describe_error(error):
+    if isinstance(error, CircuitOpenError):
+        return "SFU course outline API is unavailable, please try again shortly"
+    if getattr(getattr(error, 'response', None), 'status_code', None) == 404:
+        return "Not found"
+    return "Upstream request failed"
+
+
+def section_url_for(base_url):
+    return lambda section: f"{base_url}/{section}"
+
+
+def fetch_settled(urls):
+    """fetch_many_from_api, except a failing URL maps to its exception instead of raising."""
+    def fetch(url, timeout=None):
+        try:
+            return fetch_data_from_api(url, timeout)
+        except Exception as e:
+            return e
+    return fetch_many_from_api(urls, fetch=fetch)
+
+
+async def fetch_settled_async(urls, timeout=None):
+    """fetch_settled for coroutines: cache misses are multiplexed on the shared async client."""
+    from app.utils.async_client import async_sfu_client
+    urls = list(dict.fromkeys(urls))
+    if not urls:
+        return {}
+    return await api_cache.get_many_settled_async(
+        urls,
+        lambda url: ttl_for_url(url, SFU_API_BASE_URL),
+        lambda missing: async_sfu_client.fetch_many(missing, timeout),
+    )
+
+
+def get_offerings_batch(items):
+    """Offerings for several (termCode, major, course, section-or-None) items in one go.
+
+    Upstream URLs that items share are fetched once. The batch makes at most two
+    rounds of concurrent fetches: all course listings first, then every section that
+    any item needs. Returns item key -> {'data': ...} or {'error': ...}, in input order.
+    """
+    steps = offerings_batch_steps(items)
+    reply = None
+    try:
+        while True:
+            kind, argument = steps.send(reply)
+            if kind == 'snapshots':
+                reply = [find_snapshot(*item) for item in argument]
+            else:
+                reply = fetch_settled(argument)
+    except StopIteration as done:
+        return done.value
+
+
+async def get_offerings_batch_async(items):
+    """get_offerings_batch for the ASGI mode, awaiting Mongo and upstream instead of blocking."""
+    steps = offerings_batch_steps(items)
+    reply = None
+    try:
+        while True:
+            kind, argument = steps.send(reply)
+            if kind == 'snapshots':
+                reply = await asyncio.gather(*(find_snapshot_async(*item) for item in argument))
+            else:
+                reply = await fetch_settled_async(argument)
+    except StopIteration as done:
+        return done.value
+
+
+def offerings_batch_steps(items):
+    """The batch logic behind get_offerings_batch, with its I/O left to the caller.
+
+    Yields ('snapshots', items) to be answered with each item's snapshot or None, and
+    ('fetch', urls) to be answered with url -> data or exception; returns the results.
+    """
+    results = {}
+    pending = {}  # item key -> (base url, cache key or None, section or None)
+    unique_items = {}
+    for item in items:
+        unique_items.setdefault(batch_item_key(*item), item)
+
+    if Config.SFU_SNAPSHOT_ENABLED:
+        snapshots = yield 'snapshots', list(unique_items.values())
+        for key, snapshot in zip(list(unique_items), snapshots):
+            if snapshot is not None:
+                results[key] = {'data': snapshot}
+
+    for key, (term_code, major, course_number, section) in unique_items.items():
+        if key in results:
+            continue
+        try:
+            semester = parse_term_code(term_code)
+        except (IndexError, ValueError):
+            semester = None
+        if not isinstance(semester, tuple):
+            results[key] = {'error': "Invalid term code"}
+            continue
+        year, term = semester
+        base_url = f"{SFU_API_BASE_URL}{year}/{term}/{major}/{course_number}"
+        if section:
+            pending[key] = (base_url, None, section)
+            continue
+
+        cache_key = course_key(year, term, major, course_number)
+        lectures = cached_course(cache_key)
+        if lectures is not None:
+            results[key] = {'data': lectures}
+        else:
+            pending[key] = (base_url, cache_key, None)
+
+    listings = yield 'fetch', [base_url for base_url, _, section in pending.values() if not section]
+
+    courses = {}  # item key -> (nested classes, section urls grouped per lecture)
+    section_urls = []
+    for key, (base_url, cache_key, section) in pending.items():
+        if section:
+            section_urls.append(f"{base_url}/{section}")
+            continue
+        listing = listings[base_url]
+        if isinstance(listing, Exception):
+            results[key] = {'error': describe_error(listing)}
+            continue
+        # Two term codes can share a listing (1247 and 1248 are both Fall 2024), and processing mutates it
+        nested_classes = process_course_number_data(copy.deepcopy(listing))
+        grouped_urls = course_section_urls(nested_classes, section_url_for(base_url))
+        courses[key] = (nested_classes, grouped_urls)
+        section_urls.extend(url for lecture_urls in grouped_urls for url in lecture_urls)
+
+    sections = yield 'fetch', section_urls
+
+    for key, (base_url, cache_key, section) in pending.items():
+        if key in results:
+            continue
+        if section:
+            data = sections[f"{base_url}/{section}"]
+            results[key] = {'error': describe_error(data)} if isinstance(data, Exception) else {'data': process_course_section_data(data)}
+            continue
+
+        nested_classes, grouped_urls = courses[key]
+        failed = next((sections[url] for lecture_urls in grouped_urls for url in lecture_urls
+                       if isinstance(sections[url], Exception)), None)
+        if failed is not None:
+            results[key] = {'error': describe_error(failed)}
+            continue
+        lectures = [assemble_lecture(cls, sections, section_url_for(base_url))
+                    for cls in nested_classes]
+        cache_course(cache_key, lectures)
+        results[key] = {'data': lectures}
+
+    return {key: results[key] for key in unique_items}
@@ -0,0 +1,196 @@
+import logging
+import threading
+import time
+from collections import Counter
+from pymongo import UpdateOne
+from app import mongo
+from app.utils.api_helpers import SFU_API_BASE_URL, parse_term_code, parse_offering_path, request_json
+from app.utils.cache import api_cache, ttl_for_url
+from app.utils.offerings import load_course_offerings
+from app.utils.single_flight import MongoFlightTier
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# (termCode, dept, number) -> recent /api/sfuapi course requests seen by this process
+_recent_requests = Counter()
+_recent_lock = threading.Lock()
+RECENT_REQUESTS_COLLECTION = 'prefetch_requests'
+PREFETCH_LEASE_KEY = 'prefetch:run'
+
+
+def record_course_request(term_code, dept, number):
+    # Only the running prefetcher drains the counter, so don't collect otherwise
+    if not prefetcher.running or not (term_code and dept and number):
+        return
+    key = (term_code, dept.lower(), number.lower())
+    with _recent_lock:
+        # Keys come straight from query strings, so stop taking new ones once the counter is full
+        if key in _recent_requests or len(_recent_requests) < Config.PREFETCH_MAX_TRACKED:
+            _recent_requests[key] += 1
+
+
+def flush_recent_requests():
+    """Add this process's counted course requests to the shared tally the prefetching worker reads."""
+    with _recent_lock:
+        counts = dict(_recent_requests)
+        _recent_requests.clear()
+    if counts:
+        mongo.db[RECENT_REQUESTS_COLLECTION].bulk_write(
+            [UpdateOne({'_id': '/'.join(key)}, {'$inc': {'count': count}}, upsert=True) for key, count in counts.items()],
+            ordered=False,
+        )
+
+
+def take_recent_requests():
+    """Every worker's flushed course request counts, emptying the shared tally."""
+    collection = mongo.db[RECENT_REQUESTS_COLLECTION]
+    counts = Counter()
+    for doc in collection.find():
+        counts[tuple(doc['_id'].split('/'))] += doc['count']
+    # Counts flushed between the read and this delete are lost, which only skews one run's popularity
+    collection.delete_many({'_id': {'$in': ['/'.join(key) for key in counts]}})
+    return counts
+
+
+class RateLimiter:
+    """Token bucket allowing `rate` acquisitions per second, shared by all prefetch threads."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate > 0 else 0
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+def term_code_for(year, term):
+    suffix = {'spring': 1, 'summer': 4, 'fall': 7}.get(term)
+    if suffix is None:
+        return None
+    return f"1{str(int(year) % 100).zfill(2)}{suffix}"
+
+
+def saved_schedule_popularity():
+    """How often each (termCode, dept, number) appears in users' saved schedules."""
+    counts = Counter()
+    pipeline = [
+        {'$unwind': '$schedules'},
+        {'$unwind': '$schedules.course_ids'},
+        {'$group': {'_id': '$schedules.course_ids.offering', 'count': {'$sum': 1}}},
+    ]
+    for doc in mongo.db.schedules.aggregate(pipeline):
+        parsed = parse_offering_path(doc['_id'] or '')
+        if parsed is None:
+            continue
+        year, term, dept, number, _ = parsed
+        term_code = term_code_for(year, term)
+        if term_code:
+            counts[(term_code, dept, number)] += doc['count']
+    return counts
+
+
+class Prefetcher:
+    """Keeps department lists, course lists and popular courses warm in the response and course caches.
+
+    Every worker process starts one, but each interval only the worker that takes the
+    Mongo lease runs, so upstream sees at most `max_qps` from the whole deployment.
+    The others just hand their counted course requests to the shared tally.
+    """
+
+    def __init__(self, max_qps, popular_courses):
+        self.limiter = RateLimiter(max_qps)
+        self.popular_courses = popular_courses
+        self.running = False
+        self.lease = None
+        self._stop = threading.Event()
+
+    def fetch(self, url, timeout=None):
+        # Only cache misses go upstream, and those are rate limited
+        def load():
+            self.limiter.acquire()
+            return request_json(url, timeout)
+        return api_cache.get_or_fetch(url, ttl_for_url(url, SFU_API_BASE_URL), load)
+
+    def run_once(self, term_codes):
+        popularity = Counter()
+        try:
+            popularity.update(saved_schedule_popularity())
+        except Exception:
+            logger.exception("Could not read saved schedule popularity")
+        try:
+            flush_recent_requests()
+            popularity.update(take_recent_requests())
+        except Exception:
+            logger.exception("Could not read recent course requests")
+
+        for term_code in term_codes:
+            year, term = parse_term_code(term_code)
+            departments = self.fetch(f"{SFU_API_BASE_URL}{year}/{term}")
+            for department in departments:
+                if self._stop.is_set():
+                    return
+                if department.get('value'):
+                    self.fetch(f"{SFU_API_BASE_URL}{year}/{term}/{department['value']}")
+
+            popular = [key for key in popularity if key[0] == term_code]
+            popular.sort(key=lambda key: -popularity[key])
+            for _, dept, number in popular[:self.popular_courses]:
+                if self._stop.is_set():
+                    return
+                try:
+                    # Warms the processed course the route serves, not just the raw responses it is built from
+                    load_course_offerings(year, term, dept, number, fetch=self.fetch)
+                except Exception:
+                    logger.exception("Could not prefetch %s %s %s", term_code, dept, number)
+
+    def run_forever(self, interval):
+        from app.routes.term_routes import current_and_next_semesters, format_term
+        while not self._stop.is_set():
+            if self.claim_run():
+                term_codes = [format_term(*semester)['value'] for semester in current_and_next_semesters()]
+                started = time.monotonic()
+                try:
+                    self.run_once(term_codes)
+                    logger.info("Prefetched terms %s in %.1fs", term_codes, time.monotonic() - started)
+                except Exception:
+                    logger.exception("Prefetch run failed")
+            else:
+                try:
+                    flush_recent_requests()
+                except Exception:
+                    logger.exception("Could not flush recent course requests")
+            self._stop.wait(interval)
+
+    def claim_run(self):
+        """Whether this process runs this interval's prefetch.
+
+        The lease is never released, only left to expire after one interval, so of the
+        workers waking up during that interval only the first runs.
+        """
+        try:
+            return self.lease.acquire(PREFETCH_LEASE_KEY)
+        except Exception:
+            # Without the lease every worker might run, which is what it exists to prevent
+            logger.exception("Could not take the prefetch lease")
+            return False
+
+    def start(self, interval):
+        self.lease = MongoFlightTier(lock_ttl=interval)
+        self.running = True
+        threading.Thread(target=self.run_forever, args=(interval,), name='sfu-prefetch', daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+        self.running = False
+        with _recent_lock:
+            _recent_requests.clear()
+
+
+prefetcher = Prefetcher(Config.PREFETCH_MAX_QPS, Config.PREFETCH_POPULAR_COURSES)
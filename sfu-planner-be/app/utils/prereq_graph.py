@@ -0,0 +1,353 @@
+import re
+import threading
+import time
+from array import array
+from app.utils.section_index import iter_bits
+from app.utils.snapshot import count_course_requirements, find_course_requirements
+from config import Config
+
+COURSE_RE = re.compile(r"\b([A-Z]{2,5})\s*-?\s*(\d{3}[A-Z]?)\b")
+# Department codes are matched case-sensitively, so prose like 'one 300-level course' isn't read as a course
+TOKEN_RE = re.compile(
+    r"[();,]|\b(?i:and|or)\b|\b[A-Z]{2,5}\s*-?\s*\d{3}[A-Z]?\b(?!-)|\b\d{3}[A-Z]?\b(?!-)"
+)
+# 'C- or better' qualifies a grade; it doesn't offer an alternative
+QUALIFIER_RE = re.compile(r"\bor (?:better|higher)\b", re.IGNORECASE)
+WORD_RE = re.compile(r"[A-Za-z0-9]")
+CONNECTIVES = ('and', 'or', ',')
+
+# Stands in for an alternative that isn't a course code ('permission of the instructor')
+OTHER = '*'
+
+# Cap on OR-groups when distributing "(A and B) or (C and D)" style requirements
+MAX_GROUPS = 32
+
+
+def normalize_course(name):
+    """'cmpt120', 'CMPT-120' or 'Cmpt 120' -> 'CMPT 120', or None if it isn't a course code."""
+    match = COURSE_RE.fullmatch(name.strip().upper())
+    return f"{match.group(1)} {match.group(2)}" if match else None
+
+
+def tokenize(text):
+    text = QUALIFIER_RE.sub('', text or '')
+    tokens = []
+    dept = None
+    gap_start = 0
+    for match in TOKEN_RE.finditer(text):
+        token = match.group()
+        lower = token.lower()
+        if lower in ('and', ';'):
+            kind = 'and'
+        elif lower in ('or', ',', '(', ')'):
+            kind = lower
+        elif token[0].isdigit():
+            # A bare number borrows the department of the course listed just before it: 'CMPT 125 or 135'
+            if dept is None or len(tokens) < 2 or tokens[-1] not in CONNECTIVES or not is_operand(tokens[-2]):
+                continue
+            kind = f"{dept} {token}"
+        else:
+            kind = normalize_course(token)
+            dept = kind.split()[0]
+
+        add_other(tokens, text[gap_start:match.start()], kind)
+        tokens.append(kind)
+        gap_start = match.end()
+    add_other(tokens, text[gap_start:], None)
+    return resolve_commas(tokens)
+
+
+def add_other(tokens, gap, next_token):
+    # Text that fills a whole operand slot, between connectives, is an alternative we can't
+    # check. Text next to a course or bracket just qualifies it ('with a minimum grade of C-').
+    previous = tokens[-1] if tokens else 'and'
+    if WORD_RE.search(gap) and previous in CONNECTIVES + ('(',) and next_token in CONNECTIVES + (')', None):
+        tokens.append(OTHER)
+
+
+def resolve_commas(tokens):
+    # A comma joins alternatives in a list ending in 'or' ('MATH 150, 151 or 154'), requirements
+    # otherwise, and is dropped before another connective (', or MATH 100')
+    resolved = []
+    for i, token in enumerate(tokens):
+        if token != ',':
+            resolved.append(token)
+            continue
+        if i + 1 < len(tokens) and tokens[i + 1] in ('and', 'or'):
+            continue
+        j = i + 1
+        while j + 1 < len(tokens) and is_operand(tokens[j]) and tokens[j + 1] == ',':
+            j += 2
+        in_list = (i > 0 and is_operand(tokens[i - 1]) and j + 1 < len(tokens)
+                   and is_operand(tokens[j]) and tokens[j + 1] == 'or')
+        resolved.append('or' if in_list else 'and')
+    return resolved
+
+
+def is_operand(token):
+    return token not in CONNECTIVES + ('(', ')')
+
+
+def to_cnf(node):
+    """Expression tree -> list of OR-groups (each a frozenset of course names) that must all be satisfied.
+
+    An empty list is always satisfied; None means the node said nothing (a dangling connective).
+    """
+    kind, value = node
+    if kind == 'course':
+        return [frozenset([value])] if value != OTHER else []
+    parts = [part for part in (to_cnf(child) for child in value) if part is not None]
+    if not parts:
+        return None
+    if kind == 'and':
+        return [group for part in parts for group in part]
+    # An alternative we can't check might be met, so the whole OR might be
+    if any(not part for part in parts):
+        return []
+    # OR of CNFs: every combination of one group from each side
+    groups = [frozenset()]
+    for part in parts:
+        groups = [group | other for group in groups for other in part][:MAX_GROUPS]
+    return groups
+
+
+def parse_requirements(text):
+    """Free-text requisites -> CNF: a list of lists of course names, one of each inner list being required.
+
+    Course codes are read with 'and', ',' and ';' joining requirements and 'or' offering
+    alternatives within one, parentheses grouping. Text qualifying a course (minimum
+    grades) is ignored, and an alternative that isn't a course ('or permission of the
+    instructor', '(or equivalent)') makes its whole group optional.
+    """
+    tokens = tokenize(text)
+    position = 0
+
+    def peek(offset=0):
+        return tokens[position + offset] if position + offset < len(tokens) else None
+
+    def parse_and():
+        nonlocal position
+        children = [parse_or()]
+        while peek() == 'and':
+            position += 1
+            children.append(parse_or())
+        return ('and', children)
+
+    def parse_or():
+        nonlocal position
+        children = [parse_atom()]
+        while True:
+            if peek() == 'or':
+                position += 1
+                children.append(parse_atom())
+            elif peek() == '(' and peek(1) == 'or':
+                # 'CMPT 120 (or equivalent)' continues the alternatives
+                position += 2
+                children.append(parse_and())
+                if peek() == ')':
+                    position += 1
+            else:
+                return ('or', children)
+
+    def parse_atom():
+        nonlocal position
+        token = peek()
+        if token == '(':
+            position += 1
+            node = parse_and()
+            if peek() == ')':
+                position += 1
+            return node
+        if token in (None, 'and', 'or', ')'):
+            # Dangling connective: contributes nothing
+            return ('and', [])
+        position += 1
+        return ('course', token)
+
+    groups = []
+    while position < len(tokens):
+        groups += to_cnf(parse_and()) or []
+        # Skip a stray ')' or connective; requirements written side by side are all required
+        if not is_operand(peek()) and peek() != '(':
+            position += 1
+    # Drop duplicate groups, and any group implied by a smaller one
+    unique = sorted(set(groups), key=lambda group: (len(group), sorted(group)))
+    kept = [group for i, group in enumerate(unique) if not any(other < group for other in unique[:i])]
+    return [sorted(group) for group in kept]
+
+
+class PrereqGraph:
+    """Term-wide course dependency graph.
+
+    Courses get dense integer ids. For each course we keep its direct prerequisites
+    and corequisites as array('I') adjacency arrays, its prerequisite OR-groups as int
+    bitsets over course ids, the courses that list it directly, and its transitive
+    prerequisite closure, so queries are a handful of bitwise operations.
+    """
+
+    def __init__(self, term_code):
+        self.term_code = term_code
+        self.ids = {}
+        self.names = []
+        self.offered = 0          # bitset of courses with a snapshot this term
+        self.groups = []          # course id -> tuple of OR-group bitsets
+        self.prereqs = []         # course id -> array('I') of direct prerequisite ids
+        self.coreqs = []          # course id -> array('I') of corequisite ids
+        self.dependents = []      # course id -> bitset of courses that list it directly
+        self.closure = []         # course id -> bitset of every transitive prerequisite
+        self.refreshed_at = None  # snapshot updated_at of the newest course applied
+        self.checked_at = time.monotonic()
+
+    def course_id(self, name):
+        course_id = self.ids.get(name)
+        if course_id is None:
+            course_id = self.ids[name] = len(self.names)
+            self.names.append(name)
+            self.groups.append(())
+            self.prereqs.append(array('I'))
+            self.coreqs.append(array('I'))
+            self.dependents.append(0)
+            self.closure.append(0)
+        return course_id
+
+    def update(self, courses):
+        """Apply {course name: {'prerequisites': CNF, 'corequisites': CNF}} and refresh the affected closures."""
+        changed = 0
+        for name, requirements in courses.items():
+            course_id = self.course_id(name)
+            self.offered |= 1 << course_id
+            changed |= 1 << course_id
+
+            for old in self.prereqs[course_id]:
+                self.dependents[old] &= ~(1 << course_id)
+            groups = []
+            for group in requirements.get('prerequisites', []):
+                mask = 0
+                for member in group:
+                    mask |= 1 << self.course_id(member)
+                groups.append(mask)
+            direct = 0
+            for mask in groups:
+                direct |= mask
+            self.groups[course_id] = tuple(groups)
+            self.prereqs[course_id] = array('I', iter_bits(direct))
+            for member in self.prereqs[course_id]:
+                self.dependents[member] |= 1 << course_id
+            self.coreqs[course_id] = array('I', sorted({
+                self.course_id(member) for group in requirements.get('corequisites', []) for member in group
+            }))
+
+        # Only closures that contained, or belong to, a changed course need recomputing
+        stale = changed
+        for course_id, closure in enumerate(self.closure):
+            if closure & changed:
+                stale |= 1 << course_id
+        for course_id in iter_bits(stale):
+            self.closure[course_id] = None
+        for course_id in iter_bits(stale):
+            self._closure_of(course_id, set())
+
+    def _closure_of(self, course_id, visiting):
+        closure = self.closure[course_id]
+        if closure is not None:
+            return closure
+        if course_id in visiting:
+            # Cycles do happen in catalog data; the course still requires the others on the loop
+            return 0
+        visiting.add(course_id)
+        closure = 0
+        for member in self.prereqs[course_id]:
+            closure |= (1 << member) | self._closure_of(member, visiting)
+        visiting.discard(course_id)
+        self.closure[course_id] = closure & ~(1 << course_id)
+        return self.closure[course_id]
+
+    def mask_of(self, names):
+        mask = 0
+        for name in names:
+            course_id = self.ids.get(name)
+            if course_id is not None:
+                mask |= 1 << course_id
+        return mask
+
+    def eligible(self, completed, include_unrestricted=False):
+        """Offered courses, not yet completed, whose every prerequisite group has a completed course."""
+        done = self.mask_of(completed)
+        candidates = 0
+        for course_id in iter_bits(done):
+            candidates |= self.dependents[course_id]
+        if include_unrestricted:
+            for course_id in iter_bits(self.offered):
+                if not self.groups[course_id]:
+                    candidates |= 1 << course_id
+        candidates &= self.offered & ~done
+
+        results = []
+        for course_id in iter_bits(candidates):
+            if all(group & done for group in self.groups[course_id]):
+                results.append({
+                    'course': self.names[course_id],
+                    'corequisites': [self.names[coreq] for coreq in self.coreqs[course_id]],
+                })
+        return results
+
+    def describe(self, course_id):
+        return {
+            'prerequisites': [[self.names[member] for member in iter_bits(group)] for group in self.groups[course_id]],
+            'corequisites': [self.names[coreq] for coreq in self.coreqs[course_id]],
+        }
+
+    def chain(self, name):
+        """A course's own requisites plus those of every course in its transitive prerequisite closure."""
+        course_id = self.ids.get(name)
+        if course_id is None:
+            return None
+        return {
+            'course': name,
+            **self.describe(course_id),
+            'chain': {self.names[member]: self.describe(member) for member in iter_bits(self.closure[course_id])},
+        }
+
+
+_graphs = {}
+_graphs_lock = threading.Lock()
+
+
+def apply_snapshot_changes(graph):
+    courses = {}
+    for doc in find_course_requirements(graph.term_code, updated_since=graph.refreshed_at):
+        courses[f"{doc['dept'].upper()} {doc['number'].upper()}"] = doc['requirements']
+        if graph.refreshed_at is None or doc['updated_at'] > graph.refreshed_at:
+            graph.refreshed_at = doc['updated_at']
+    if courses:
+        graph.update(courses)
+    graph.checked_at = time.monotonic()
+
+
+def get_prereq_graph(term_code):
+    """The term's graph, built from the snapshot on first use.
+
+    Every PREREQ_GRAPH_REFRESH seconds only the course documents written since the
+    last refresh are read and applied. Removed courses can't be seen that way, so
+    the graph is rebuilt when the snapshot holds fewer courses than it does.
+    """
+    with _graphs_lock:
+        graph = _graphs.get(term_code)
+        if graph is None:
+            graph = _graphs[term_code] = PrereqGraph(term_code)
+        elif time.monotonic() - graph.checked_at < Config.PREREQ_GRAPH_REFRESH:
+            return graph
+
+        apply_snapshot_changes(graph)
+        if bin(graph.offered).count('1') != count_course_requirements(term_code):
+            graph = _graphs[term_code] = PrereqGraph(term_code)
+            apply_snapshot_changes(graph)
+        return graph
+
+
+def refresh_prereq_graph(term_code):
+    """Have the next lookup pull changed courses now rather than after PREREQ_GRAPH_REFRESH."""
+    with _graphs_lock:
+        graph = _graphs.get(term_code)
+        if graph is not None:
+            graph.checked_at = float('-inf')
@@ -0,0 +1,116 @@
+import contextvars
+import datetime
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from app import mongo
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+RMP_CACHE_COLLECTION = 'rmp_cache'
+
+_school = None
+_school_lock = threading.Lock()
+_indexed = False
+
+
+def get_school():
+    """Resolve the school once per process instead of scraping it on every lookup."""
+    global _school
+    if _school is None:
+        # Imported on first use: ratemyprofessor pulls in bs4 and requests, the slowest imports we have
+        import ratemyprofessor
+        with _school_lock:
+            if _school is None:
+                _school = ratemyprofessor.get_school_by_name(Config.RMP_SCHOOL_NAME)
+    return _school
+
+
+def rmp_cache_collection():
+    global _indexed
+    collection = mongo.db[RMP_CACHE_COLLECTION]
+    if not _indexed:
+        collection.create_index('expires_at', expireAfterSeconds=0)
+        _indexed = True
+    return collection
+
+
+def normalize_name(name):
+    return ' '.join(name.split()).lower()
+
+
+def format_professor(professor):
+    if professor is None:
+        return {}
+    return {
+        'name': professor.name,
+        'department': professor.department,
+        'rating': professor.rating,
+        'num_ratings': professor.num_ratings,
+        'difficulty': professor.difficulty,
+    }
+
+
+def lookup_professor(name):
+    """Scrape RateMyProfessor for one professor, bypassing the cache."""
+    import ratemyprofessor
+    return format_professor(ratemyprofessor.get_professor_by_school_and_name(get_school(), name))
+
+
+def try_lookup_professor(name):
+    # A failed scrape is reported as None for that name rather than failing the whole batch
+    try:
+        return lookup_professor(name)
+    except Exception:
+        logger.exception("RateMyProfessor lookup failed for %s", name)
+        return None
+
+
+def get_professor_ratings(names):
+    """Ratings for many professors as a dict of name -> rating ({} if unknown).
+
+    Repeated names are looked up once, cached ratings come from Mongo in a single
+    query, and the remaining names are scraped concurrently. Unknown professors are
+    cached too (for a shorter TTL) so they don't get scraped on every page load.
+    Names whose scrape failed map to None and aren't cached.
+    """
+    keys = {name: normalize_name(name) for name in names if name and name.strip()}
+    unique_keys = list(dict.fromkeys(keys.values()))
+    if not unique_keys:
+        return {name: {} for name in names}
+
+    now = datetime.datetime.utcnow()
+    collection = rmp_cache_collection()
+    cached = {
+        doc['_id']: doc['rating']
+        for doc in collection.find({'_id': {'$in': unique_keys}, 'expires_at': {'$gt': now}}, {'rating': 1})
+    }
+
+    # Look up each missing name using the first spelling we were given for it
+    missing = {}
+    for name, key in keys.items():
+        if key not in cached and key not in missing:
+            missing[key] = name
+
+    if missing:
+        workers = min(Config.RMP_MAX_CONCURRENCY, len(missing))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                key: executor.submit(contextvars.copy_context().run, try_lookup_professor, name)
+                for key, name in missing.items()
+            }
+            fetched = {key: future.result() for key, future in futures.items()}
+
+        for key, rating in fetched.items():
+            if rating is None:
+                continue
+            ttl = Config.RMP_CACHE_TTL if rating else Config.RMP_NEGATIVE_CACHE_TTL
+            collection.replace_one(
+                {'_id': key},
+                {'_id': key, 'rating': rating, 'expires_at': now + datetime.timedelta(seconds=ttl)},
+                upsert=True,
+            )
+        cached.update(fetched)
+
+    return {name: cached.get(keys.get(name), {}) for name in names}
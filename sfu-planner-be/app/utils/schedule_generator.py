@@ -0,0 +1,113 @@
+import time
+from app.utils.occupancy import events_mask, day_masks, day_span_minutes
+
+
+def section_choices(events):
+    """Group lab or tutorial events (as returned by remove_duplicates) into one choice per distinct time pattern.
+
+    Sections that meet at exactly the same times are interchangeable for conflict
+    checking, so they are collapsed into a single choice listing all of them.
+    """
+    masks_by_section = {}
+    for event in events:
+        for section in event.get('sections') or [event.get('section')]:
+            masks_by_section[section] = masks_by_section.get(section, 0) | events_mask([event])
+
+    sections_by_mask = {}
+    for section, mask in masks_by_section.items():
+        sections_by_mask.setdefault(mask, []).append(section)
+    return [(mask, sections) for mask, sections in sections_by_mask.items()]
+
+
+def course_candidates(course_name, offerings):
+    """Every conflict-free lecture + lab + tutorial combination for one course, as (mask, detail) pairs."""
+    candidates = []
+    for offering in offerings:
+        lecture_mask = events_mask(offering.get('lectures', []))
+        labs = section_choices(offering.get('labs', [])) or [(0, None)]
+        tutorials = section_choices(offering.get('tutorials', [])) or [(0, None)]
+
+        for lab_mask, lab_sections in labs:
+            if lecture_mask & lab_mask:
+                continue
+            for tut_mask, tut_sections in tutorials:
+                if (lecture_mask | lab_mask) & tut_mask:
+                    continue
+                candidates.append((lecture_mask | lab_mask | tut_mask, {
+                    'course': course_name,
+                    'lecture': offering.get('text'),
+                    'labs': lab_sections,
+                    'tutorials': tut_sections,
+                }))
+    return candidates
+
+
+def schedule_score(mask):
+    """Lower is better: fewest days on campus, then the least total time between first and last class."""
+    days = day_masks(mask)
+    return sum(1 for day in days if day), sum(day_span_minutes(day) for day in days)
+
+
+class ScheduleSearch:
+    """Backtracking search for conflict-free schedules.
+
+    `courses` maps a course name to its candidate list from course_candidates.
+    Courses are visited most-constrained first, and a branch is pruned as soon as
+    any remaining course has no candidate left that fits. The search stops after
+    `limit` schedules or `time_budget` seconds; `complete` tells whether it
+    explored everything.
+    """
+
+    def __init__(self, courses, limit=50, time_budget=0.5):
+        self.ordered = [candidates for _, candidates in sorted(courses.items(), key=lambda item: len(item[1]))]
+        self.limit = limit
+        self.time_budget = time_budget
+        self.complete = False
+        self._deadline = None
+        self._found = 0
+
+    def __iter__(self):
+        self._deadline = time.monotonic() + self.time_budget
+        self._found = 0
+        self.complete = False
+        if all(self.ordered):
+            yield from self._search(0, 0, [])
+        if self._found < self.limit and time.monotonic() <= self._deadline:
+            self.complete = True
+
+    def _search(self, depth, used, chosen):
+        if depth == len(self.ordered):
+            self._found += 1
+            yield used, list(chosen)
+            return
+
+        for mask, detail in self.ordered[depth]:
+            if used & mask:
+                continue
+            combined = used | mask
+            # Forward check: every remaining course must still have something that fits
+            if not all(any(not (combined & other) for other, _ in rest) for rest in self.ordered[depth + 1:]):
+                continue
+
+            chosen.append(detail)
+            yield from self._search(depth + 1, combined, chosen)
+            chosen.pop()
+
+            if self._found >= self.limit or time.monotonic() > self._deadline:
+                return
+
+
+def ranked_schedules(courses, limit=50, time_budget=0.5, search_limit=None):
+    """Search up to `search_limit` schedules within the time budget and return the best `limit`.
+
+    Returns (schedules, complete) where `complete` is False if the search was cut short.
+    """
+    if search_limit is None:
+        search_limit = limit * 20
+    search = ScheduleSearch(courses, search_limit, time_budget)
+    results = []
+    for mask, detail in search:
+        days, span = schedule_score(mask)
+        results.append({'days': days, 'span_minutes': span, 'sections': detail})
+    results.sort(key=lambda result: (result['days'], result['span_minutes']))
+    return results[:limit], search.complete
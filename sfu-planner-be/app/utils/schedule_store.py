@@ -0,0 +1,62 @@
+import logging
+from pymongo.errors import PyMongoError
+from app import mongo
+
+logger = logging.getLogger(__name__)
+
+MAX_SCHEDULES = 4
+
+
+class ScheduleLimitError(Exception):
+    pass
+
+
+def ensure_schedule_indexes():
+    try:
+        mongo.db.schedules.create_index('user_id', unique=True, name='user_id_unique')
+    except PyMongoError:
+        logger.exception("Could not ensure the unique user_id index on schedules")
+
+
+def save_user_schedule(user_id, name, term, course_ids):
+    """Create or replace one named schedule with single-document atomic updates.
+
+    Raises ScheduleLimitError if the user already has MAX_SCHEDULES other schedules.
+    """
+    schedule = {"name": name, "term": term, "course_ids": course_ids}
+
+    # Create the user document up front, so the guarded $push below never has to upsert.
+    # An upserting $push whose filter failed would insert a second document for the user
+    # whenever the unique user_id index is missing.
+    mongo.db.schedules.update_one({"user_id": user_id}, {"$setOnInsert": {"schedules": []}}, upsert=True)
+
+    for _ in range(2):
+        # Overwrite the schedule in place if one with this name already exists
+        result = mongo.db.schedules.update_one(
+            {"user_id": user_id, "schedules.name": name},
+            {"$set": {"schedules.$.term": term, "schedules.$.course_ids": course_ids}},
+        )
+        if result.matched_count:
+            return
+
+        # Otherwise append it, only while the user has fewer than MAX_SCHEDULES (i.e. no element at index 3)
+        result = mongo.db.schedules.update_one(
+            {
+                "user_id": user_id,
+                "schedules.name": {"$ne": name},
+                f"schedules.{MAX_SCHEDULES - 1}": {"$exists": False},
+            },
+            {"$push": {"schedules": schedule}},
+        )
+        if result.matched_count:
+            return
+        # Either the user is at the cap, or another request saved this name in the
+        # meantime, so try the in-place update again
+
+    raise ScheduleLimitError(f"Maximum number of schedules reached ({MAX_SCHEDULES})")
+
+
+def delete_user_schedule(user_id, name):
+    """Remove a named schedule. Returns False if the user has no schedules document."""
+    result = mongo.db.schedules.update_one({"user_id": user_id}, {"$pull": {"schedules": {"name": name}}})
+    return result.matched_count > 0
@@ -0,0 +1,158 @@
+import threading
+import time
+from app.utils.occupancy import WEEK_MASK
+from app.utils.single_flight import SingleFlight
+from app.utils.snapshot import find_section_documents
+from config import Config
+
+
+def iter_bits(bitset):
+    while bitset:
+        lowest = bitset & -bitset
+        yield lowest.bit_length() - 1
+        bitset ^= lowest
+
+
+class SectionIndex:
+    """In-memory inverted index over one term's sections.
+
+    Sections are numbered by position, and every posting list is a Python int used
+    as a bitset over those positions, so filters combine with plain & and |.
+    Occupancy is indexed by (dept, weekly slot), where a weekly slot encodes
+    (day, 5-minute time slot) as laid out in app.utils.occupancy.
+    """
+
+    def __init__(self, term_code, documents):
+        self.term_code = term_code
+        self.built_at = time.monotonic()
+        self.expired = False
+        self.sections = []
+        self.all_sections = 0
+        self.by_dept = {}
+        self.by_slot = {}  # dept -> {weekly slot -> bitset}
+        self.by_delivery = {}
+        self.by_instructor = {}
+        self.by_section_code = {}
+
+        for position, doc in enumerate(documents):
+            bit = 1 << position
+            data = doc.get('data', {})
+            info = data.get('info', {})
+            professors = data.get('professor', [])
+            dept = doc['dept']
+            occupancy = int(doc['occupancy'], 16)
+
+            self.sections.append({
+                'name': info.get('name'),
+                'dept': dept,
+                'number': doc['number'],
+                'section': info.get('section') or doc['section'],
+                'sectionCode': doc.get('sectionCode'),
+                'deliveryMethod': info.get('deliveryMethod'),
+                'instructors': [professor.get('name') for professor in professors],
+            })
+            self.all_sections |= bit
+            self._add(self.by_dept, dept, bit)
+            self._add(self.by_delivery, (info.get('deliveryMethod') or '').lower(), bit)
+            self._add(self.by_section_code, (doc.get('sectionCode') or '').upper(), bit)
+            for professor in professors:
+                for name in (professor.get('name'), professor.get('lastName')):
+                    if name:
+                        self._add(self.by_instructor, name.lower(), bit)
+
+            dept_slots = self.by_slot.setdefault(dept, {})
+            for slot in iter_bits(occupancy):
+                dept_slots[slot] = dept_slots.get(slot, 0) | bit
+
+    @staticmethod
+    def _add(index, key, bit):
+        index[key] = index.get(key, 0) | bit
+
+    def query(self, depts=None, allowed_mask=WEEK_MASK, instructor=None, delivery_method=None, section_code=None, limit=None):
+        """Sections whose meetings all fall inside `allowed_mask`, optionally filtered by dept, instructor, delivery method and section type."""
+        if depts:
+            depts = [dept.lower() for dept in depts]
+            candidates = 0
+            for dept in depts:
+                candidates |= self.by_dept.get(dept, 0)
+        else:
+            depts = list(self.by_slot)
+            candidates = self.all_sections
+
+        if instructor:
+            candidates &= self.by_instructor.get(instructor.lower(), 0)
+        if delivery_method:
+            candidates &= self.by_delivery.get(delivery_method.lower(), 0)
+        if section_code:
+            candidates &= self.by_section_code.get(section_code.upper(), 0)
+
+        # Drop every section that occupies any slot outside the allowed window
+        forbidden = WEEK_MASK & ~allowed_mask
+        if forbidden and candidates:
+            conflicting = 0
+            for dept in depts:
+                for slot, bitset in self.by_slot.get(dept, {}).items():
+                    if forbidden >> slot & 1:
+                        conflicting |= bitset
+            candidates &= ~conflicting
+
+        results = []
+        for position in iter_bits(candidates):
+            results.append(self.sections[position])
+            if limit and len(results) >= limit:
+                break
+        return results
+
+
+_indexes = {}
+_rebuilding = set()  # terms whose expired index is being replaced
+_generation = 0  # bumped on invalidation, so a build that raced one isn't kept
+_indexes_lock = threading.Lock()
+_first_builds = SingleFlight('section_index')
+
+
+def _is_fresh(index):
+    return not index.expired and time.monotonic() - index.built_at <= Config.SECTION_INDEX_TTL
+
+
+def _build_index(term_code):
+    with _indexes_lock:
+        generation = _generation
+    index = SectionIndex(term_code, find_section_documents(term_code))
+    with _indexes_lock:
+        if generation == _generation:
+            _indexes[term_code] = index
+    return index
+
+
+def get_section_index(term_code):
+    """The term's index, built from the snapshot on first use and rebuilt after SECTION_INDEX_TTL.
+
+    Builds run outside the global lock. While an expired index is rebuilt by one
+    request, the others keep being served the old one.
+    """
+    with _indexes_lock:
+        index = _indexes.get(term_code)
+        if index is not None and (_is_fresh(index) or term_code in _rebuilding):
+            return index
+        if index is not None:
+            _rebuilding.add(term_code)
+
+    if index is None:
+        # Nothing to serve yet, so concurrent first requests share a single build
+        return _first_builds.do(term_code, lambda: _build_index(term_code))
+    try:
+        return _build_index(term_code)
+    finally:
+        with _indexes_lock:
+            _rebuilding.discard(term_code)
+
+
+def invalidate_section_index(term_code=None):
+    """Expire one term's index, or every term's; each keeps serving until its rebuild is done."""
+    global _generation
+    with _indexes_lock:
+        _generation += 1
+        for term, index in _indexes.items():
+            if term_code is None or term == term_code:
+                index.expired = True
@@ -0,0 +1,104 @@
+import json
+import uuid
+from flask import Response, jsonify, request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+MSGPACK_MIMETYPE = 'application/msgpack'
+
+if orjson is not None:
+    # Sorted keys keep bodies (and so ETags) identical to the stdlib encoder's
+    ORJSON_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+def _default(obj):
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not serializable")
+
+
+def dumps(obj):
+    """Encode to JSON bytes, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=ORJSON_OPTIONS)
+    return json.dumps(obj, default=_default).encode('utf-8')
+
+
+def loads(payload):
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def pack(obj):
+    """Encode to the most compact format available: msgpack, otherwise JSON."""
+    if msgpack is not None:
+        return msgpack.packb(obj, default=_default)
+    return dumps(obj)
+
+
+def unpack(payload):
+    if msgpack is not None:
+        return msgpack.unpackb(payload)
+    return loads(payload)
+
+
+def wants_msgpack():
+    return msgpack is not None and request.accept_mimetypes.best_match(['application/json', MSGPACK_MIMETYPE]) == MSGPACK_MIMETYPE
+
+
+def negotiated_response(data):
+    """jsonify, or msgpack for clients that ask for it in their Accept header."""
+    if wants_msgpack():
+        response = Response(pack(data), mimetype=MSGPACK_MIMETYPE)
+    else:
+        response = jsonify(data)
+    response.vary.add('Accept')
+    return response
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes compact responses with orjson.
+
+    Flask escapes non-ASCII text and orjson doesn't, and orjson rejects integers
+    wider than 64 bits, so such documents, pretty-printed debug output and calls with
+    encoder arguments go through the default provider. Responses then match the
+    default provider's except for float exponents (1e16 rather than 1e+16); dumps()
+    is compact, without the spaces the default provider puts after separators.
+    """
+
+    def _fast_dumps(self, obj):
+        # Encoded bytes, or None when the default provider has to render this document
+        try:
+            body = orjson.dumps(obj, default=self.default, option=ORJSON_OPTIONS)
+        except TypeError:
+            return None
+        return body if body.isascii() else None
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        body = self._fast_dumps(obj)
+        return body.decode('ascii') if body is not None else super().dumps(obj)
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if orjson is None or self.compact is False or (self.compact is None and self._app.debug):
+            return super().response(*args, **kwargs)
+        body = self._fast_dumps(self._prepare_response_obj(args, kwargs))
+        if body is None:
+            return super().response(*args, **kwargs)
+        return self._app.response_class(body + b'\n', mimetype=self.mimetype)
@@ -0,0 +1,137 @@
+import datetime
+import threading
+import time
+from concurrent.futures import Future
+from pymongo.errors import DuplicateKeyError
+from app.utils.serialization import dumps, loads
+from config import Config
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one execution.
+
+    Within a process, callers for a key that is already running wait on the
+    leader's Future. With a shared lock tier, callers in other worker processes
+    wait for the leader there to publish its result instead of recomputing it.
+    """
+
+    def __init__(self, name, shared_tier=None):
+        self.name = name
+        self.shared = shared_tier
+        self.stats = {'leaders': 0, 'followers': 0, 'shared_followers': 0}
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+                self.stats['leaders'] += 1
+            else:
+                self.stats['followers'] += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = self._run_shared(key, fn) if self.shared is not None else fn()
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def _run_shared(self, key, fn):
+        shared_key = f"{self.name}:{key}"
+        if self.shared.acquire(shared_key):
+            try:
+                result = fn()
+            except Exception:
+                self.shared.release(shared_key)
+                raise
+            self.shared.publish(shared_key, result)
+            return result
+
+        result = self.shared.wait(shared_key)
+        if result is None:
+            # The other worker died or took too long, so do the work ourselves
+            return fn()
+        with self._lock:
+            self.stats['shared_followers'] += 1
+        return result
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+        calls = stats['leaders'] + stats['followers']
+        stats['coalescing_ratio'] = (stats['followers'] + stats['shared_followers']) / calls if calls else 0.0
+        return stats
+
+
+class MongoFlightTier:
+    """Cross-process single-flight locks and results in a small Mongo collection.
+
+    Results are JSON encoded, so UUIDs come back as strings, which is how they are rendered anyway.
+    """
+
+    def __init__(self, collection_name='single_flight', lock_ttl=30, result_ttl=10, poll_interval=0.05):
+        self.collection_name = collection_name
+        self.lock_ttl = lock_ttl
+        self.result_ttl = result_ttl
+        self.poll_interval = poll_interval
+        self._indexed = False
+
+    @property
+    def collection(self):
+        from app import mongo
+        collection = mongo.db[self.collection_name]
+        if not self._indexed:
+            collection.create_index('expires_at', expireAfterSeconds=0)
+            self._indexed = True
+        return collection
+
+    def acquire(self, key):
+        now = datetime.datetime.utcnow()
+        # Clear out a lock whose holder has expired before Mongo's TTL monitor gets to it
+        self.collection.delete_one({'_id': key, 'expires_at': {'$lte': now}})
+        try:
+            self.collection.insert_one({
+                '_id': key, 'state': 'running',
+                'expires_at': now + datetime.timedelta(seconds=self.lock_ttl),
+            })
+            return True
+        except DuplicateKeyError:
+            return False
+
+    def publish(self, key, result):
+        self.collection.update_one({'_id': key}, {'$set': {
+            'state': 'done',
+            'result': dumps(result),
+            'expires_at': datetime.datetime.utcnow() + datetime.timedelta(seconds=self.result_ttl),
+        }})
+
+    def release(self, key):
+        self.collection.delete_one({'_id': key, 'state': 'running'})
+
+    def wait(self, key):
+        deadline = time.monotonic() + self.lock_ttl
+        while time.monotonic() < deadline:
+            doc = self.collection.find_one({'_id': key})
+            if doc is None:
+                return None
+            if doc.get('state') == 'done':
+                return loads(doc['result'])
+            time.sleep(self.poll_interval)
+        return None
+
+
+course_flight = SingleFlight(
+    'course',
+    MongoFlightTier(lock_ttl=Config.SINGLE_FLIGHT_LOCK_TTL, result_ttl=Config.SINGLE_FLIGHT_RESULT_TTL)
+    if Config.SINGLE_FLIGHT_SHARED else None,
+)
@@ -0,0 +1,263 @@
+import copy
+import datetime
+import hashlib
+import json
+import logging
+import os
+from pymongo import ASCENDING, ReplaceOne
+from app import mongo
+from app.utils import async_mongo
+from app.utils.api_helpers import (
+    SFU_API_BASE_URL, parse_term_code, request_json, fetch_many_from_api, create_events,
+    process_course_section_data, process_course_number_and_section_data,
+)
+from app.utils.catalog_file import catalog_store, catalog_key, catalog_path, write_catalog
+from app.utils.occupancy import events_mask
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_COLLECTION = 'catalog_snapshots'
+
+
+def snapshot_collection():
+    return mongo.db[SNAPSHOT_COLLECTION]
+
+
+def ensure_snapshot_indexes():
+    snapshot_collection().create_index(
+        [('term', ASCENDING), ('dept', ASCENDING), ('number', ASCENDING), ('section', ASCENDING)],
+        unique=True,
+        name='term_dept_number_section',
+    )
+
+
+def snapshot_key(term_code, dept=None, number=None, section=None):
+    # Department, course and section codes are stored lower-case so lookups are case-insensitive
+    return {
+        'term': term_code,
+        'dept': dept.lower() if dept else None,
+        'number': number.lower() if number else None,
+        'section': section.lower() if section else None,
+    }
+
+
+def payload_hash(payload):
+    return hashlib.sha1(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def to_storable(data):
+    # Event ids are UUID objects, which Mongo cannot encode without a uuidRepresentation
+    return json.loads(json.dumps(data, default=str))
+
+
+def find_section_documents(term_code):
+    """Every ingested section of a term that has an occupancy bitmap."""
+    return snapshot_collection().find(
+        {'term': term_code, 'section': {'$ne': None}, 'occupancy': {'$exists': True}},
+        {'_id': 0, 'dept': 1, 'number': 1, 'section': 1, 'sectionCode': 1, 'occupancy': 1,
+         'data.professor': 1, 'data.info.deliveryMethod': 1, 'data.info.name': 1, 'data.info.section': 1},
+    )
+
+
+def find_course_requirements(term_code, updated_since=None):
+    """Parsed requisites of a term's courses, optionally only those written since a time."""
+    query = {'term': term_code, 'number': {'$ne': None}, 'section': None, 'requirements': {'$exists': True}}
+    if updated_since is not None:
+        # Inclusive, since Mongo keeps milliseconds; re-applying a course is harmless
+        query['updated_at'] = {'$gte': updated_since}
+    return snapshot_collection().find(query, {'_id': 0, 'dept': 1, 'number': 1, 'requirements': 1, 'updated_at': 1})
+
+
+def count_course_requirements(term_code):
+    return snapshot_collection().count_documents(
+        {'term': term_code, 'number': {'$ne': None}, 'section': None, 'requirements': {'$exists': True}})
+
+
+def course_requirements(section_responses):
+    """Parse the course's prerequisite and corequisite text, taken from the first section that has any."""
+    from app.utils.prereq_graph import parse_requirements
+    texts = {'prerequisites': '', 'corequisites': ''}
+    for section_data in section_responses.values():
+        info = (section_data or {}).get('info', {})
+        for field in texts:
+            texts[field] = texts[field] or info.get(field) or ''
+    return {field: parse_requirements(text) for field, text in texts.items()}
+
+
+def find_snapshot(term_code, dept=None, number=None, section=None):
+    """Return the pre-processed payload stored for a route, or None if it hasn't been ingested.
+
+    The term's memory-mapped catalog file is checked before Mongo.
+    """
+    data = catalog_store.get(term_code, dept, number, section)
+    if data is not None:
+        return data
+    doc = snapshot_collection().find_one(snapshot_key(term_code, dept, number, section), {'data': 1, '_id': 0})
+    return doc['data'] if doc else None
+
+
+async def find_snapshot_async(term_code, dept=None, number=None, section=None):
+    """find_snapshot for the ASGI mode, reading Mongo through motor."""
+    data = catalog_store.get(term_code, dept, number, section)
+    if data is not None:
+        return data
+    doc = await async_mongo.find_one(SNAPSHOT_COLLECTION, snapshot_key(term_code, dept, number, section), {'data': 1, '_id': 0})
+    return doc['data'] if doc else None
+
+
+class TermIngester:
+    """Crawls a whole term from the SFU course-outline API into the snapshot collection.
+
+    On refresh, payloads are compared against the stored hashes and only courses
+    with a changed listing or section are re-processed and re-written. Departments,
+    courses and sections that are no longer listed are removed.
+    """
+
+    def __init__(self, term_code, full=False):
+        self.term_code = term_code
+        self.full = full
+        self.year, self.term = parse_term_code(term_code)
+        self.stats = {'departments': 0, 'courses': 0, 'sections': 0, 'updated': 0, 'unchanged': 0, 'removed': 0, 'errors': 0}
+        self._hashes = {}
+
+    def run(self):
+        ensure_snapshot_indexes()
+        if not self.full:
+            self._load_hashes()
+
+        departments = request_json(f"{SFU_API_BASE_URL}{self.year}/{self.term}")
+        self._write([self._document(snapshot_key(self.term_code), departments)])
+        self._prune({}, 'dept', [department.get('value') for department in departments])
+
+        for department in departments:
+            dept = department.get('value')
+            if not dept:
+                continue
+            try:
+                self.ingest_department(dept)
+            except Exception:
+                self.stats['errors'] += 1
+                logger.exception("Failed to ingest department %s", dept)
+
+        from app.utils.section_index import invalidate_section_index
+        from app.utils.prereq_graph import refresh_prereq_graph
+        invalidate_section_index(self.term_code)
+        refresh_prereq_graph(self.term_code)
+
+        # Workers read the catalog file before Mongo, so an existing one must not keep serving old data
+        if (self.stats['updated'] or self.stats['removed']) and Config.CATALOG_DIR \
+                and os.path.exists(catalog_path(self.term_code)):
+            export_catalog(self.term_code)
+
+        logger.info("Ingested term %s: %s", self.term_code, self.stats)
+        return self.stats
+
+    def ingest_department(self, dept):
+        courses = request_json(f"{SFU_API_BASE_URL}{self.year}/{self.term}/{dept}")
+        self._write([self._document(snapshot_key(self.term_code, dept), courses)])
+        self._prune({'dept': dept.lower()}, 'number', [course.get('value') for course in courses])
+        self.stats['departments'] += 1
+
+        for course in courses:
+            number = course.get('value')
+            if not number:
+                continue
+            try:
+                self.ingest_course(dept, number)
+            except Exception:
+                self.stats['errors'] += 1
+                logger.exception("Failed to ingest course %s %s", dept, number)
+
+    def ingest_course(self, dept, number):
+        course_url = f"{SFU_API_BASE_URL}{self.year}/{self.term}/{dept}/{number}"
+        course_number_data = request_json(course_url)
+        self.stats['courses'] += 1
+
+        sections = [cls['text'] for cls in course_number_data]
+        self._prune({'dept': dept.lower(), 'number': number.lower()}, 'section', sections)
+        section_codes = {cls['text']: cls.get('sectionCode') for cls in course_number_data}
+        section_urls = {section: f"{course_url}/{section}" for section in sections}
+        section_responses = fetch_many_from_api(section_urls.values(), fetch=request_json)
+        self.stats['sections'] += len(sections)
+
+        documents = []
+        course_key = snapshot_key(self.term_code, dept, number)
+        course_hash = payload_hash(course_number_data)
+        changed = self._hashes.get(self._hash_key(course_key)) != course_hash
+
+        for section in sections:
+            section_data = section_responses[section_urls[section]]
+            section_key = snapshot_key(self.term_code, dept, number, section)
+            section_hash = payload_hash(section_data)
+            if self._hashes.get(self._hash_key(section_key)) == section_hash:
+                continue
+            changed = True
+            document = self._document(section_key, process_course_section_data(section_data), section_hash)
+            # Weekly occupancy bitmap for time-window searches, hex encoded since it is wider than 64 bits
+            document['occupancy'] = format(events_mask(create_events(section_data.get('courseSchedule', []))), 'x')
+            document['sectionCode'] = section_codes.get(section)
+            documents.append(document)
+
+        if not changed:
+            self.stats['unchanged'] += 1
+            return
+
+        # Rebuild the course offerings from the responses we already have instead of fetching again
+        offerings = process_course_number_and_section_data(
+            copy.deepcopy(course_number_data), self.year, self.term, dept, number,
+            fetch=lambda url, timeout=None: section_responses[url],
+        )
+        document = self._document(course_key, offerings, course_hash)
+        # Parsed once here so the prerequisite graph only re-reads courses that changed
+        document['requirements'] = course_requirements(section_responses)
+        documents.append(document)
+        self._write(documents)
+        self.stats['updated'] += 1
+
+    def _prune(self, parent, field, listed):
+        """Delete snapshot documents under `parent` whose `field` is no longer listed, with everything below them."""
+        listed = [value.lower() for value in listed if value]
+        result = snapshot_collection().delete_many(
+            dict(parent, term=self.term_code, **{field: {'$nin': listed + [None]}}))
+        self.stats['removed'] += result.deleted_count
+
+    def _load_hashes(self):
+        cursor = snapshot_collection().find(
+            # Sections ingested before occupancy bitmaps, and courses before parsed requisites, are treated as changed
+            {'term': self.term_code, 'hash': {'$exists': True},
+             '$or': [{'section': None, 'number': None}, {'section': None, 'requirements': {'$exists': True}},
+                     {'occupancy': {'$exists': True}}]},
+            {'dept': 1, 'number': 1, 'section': 1, 'hash': 1, '_id': 0},
+        )
+        self._hashes = {(doc['dept'], doc['number'], doc['section']): doc['hash'] for doc in cursor}
+
+    @staticmethod
+    def _hash_key(key):
+        return key['dept'], key['number'], key['section']
+
+    @staticmethod
+    def _document(key, data, data_hash=None):
+        document = dict(key, data=to_storable(data), updated_at=datetime.datetime.utcnow())
+        if data_hash is not None:
+            document['hash'] = data_hash
+        return document
+
+    @staticmethod
+    def _write(documents):
+        if documents:
+            snapshot_collection().bulk_write([
+                ReplaceOne({k: doc[k] for k in ('term', 'dept', 'number', 'section')}, doc, upsert=True)
+                for doc in documents
+            ], ordered=False)
+
+
+def ingest_term(term_code, full=False):
+    return TermIngester(term_code, full=full).run()
+
+
+def export_catalog(term_code, directory=None):
+    """Write a term's snapshot to its catalog file, swapping it in for running workers."""
+    cursor = snapshot_collection().find({'term': term_code}, {'_id': 0, 'dept': 1, 'number': 1, 'section': 1, 'data': 1})
+    entries = {catalog_key(doc['dept'], doc['number'], doc['section']): doc['data'] for doc in cursor}
+    return write_catalog(catalog_path(term_code, directory), entries)
@@ -0,0 +1,58 @@
+import importlib
+import logging
+import threading
+import time
+from pymongo.errors import PyMongoError
+from app import mongo
+from app.utils.cd_helpers import ensure_course_grade_indexes
+from app.utils.http_client import sfu_client
+from app.utils.schedule_store import ensure_schedule_indexes
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Loaded lazily by the routes that need them
+PRELOAD_MODULES = ('ratemyprofessor', 'requests', 'app.utils.ical')
+
+# Set once Mongo has answered a ping and the indexes are in place
+warmed_up = threading.Event()
+warm_up_stats = {'attempts': 0, 'seconds': None}
+
+
+def ensure_indexes():
+    ensure_course_grade_indexes()
+    ensure_schedule_indexes()
+
+
+def ping_mongo():
+    """Round-trip a ping to Mongo and return how long it took, in seconds."""
+    start = time.perf_counter()
+    mongo.db.command('ping')
+    return time.perf_counter() - start
+
+
+def warm_up(retry_interval=2.0, max_retry_interval=30.0):
+    """Connect to Mongo (filling the pool up to minPoolSize) and ensure indexes, retrying until Mongo answers."""
+    start = time.perf_counter()
+    while True:
+        warm_up_stats['attempts'] += 1
+        try:
+            ping_mongo()
+            break
+        except PyMongoError:
+            logger.warning("Mongo is not reachable yet, retrying in %.0fs", retry_interval)
+            time.sleep(retry_interval)
+            retry_interval = min(retry_interval * 2, max_retry_interval)
+
+    ensure_indexes()
+    warm_up_stats['seconds'] = time.perf_counter() - start
+    warmed_up.set()
+
+
+def preload():
+    """Import the modules routes otherwise load on first use, and open the upstream session."""
+    for name in PRELOAD_MODULES:
+        importlib.import_module(name)
+    if Config.SFU_API_CLIENT == 'async':
+        importlib.import_module('app.utils.async_client')
+    sfu_client.session
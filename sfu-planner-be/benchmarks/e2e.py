@@ -0,0 +1,127 @@
+"""End-to-end latency and throughput runs against the app from entry.py, served as WSGI or ASGI."""
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+SCENARIOS = {
+    'terms': ('GET', '/api/terms/terms', None),
+    'sfuapi_departments': ('GET', '/api/sfuapi/?termCode=1247', None),
+    'sfuapi_courses': ('GET', '/api/sfuapi/?termCode=1247&major=cmpt', None),
+    'sfuapi_course': ('GET', '/api/sfuapi/?termCode=1247&major=cmpt&course=120', None),
+    'sfuapi_section': ('GET', '/api/sfuapi/?termCode=1247&major=cmpt&course=120&section=d100', None),
+    'cd': ('GET', '/api/cd/?course=CMPT 120', None),
+    'rmp': ('GET', '/api/rmp/?name=Jane Doe', None),
+    'user_save': ('POST', '/api/user/save', {
+        'name': 'Bench', 'term': {'semester': 'Fall', 'year': '2024'},
+        'course_ids': [{'offering': '2024/fall/cmpt/120/d100', 'lab': 'D101', 'tutorial': ''}],
+    }),
+    'user_get': ('GET', '/api/user/', None),
+    'schedule': ('POST', '/api/schedules/generate', {
+        'termCode': '1247',
+        'courses': [{'major': 'cmpt', 'course': '120'}, {'major': 'cmpt', 'course': '125'}, {'major': 'math', 'course': '151'}],
+    }),
+}
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+class AppServer:
+    """Runs the WSGI app on a background thread on an ephemeral port."""
+
+    def __init__(self, app):
+        self.server = make_server('127.0.0.1', 0, app, threaded=True, request_handler=QuietRequestHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server.server_port}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+
+
+class AsgiAppServer:
+    """Runs the ASGI app under uvicorn on a background thread on an ephemeral port."""
+
+    def __init__(self, app):
+        import uvicorn
+        self.socket = socket.socket()
+        self.socket.bind(('127.0.0.1', 0))
+        self.server = uvicorn.Server(uvicorn.Config(app, log_level='warning', access_log=False))
+        self.thread = threading.Thread(target=self.server.run, kwargs={'sockets': [self.socket]}, daemon=True)
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.socket.getsockname()[1]}"
+
+    def __enter__(self):
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self.thread.join()
+
+
+def run_scenario(base_url, method, path, body, total_requests, concurrency):
+    local = threading.local()
+
+    def one_request(_):
+        session = getattr(local, 'session', None)
+        if session is None:
+            session = local.session = requests.Session()
+            session.cookies.set('user_uuid', f"bench-{threading.get_ident()}")
+        start = time.perf_counter()
+        response = session.request(method, base_url + path, json=body, timeout=60)
+        elapsed = time.perf_counter() - start
+        return elapsed, response.status_code
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(one_request, range(total_requests)))
+    wall = time.perf_counter() - start
+
+    latencies = sorted(elapsed for elapsed, _ in results)
+    errors = sum(1 for _, status in results if status >= 400)
+    return {
+        'requests': total_requests,
+        'concurrency': concurrency,
+        'errors': errors,
+        'req_per_s': total_requests / wall if wall else None,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p95_ms': percentile(latencies, 0.95) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'max_ms': latencies[-1] * 1000,
+    }
+
+
+def run_e2e(app, scenarios=None, total_requests=200, concurrency=16, cold=True, server_mode='wsgi'):
+    from app.utils.cache import api_cache
+
+    results = {}
+    with (AsgiAppServer if server_mode == 'asgi' else AppServer)(app) as server:
+        for name in scenarios or SCENARIOS:
+            method, path, body = SCENARIOS[name]
+            if cold:
+                api_cache.clear()
+            results[name] = run_scenario(server.base_url, method, path, body, total_requests, concurrency)
+    return results
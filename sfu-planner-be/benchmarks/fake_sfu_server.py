@@ -0,0 +1,90 @@
+"""Local stand-in for the SFU course-outline API that replays recorded fixture JSON.
+
+    python -m benchmarks.fake_sfu_server --port 8765 --latency 0.08 --jitter 0.02
+
+Then point SFU_API_BASE_URL at http://127.0.0.1:8765/ .
+"""
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES_PATH = os.path.join(os.path.dirname(__file__), 'fixtures', 'sfu_api.json')
+
+
+def load_fixtures(path=FIXTURES_PATH):
+    with open(path) as f:
+        fixtures = json.load(f)
+    # Pre-encode every payload so serving a request costs nothing but the simulated latency
+    return {key.lower(): json.dumps(value).encode('utf-8') for key, value in fixtures.items()}
+
+
+class FakeSFUServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256  # the default backlog of 5 drops SYNs when a pool opens many connections at once
+
+    def __init__(self, address, fixtures, latency=0.0, jitter=0.0):
+        super().__init__(address, FakeSFUHandler)
+        self.fixtures = fixtures
+        self.latency = latency
+        self.jitter = jitter
+        self.request_count = 0
+        self._count_lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self):
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return self
+
+
+class FakeSFUHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, like the real API
+
+    def do_GET(self):
+        server = self.server
+        with server._count_lock:
+            server.request_count += 1
+
+        delay = server.latency + random.uniform(-server.jitter, server.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+        key = self.path.split('?', 1)[0].strip('/').lower()
+        body = server.fixtures.get(key)
+        if body is None:
+            self.send_response(404)
+            body = b'{"error": "not found"}'
+        else:
+            self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fake_server(latency=0.0, jitter=0.0, port=0, fixtures_path=FIXTURES_PATH):
+    return FakeSFUServer(('127.0.0.1', port), load_fixtures(fixtures_path), latency, jitter).start()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve recorded SFU course-outline fixtures locally.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05, help="Mean response delay in seconds")
+    parser.add_argument("--jitter", type=float, default=0.01, help="Uniform +/- jitter in seconds")
+    parser.add_argument("--fixtures", default=FIXTURES_PATH)
+    args = parser.parse_args()
+
+    server = FakeSFUServer(('127.0.0.1', args.port), load_fixtures(args.fixtures), args.latency, args.jitter)
+    print(f"Serving {len(server.fixtures)} fixtures at {server.base_url}")
+    server.serve_forever()
@@ -0,0 +1,53 @@
+"""Microbenchmarks for the pure-Python processing helpers in app.utils.api_helpers."""
+import copy
+import statistics
+import timeit
+
+
+def _timed(func, repeat, number):
+    runs = timeit.repeat(func, repeat=repeat, number=number)
+    per_call = [run / number for run in runs]
+    return {
+        'calls': repeat * number,
+        'best_us': min(per_call) * 1e6,
+        'median_us': statistics.median(per_call) * 1e6,
+    }
+
+
+def run_microbenchmarks(fixtures, repeat=5, number=200):
+    from app.utils import api_helpers
+
+    course_listings = {path: payload for path, payload in fixtures.items() if len(path.split('/')) == 4}
+    sections = [payload for path, payload in fixtures.items() if len(path.split('/')) == 5]
+    schedules = [section.get('courseSchedule', []) for section in sections]
+    labs = [api_helpers.process_lab_tut_section_data(section) for section in sections]
+
+    def bench_create_events():
+        for schedule in schedules:
+            api_helpers.create_events(schedule)
+
+    def bench_remove_duplicates():
+        api_helpers.remove_duplicates([dict(event) for events in labs for event in events])
+
+    def bench_process_course_number_data():
+        for listing in course_listings.values():
+            api_helpers.process_course_number_data(copy.deepcopy(listing))
+
+    def bench_process_course_section_data():
+        for section in sections:
+            api_helpers.process_course_section_data(section)
+
+    results = {
+        'create_events': _timed(bench_create_events, repeat, number),
+        'remove_duplicates': _timed(bench_remove_duplicates, repeat, number),
+        'process_course_number_data': _timed(bench_process_course_number_data, repeat, number),
+        'process_course_section_data': _timed(bench_process_course_section_data, repeat, number),
+    }
+    for name, result in results.items():
+        result['items_per_call'] = {
+            'create_events': len(schedules),
+            'remove_duplicates': sum(len(events) for events in labs),
+            'process_course_number_data': len(course_listings),
+            'process_course_section_data': len(sections),
+        }[name]
+    return results
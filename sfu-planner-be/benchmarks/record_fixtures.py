@@ -0,0 +1,43 @@
+"""Record real SFU course-outline responses into a fixture file for the fake server.
+
+    python -m benchmarks.record_fixtures 2024 fall cmpt/120 math/151
+"""
+import argparse
+import json
+import requests
+from benchmarks.fake_sfu_server import FIXTURES_PATH
+
+SFU_API_URL = 'https://www.sfu.ca/bin/wcm/course-outlines?'
+
+
+def record(base_url, year, term, courses):
+    fixtures = {}
+
+    def get(path):
+        response = requests.get(f"{base_url}{path}", timeout=10)
+        response.raise_for_status()
+        fixtures[path] = response.json()
+        return fixtures[path]
+
+    get(f"{year}/{term}")
+    for course in courses:
+        dept, number = course.lower().split('/')
+        get(f"{year}/{term}/{dept}")
+        for cls in get(f"{year}/{term}/{dept}/{number}"):
+            get(f"{year}/{term}/{dept}/{number}/{cls['value']}")
+    return fixtures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record SFU course-outline fixtures.")
+    parser.add_argument("year")
+    parser.add_argument("term")
+    parser.add_argument("courses", nargs="+", help="dept/number pairs, e.g. cmpt/120")
+    parser.add_argument("--base-url", default=SFU_API_URL)
+    parser.add_argument("--output", default=FIXTURES_PATH)
+    args = parser.parse_args()
+
+    fixtures = record(args.base_url, args.year, args.term, args.courses)
+    with open(args.output, 'w') as f:
+        json.dump(fixtures, f, indent=1, sort_keys=True)
+    print(f"Recorded {len(fixtures)} responses to {args.output}")
@@ -0,0 +1,107 @@
+"""Benchmark runner: microbenchmarks plus end-to-end runs against local stand-ins.
+
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --e2e-only --latency 0.08 --requests 500 --concurrency 32
+    python -m benchmarks.run --e2e-only --server-mode asgi --scenario cd --scenario schedule
+
+Results are written as JSON so successive versions can be compared.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+from benchmarks.fake_sfu_server import FIXTURES_PATH, start_fake_server
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run sfu-planner backend benchmarks.")
+    parser.add_argument("--output", default=None, help="Where to write the JSON results (default: stdout)")
+    parser.add_argument("--micro-only", action="store_true")
+    parser.add_argument("--e2e-only", action="store_true")
+    parser.add_argument("--scenario", action="append", help="Only run the named e2e scenario (repeatable)")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per e2e scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake SFU API mean latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--rmp-latency", type=float, default=0.2)
+    parser.add_argument("--warm", action="store_true", help="Keep the response cache between scenarios")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the upstream response cache")
+    parser.add_argument("--upstream-client", choices=["sync", "async"], default="sync",
+                        help="Fan out upstream calls on a thread pool or the shared async client")
+    parser.add_argument("--server-mode", choices=["wsgi", "asgi"], default="wsgi",
+                        help="Serve the Flask app with werkzeug, or under uvicorn with the native async routes")
+    parser.add_argument("--mongo", choices=["mongomock", "local"], default="mongomock",
+                        help="Use mongomock, or the mongod at MONGO_URI")
+    parser.add_argument("--admission", action="store_true",
+                        help="Keep admission control on (off by default, since one benchmark client drives all the load)")
+    args = parser.parse_args(argv)
+
+    fake_server = start_fake_server(args.latency, args.jitter)
+    # The app reads its settings at import time, so point it at the stand-ins first
+    os.environ['SFU_API_BASE_URL'] = fake_server.base_url
+    os.environ.setdefault('MONGO_URI', 'mongodb://127.0.0.1:27017/sfu_planner_bench')
+    os.environ.setdefault('JWT_SECRET_KEY', 'benchmark')
+    os.environ['SFU_API_CLIENT'] = args.upstream_client
+    os.environ['SERVER_MODE'] = args.server_mode
+    os.environ['ADMISSION_ENABLED'] = 'true' if args.admission else 'false'
+    if args.no_cache:
+        os.environ['SFU_API_CACHE_MAX_BYTES'] = '0'
+
+    with open(FIXTURES_PATH) as f:
+        fixtures = json.load(f)
+
+    results = {
+        'meta': {
+            'timestamp': datetime.datetime.utcnow().isoformat() + 'Z',
+            'git_revision': git_revision(),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'args': vars(args),
+        },
+    }
+
+    if not args.e2e_only:
+        from benchmarks.microbench import run_microbenchmarks
+        results['micro'] = run_microbenchmarks(fixtures)
+
+    if not args.micro_only:
+        from app import create_app, mongo
+        from benchmarks.e2e import run_e2e
+        from benchmarks.stand_ins import use_mongomock, seed_course_grades, use_fake_ratemyprofessor
+
+        if args.server_mode == 'asgi':
+            from app.async_app import create_asgi_app
+            app = create_asgi_app()
+        else:
+            app = create_app()
+        if args.mongo == 'mongomock':
+            use_mongomock(mongo)
+        seed_course_grades(mongo.db, fixtures)
+        use_fake_ratemyprofessor(args.rmp_latency)
+
+        results['e2e'] = run_e2e(app, args.scenario, args.requests, args.concurrency, cold=not args.warm,
+                                 server_mode=args.server_mode)
+        results['meta']['upstream_requests'] = fake_server.request_count
+
+    fake_server.shutdown()
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Concurrent save load test for schedule persistence.
+
+Compares the old find_one + rewrite-the-array approach with the atomic updates in
+app.utils.schedule_store: many users each save MAX_SCHEDULES differently named
+schedules from parallel threads, and we count how many saves were lost.
+
+    python -m benchmarks.schedule_load --users 200 --concurrency 32
+    python -m benchmarks.schedule_load --mongo local   # against the mongod at MONGO_URI
+
+Races are less frequent under mongomock than against a real mongod, where the
+round-trip between find_one and update_one is much wider.
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def read_modify_write_save(db, user_id, name, term, course_ids):
+    # The pre-atomic implementation, kept here as the baseline
+    user = db.schedules.find_one({"user_id": user_id})
+    if user:
+        schedules = user.get('schedules', [])
+        for schedule in schedules:
+            if schedule['name'] == name:
+                schedule['term'] = term
+                schedule['course_ids'] = course_ids
+                break
+        else:
+            schedules.append({"name": name, "term": term, "course_ids": course_ids})
+        db.schedules.update_one({"user_id": user_id}, {"$set": {"schedules": schedules}})
+    else:
+        db.schedules.insert_one({"user_id": user_id, "schedules": [{"name": name, "term": term, "course_ids": course_ids}]})
+
+
+def run_load(save, db, users, concurrency, per_user):
+    db.schedules.delete_many({})
+    term = {'semester': 'Fall', 'year': '2024'}
+    course_ids = [{'offering': '2024/fall/cmpt/120/d100', 'lab': 'D101', 'tutorial': ''}]
+    # Consecutive jobs hit the same user so their saves race each other
+    jobs = [(f"load-user-{u}", f"Plan {n}") for u in range(users) for n in range(per_user)]
+
+    def one_save(job):
+        user_id, name = job
+        try:
+            save(user_id, name, term, course_ids)
+            return True
+        except Exception:
+            return False
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        succeeded = sum(executor.map(one_save, jobs))
+    elapsed = time.perf_counter() - start
+
+    stored = sum(len(doc.get('schedules', [])) for doc in db.schedules.find({}, {'schedules.name': 1}))
+    return {
+        'saves': len(jobs),
+        'succeeded': succeeded,
+        'stored': stored,
+        'lost_updates': succeeded - stored,
+        'user_documents': db.schedules.count_documents({}),
+        'saves_per_s': len(jobs) / elapsed,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Schedule save load test.")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--mongo", choices=["mongomock", "local"], default="mongomock")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault('MONGO_URI', 'mongodb://127.0.0.1:27017/sfu_planner_bench')
+    os.environ.setdefault('JWT_SECRET_KEY', 'benchmark')
+    from app import create_app, mongo
+    from app.utils.schedule_store import MAX_SCHEDULES, ensure_schedule_indexes, save_user_schedule
+    from benchmarks.stand_ins import use_mongomock
+
+    create_app()
+    if args.mongo == 'mongomock':
+        use_mongomock(mongo)
+    db = mongo.db
+
+    results = {}
+    db.schedules.drop_indexes()
+    results['read_modify_write'] = run_load(
+        lambda *save_args: read_modify_write_save(db, *save_args), db, args.users, args.concurrency, MAX_SCHEDULES)
+    ensure_schedule_indexes()
+    results['atomic'] = run_load(save_user_schedule, db, args.users, args.concurrency, MAX_SCHEDULES)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Stand-ins for MongoDB and RateMyProfessor so the app can be benchmarked offline."""
+import time
+from types import SimpleNamespace
+
+
+def use_mongomock(mongo):
+    """Swap the app's Mongo handle for an in-memory mongomock database."""
+    try:
+        import mongomock
+    except ImportError:
+        raise SystemExit("mongomock is not installed; pip install mongomock or run with --mongo local")
+    from app.utils import async_mongo
+    mongo.cx = mongomock.MongoClient()
+    mongo.db = mongo.cx.sfu_planner_bench
+    # The ASGI mode's async queries have to read the same in-memory database
+    async_mongo.use_motor = False
+    return mongo.db
+
+
+def seed_course_grades(db, fixtures):
+    """Insert a CourseDiggers-style grade document for every course in the fixtures."""
+    documents = []
+    for path, payload in fixtures.items():
+        parts = path.split('/')
+        if len(parts) == 3 and isinstance(payload, list):
+            dept = parts[2].upper()
+            for course in payload:
+                documents.append({
+                    'course_name': f"{dept} {course['value']}",
+                    'median_grade': 'B',
+                    'fail_rate': 5.0,
+                    'a_plus_percentage': 8.0, 'a_percentage': 12.0, 'a_minus_percentage': 10.0,
+                    'b_plus_percentage': 12.0, 'b_percentage': 14.0, 'b_minus_percentage': 10.0,
+                    'c_plus_percentage': 8.0, 'c_grade_percentage': 8.0, 'c_minus_percentage': 5.0,
+                    'd_percentage': 3.0,
+                })
+    if documents:
+        db.mydatabase.insert_many(documents)
+    return len(documents)
+
+
+def use_fake_ratemyprofessor(latency=0.0):
+    """Replace the ratemyprofessor scraping calls with constant-latency fakes."""
+    import ratemyprofessor
+
+    def get_school_by_name(name):
+        time.sleep(latency)
+        return SimpleNamespace(id=1482, name=name)
+
+    def get_professor_by_school_and_name(school, name):
+        time.sleep(latency)
+        if not name:
+            return None
+        return SimpleNamespace(name=name, department='Computing Science', rating=4.2, num_ratings=37, difficulty=3.1)
+
+    ratemyprofessor.get_school_by_name = get_school_by_name
+    ratemyprofessor.get_professor_by_school_and_name = get_professor_by_school_and_name
@@ -0,0 +1,110 @@
+"""Startup benchmark: how long `create_app()` takes in a fresh interpreter, with an import-time breakdown.
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --runs 5 --top 20 --budget-ms 800
+    python -m benchmarks.startup --preload   # with APP_PRELOAD=true
+
+Each run is a new `python -X importtime` process. The median startup time is
+compared against --budget-ms (default: STARTUP_BUDGET_MS), and the exit status is
+1 if it is over budget, so this can gate a deploy.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+SNIPPET = """
+import json, time
+start = time.perf_counter()
+from app import create_app
+create_app()
+print(json.dumps({'startup_ms': (time.perf_counter() - start) * 1000}))
+"""
+
+
+def package_of(module):
+    # Our own modules are reported individually, third-party ones by distribution
+    parts = module.split('.')
+    return '.'.join(parts[:3]) if parts[0] == 'app' else parts[0]
+
+
+def parse_importtime(stderr):
+    """-X importtime lines -> {package: microseconds spent importing its own modules}.
+
+    Self times are summed rather than cumulative ones, so the breakdown adds up to
+    the total import time without double counting nested imports.
+    """
+    totals = defaultdict(int)
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        totals[package_of(name.strip())] += int(self_us)
+    return totals
+
+
+def run_once(env):
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', SNIPPET],
+        env=env, capture_output=True, text=True, timeout=120,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"create_app failed:\n{result.stderr[-2000:]}")
+    startup_ms = json.loads(result.stdout.strip().splitlines()[-1])['startup_ms']
+    return startup_ms, parse_importtime(result.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure backend cold-start time.")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15, help="How many of the slowest imports to report")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Fail above this median startup time")
+    parser.add_argument("--preload", action="store_true", help="Measure with APP_PRELOAD=true")
+    parser.add_argument("--output", default=None, help="Where to write the JSON results (default: stdout)")
+    args = parser.parse_args(argv)
+
+    env = dict(os.environ)
+    # create_app only needs these to be set; nothing is contacted before the first request
+    env.setdefault('MONGO_URI', 'mongodb://127.0.0.1:27017/sfu_planner_bench')
+    env.setdefault('JWT_SECRET_KEY', 'benchmark')
+    env['APP_PRELOAD'] = 'true' if args.preload else 'false'
+    env['PREFETCH_ENABLED'] = 'false'
+
+    from config import Config
+    budget_ms = args.budget_ms if args.budget_ms is not None else Config.STARTUP_BUDGET_MS
+
+    timings = []
+    imports = defaultdict(list)
+    for _ in range(args.runs):
+        startup_ms, totals = run_once(env)
+        timings.append(startup_ms)
+        for name, micros in totals.items():
+            imports[name].append(micros / 1000)
+
+    median_ms = statistics.median(timings)
+    slowest = sorted(((statistics.median(ms), name) for name, ms in imports.items()), reverse=True)[:args.top]
+    results = {
+        'preload': args.preload,
+        'runs_ms': [round(ms, 1) for ms in timings],
+        'median_ms': round(median_ms, 1),
+        'budget_ms': budget_ms,
+        'within_budget': median_ms <= budget_ms,
+        'slowest_imports_ms': {name: round(ms, 1) for ms, name in slowest},
+    }
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
+    if not results['within_budget']:
+        print(f"Startup took {median_ms:.0f} ms, over the {budget_ms:.0f} ms budget", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,99 @@ load_dotenv()
 
 class Config:
     MONGO_URI = os.getenv('MONGO_URI')
+    # Mongo connection pool
+    MONGO_MAX_POOL_SIZE = int(os.getenv('MONGO_MAX_POOL_SIZE', 100))
+    MONGO_MIN_POOL_SIZE = int(os.getenv('MONGO_MIN_POOL_SIZE', 5))
+    MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv('MONGO_WAIT_QUEUE_TIMEOUT_MS', 2000))
+    MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv('MONGO_SERVER_SELECTION_TIMEOUT_MS', 5000))
+    MONGO_READ_PREFERENCE = os.getenv('MONGO_READ_PREFERENCE', 'primary')
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY')
     SFU_API_BASE_URL = os.getenv('SFU_API_BASE_URL')
+    SFU_OUTLINE_URL = os.getenv('SFU_OUTLINE_URL')
+    # Upstream SFU course-outline fan-out
+    SFU_API_MAX_CONCURRENCY = int(os.getenv('SFU_API_MAX_CONCURRENCY', 16))
+    SFU_API_TIMEOUT = float(os.getenv('SFU_API_TIMEOUT', 10))
+    # 'sync' fans out on a thread pool, 'async' multiplexes on a shared event loop
+    SFU_API_CLIENT = os.getenv('SFU_API_CLIENT', 'sync').lower()
+    SFU_API_CONNECT_TIMEOUT = float(os.getenv('SFU_API_CONNECT_TIMEOUT', 3.05))
+    SFU_API_POOL_SIZE = int(os.getenv('SFU_API_POOL_SIZE', 32))
+    SFU_API_MAX_RETRIES = int(os.getenv('SFU_API_MAX_RETRIES', 3))
+    SFU_API_BACKOFF_BASE = float(os.getenv('SFU_API_BACKOFF_BASE', 0.25))
+    SFU_API_BACKOFF_MAX = float(os.getenv('SFU_API_BACKOFF_MAX', 4))
+    SFU_API_BREAKER_THRESHOLD = int(os.getenv('SFU_API_BREAKER_THRESHOLD', 5))
+    SFU_API_BREAKER_COOLDOWN = float(os.getenv('SFU_API_BREAKER_COOLDOWN', 30))
+    # Upstream response cache
+    SFU_API_CACHE_MAX_BYTES = int(os.getenv('SFU_API_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+    SFU_API_CACHE_SHARED = os.getenv('SFU_API_CACHE_SHARED', 'false').lower() == 'true'
+    SFU_API_CACHE_TTL_TERMS = int(os.getenv('SFU_API_CACHE_TTL_TERMS', 24 * 60 * 60))
+    SFU_API_CACHE_TTL_DEPARTMENTS = int(os.getenv('SFU_API_CACHE_TTL_DEPARTMENTS', 12 * 60 * 60))
+    SFU_API_CACHE_TTL_COURSES = int(os.getenv('SFU_API_CACHE_TTL_COURSES', 6 * 60 * 60))
+    SFU_API_CACHE_TTL_SECTIONS = int(os.getenv('SFU_API_CACHE_TTL_SECTIONS', 60 * 60))
+    # Offline term snapshot served by /api/sfuapi
+    SFU_SNAPSHOT_ENABLED = os.getenv('SFU_SNAPSHOT_ENABLED', 'false').lower() == 'true'
+    # Schedule generator limits
+    SCHEDULE_GENERATOR_MAX_RESULTS = int(os.getenv('SCHEDULE_GENERATOR_MAX_RESULTS', 100))
+    SCHEDULE_GENERATOR_TIME_BUDGET = float(os.getenv('SCHEDULE_GENERATOR_TIME_BUDGET', 0.5))
+    # Debug-only endpoints such as the sampling profiler
+    DEBUG_ENDPOINTS_ENABLED = os.getenv('DEBUG_ENDPOINTS_ENABLED', 'false').lower() == 'true'
+    # RateMyProfessor lookups
+    RMP_SCHOOL_NAME = os.getenv('RMP_SCHOOL_NAME', 'Simon Fraser University')
+    RMP_CACHE_TTL = int(os.getenv('RMP_CACHE_TTL', 7 * 24 * 60 * 60))
+    RMP_NEGATIVE_CACHE_TTL = int(os.getenv('RMP_NEGATIVE_CACHE_TTL', 24 * 60 * 60))
+    RMP_MAX_CONCURRENCY = int(os.getenv('RMP_MAX_CONCURRENCY', 8))
+    RMP_BATCH_MAX_NAMES = int(os.getenv('RMP_BATCH_MAX_NAMES', 50))
+    # CourseDiggers grade distributions
+    CD_CACHE_TTL = int(os.getenv('CD_CACHE_TTL', 24 * 60 * 60))
+    CD_CACHE_MAX_BYTES = int(os.getenv('CD_CACHE_MAX_BYTES', 8 * 1024 * 1024))
+    CD_BATCH_MAX_COURSES = int(os.getenv('CD_BATCH_MAX_COURSES', 50))
+    # In-memory section search index, rebuilt from the snapshot after this many seconds
+    SECTION_INDEX_TTL = int(os.getenv('SECTION_INDEX_TTL', 15 * 60))
+    # Seconds between checks of the snapshot for courses whose requisites changed
+    PREREQ_GRAPH_REFRESH = int(os.getenv('PREREQ_GRAPH_REFRESH', 5 * 60))
+    # HTTP caching and compression of read endpoints
+    HTTP_COMPRESSION_MIN_BYTES = int(os.getenv('HTTP_COMPRESSION_MIN_BYTES', 1024))
+    HTTP_COMPRESSION_CACHE_BYTES = int(os.getenv('HTTP_COMPRESSION_CACHE_BYTES', 16 * 1024 * 1024))
+    # Background cache warm-up for the current and next terms
+    PREFETCH_ENABLED = os.getenv('PREFETCH_ENABLED', 'false').lower() == 'true'
+    PREFETCH_INTERVAL = int(os.getenv('PREFETCH_INTERVAL', 10 * 60))
+    PREFETCH_MAX_QPS = float(os.getenv('PREFETCH_MAX_QPS', 5))
+    PREFETCH_POPULAR_COURSES = int(os.getenv('PREFETCH_POPULAR_COURSES', 50))
+    # Distinct requested courses remembered between prefetch runs
+    PREFETCH_MAX_TRACKED = int(os.getenv('PREFETCH_MAX_TRACKED', 5000))
+    # Processed course offerings, kept in compact packed form
+    COURSE_CACHE_MAX_BYTES = int(os.getenv('COURSE_CACHE_MAX_BYTES', 16 * 1024 * 1024))
+    SFU_BATCH_MAX_ITEMS = int(os.getenv('SFU_BATCH_MAX_ITEMS', 20))
 
+    # Coalescing of identical in-flight course computations
+    SINGLE_FLIGHT_SHARED = os.getenv('SINGLE_FLIGHT_SHARED', 'false').lower() == 'true'
+    SINGLE_FLIGHT_LOCK_TTL = float(os.getenv('SINGLE_FLIGHT_LOCK_TTL', 30))
+    SINGLE_FLIGHT_RESULT_TTL = float(os.getenv('SINGLE_FLIGHT_RESULT_TTL', 10))
+    # Readiness probe
+    READY_UPSTREAM_TIMEOUT = float(os.getenv('READY_UPSTREAM_TIMEOUT', 2))
+    READY_UPSTREAM_CHECK_INTERVAL = float(os.getenv('READY_UPSTREAM_CHECK_INTERVAL', 10))
+    READY_REQUIRE_UPSTREAM = os.getenv('READY_REQUIRE_UPSTREAM', 'false').lower() == 'true'
+    # Memory-mapped term catalogs exported from the snapshot (one <termCode>.sfucat per term)
+    CATALOG_DIR = os.getenv('CATALOG_DIR', '')
+    CATALOG_CHECK_INTERVAL = float(os.getenv('CATALOG_CHECK_INTERVAL', 30))
+    CATALOG_PRELOAD = os.getenv('CATALOG_PRELOAD', 'false').lower() == 'true'
+    # iCalendar export
+    ICS_CACHE_MAX_BYTES = int(os.getenv('ICS_CACHE_MAX_BYTES', 8 * 1024 * 1024))
+    # Admission control: per-client token buckets and per-route-class concurrency limits
+    ADMISSION_ENABLED = os.getenv('ADMISSION_ENABLED', 'true').lower() == 'true'
+    ADMISSION_CHEAP_RATE = float(os.getenv('ADMISSION_CHEAP_RATE', 20))
+    ADMISSION_CHEAP_BURST = float(os.getenv('ADMISSION_CHEAP_BURST', 120))
+    ADMISSION_CHEAP_CONCURRENCY = int(os.getenv('ADMISSION_CHEAP_CONCURRENCY', 32))
+    ADMISSION_CHEAP_QUEUE = int(os.getenv('ADMISSION_CHEAP_QUEUE', 64))
+    ADMISSION_CHEAP_QUEUE_TIMEOUT = float(os.getenv('ADMISSION_CHEAP_QUEUE_TIMEOUT', 1))
+    ADMISSION_EXPENSIVE_RATE = float(os.getenv('ADMISSION_EXPENSIVE_RATE', 2))
+    ADMISSION_EXPENSIVE_BURST = float(os.getenv('ADMISSION_EXPENSIVE_BURST', 20))
+    ADMISSION_EXPENSIVE_CONCURRENCY = int(os.getenv('ADMISSION_EXPENSIVE_CONCURRENCY', 8))
+    ADMISSION_EXPENSIVE_QUEUE = int(os.getenv('ADMISSION_EXPENSIVE_QUEUE', 16))
+    ADMISSION_EXPENSIVE_QUEUE_TIMEOUT = float(os.getenv('ADMISSION_EXPENSIVE_QUEUE_TIMEOUT', 2))
+    # Startup: import lazily loaded modules up front (for pre-fork servers), and the benchmark's budget
+    APP_PRELOAD = os.getenv('APP_PRELOAD', 'false').lower() == 'true'
+    STARTUP_BUDGET_MS = float(os.getenv('STARTUP_BUDGET_MS', 1500))
+    # 'wsgi' runs the Flask app on its own; 'asgi' runs it under uvicorn, with the grade and
+    # schedule routes served natively on the event loop and the rest on a thread pool
+    SERVER_MODE = os.getenv('SERVER_MODE', 'wsgi').lower()
+    ASGI_WSGI_THREADS = int(os.getenv('ASGI_WSGI_THREADS', 32))
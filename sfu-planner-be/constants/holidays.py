@@ -1,16 +1,38 @@
 import datetime
+import functools
+from dateutil.easter import easter
+from dateutil.relativedelta import relativedelta, MO
+
+
+def nth_weekday(year, month, weekday, n):
+    # e.g. the 3rd Monday of February
+    return datetime.date(year, month, 1) + relativedelta(weekday=weekday(n))
+
+
+@functools.lru_cache(maxsize=None)
+def bc_holidays(year):
+    """BC statutory holidays for a year, as dates, with weekend fixed-date holidays moved to the next weekday."""
+    fixed = [
+        datetime.date(year, 1, 1),    # New Year's Day
+        datetime.date(year, 7, 1),    # Canada Day
+        datetime.date(year, 11, 11),  # Remembrance Day
+        datetime.date(year, 12, 25),  # Christmas Day
+        datetime.date(year, 12, 26),  # Boxing Day
+    ]
+    if year >= 2023:
+        fixed.append(datetime.date(year, 9, 30))  # National Day for Truth and Reconciliation
+
+    holidays = {
+        nth_weekday(year, 2, MO, 3),                                   # BC Family Day
+        easter(year) - datetime.timedelta(days=2),                     # Good Friday
+        datetime.date(year, 5, 24) - relativedelta(weekday=MO(-1)),    # Victoria Day, the Monday before May 25
+        nth_weekday(year, 8, MO, 1),                                   # BC Day
+        nth_weekday(year, 9, MO, 1),                                   # Labour Day
+        nth_weekday(year, 10, MO, 2),                                  # Thanksgiving
+    }
+    for day in sorted(fixed):
+        while day.weekday() >= 5 or day in holidays:
+            day += datetime.timedelta(days=1)
+        holidays.add(day)
+    return frozenset(holidays)
 
-# Define BC statutory holidays for 2024
-bc_holidays_2024 = {
-    datetime.datetime(2024, 1, 1),  # New Year's Day
-    datetime.datetime(2024, 2, 12), # BC Family Day
-    datetime.datetime(2024, 4, 1),  # Good Friday
-    datetime.datetime(2024, 5, 20), # Victoria Day
-    datetime.datetime(2024, 7, 1),  # Canada Day
-    datetime.datetime(2024, 8, 5),  # BC Day
-    datetime.datetime(2024, 9, 2),  # Labour Day
-    datetime.datetime(2024, 10, 14),# Thanksgiving
-    datetime.datetime(2024, 11, 11),# Remembrance Day
-    datetime.datetime(2024, 12, 25),# Christmas Day
-    datetime.datetime(2024, 12, 26) # Boxing Day
-}
\ No newline at end of file
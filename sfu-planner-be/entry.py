@@ -1,7 +1,16 @@
+from config import Config
 
-from app import create_app
-
-app = create_app()
+if Config.SERVER_MODE == 'asgi':
+    # Serve with an ASGI server, e.g. `uvicorn entry:app`
+    from app.async_app import create_asgi_app
+    app = create_asgi_app()
+else:
+    from app import create_app
+    app = create_app()
 
 if __name__ == "__main__":
-    app.run(debug=True)
\ No newline at end of file
+    if Config.SERVER_MODE == 'asgi':
+        import uvicorn
+        uvicorn.run(app, port=5000)
+    else:
+        app.run(debug=True)
@@ -0,0 +1,24 @@
+import argparse
+import logging
+from app import create_app
+from app.utils.snapshot import ingest_term, export_catalog
+from config import Config
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Crawl an SFU term into the local course catalog snapshot.")
+    parser.add_argument("term_codes", nargs="+", help="Term codes to ingest, e.g. 1247")
+    parser.add_argument("--full", action="store_true", help="Re-process every course instead of only changed ones")
+    parser.add_argument("--export-catalog", action="store_true", help="Also write each term's memory-mapped catalog file to CATALOG_DIR")
+    parser.add_argument("--export-only", action="store_true", help="Write the catalog files from the existing snapshot without crawling")
+    args = parser.parse_args()
+    if (args.export_catalog or args.export_only) and not Config.CATALOG_DIR:
+        parser.error("CATALOG_DIR must be set to export catalog files")
+
+    logging.basicConfig(level=logging.INFO)
+    app = create_app()
+    with app.app_context():
+        for term_code in args.term_codes:
+            if not args.export_only:
+                print(term_code, ingest_term(term_code, full=args.full))
+            if args.export_catalog or args.export_only:
+                print(term_code, "catalog entries:", export_catalog(term_code))
@@ -0,0 +1,78 @@
+import unittest
+from unittest import mock
+from flask import request
+from app import create_app
+from app.utils import admission
+from config import Config
+
+# Two saved schedules' worth of courses, each taught by a different professor
+COURSES = [(major, number, f'Professor {index}') for index, (major, number) in enumerate([
+    ('cmpt', '120'), ('cmpt', '125'), ('macm', '101'), ('math', '151'),
+    ('cmpt', '225'), ('cmpt', '210'), ('math', '232'), ('stat', '270'),
+    ('cmpt', '276'), ('cmpt', '295'), ('cmpt', '300'), ('cmpt', '307'),
+    ('macm', '201'), ('math', '240'), ('cmpt', '354'), ('phil', '100'),
+])]
+
+
+def page_load():
+    """The requests the frontend makes opening the planner and two saved 8-course schedules.
+
+    Every course card in a schedule looks up its professor's rating and the course's
+    grades. The frontend leaves off the trailing slash, so each lookup is also
+    preceded by a redirect.
+    """
+    requests = [('GET', '/api/user/uuid'), ('GET', '/api/terms/terms'), ('GET', '/api/user/'),
+                ('GET', '/api/sfuapi/?termCode=1247'), ('GET', '/api/sfuapi/?termCode=1247&major=cmpt')]
+    for major, number, professor in COURSES:
+        requests.append(('GET', f'/api/sfuapi/?termCode=1247&major={major}&course={number}'))
+        for path in (f'/api/rmp?name={professor}', f'/api/cd?course={major.upper()} {number}'):
+            requests.append(('GET', path))
+            requests.append(('GET', path.replace('?', '/?', 1)))
+    return requests
+
+
+class AdmissionTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_app()
+
+    def setUp(self):
+        # Fresh buckets, so tests don't spend each other's tokens
+        buckets = {
+            'cheap': admission.TokenBuckets(Config.ADMISSION_CHEAP_RATE, Config.ADMISSION_CHEAP_BURST),
+            'expensive': admission.TokenBuckets(Config.ADMISSION_EXPENSIVE_RATE, Config.ADMISSION_EXPENSIVE_BURST),
+        }
+        patcher = mock.patch.dict(admission.buckets, buckets)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def replay(self, requests, client='page-load-client'):
+        """Admit each request in turn, as fast as possible; returns the statuses of those shed."""
+        rejected = []
+        for method, path in requests:
+            with self.app.test_request_context(path, method=method, headers={'Cookie': f'user_uuid={client}'}):
+                queue, rejection = admission.admit(request)
+                if rejection is not None:
+                    rejected.append((path, rejection[0]))
+                elif queue is not None:
+                    queue.release()
+        return rejected
+
+    def test_page_load_is_not_shed(self):
+        self.assertEqual(self.replay(page_load()), [])
+
+    def test_single_rating_is_cheap_and_batch_is_expensive(self):
+        with self.app.test_request_context('/api/rmp/?name=Jane Doe'):
+            self.assertEqual(admission.route_class(request), 'cheap')
+        with self.app.test_request_context('/api/rmp/batch', method='POST'):
+            self.assertEqual(admission.route_class(request), 'expensive')
+
+    def test_rating_batches_are_still_rate_limited(self):
+        rejected = self.replay([('POST', '/api/rmp/batch')] * int(Config.ADMISSION_EXPENSIVE_BURST + 10))
+        self.assertTrue(rejected)
+        self.assertEqual({status for _, status in rejected}, {429})
+
+
+if __name__ == '__main__':
+    unittest.main()
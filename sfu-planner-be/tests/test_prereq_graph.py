@@ -0,0 +1,104 @@
+import unittest
+from app.utils.prereq_graph import PrereqGraph, parse_requirements
+
+
+class ParseRequirementsTest(unittest.TestCase):
+    # Requisite text as it appears in SFU course outlines
+
+    def test_alternatives_and_requirements(self):
+        self.assertEqual(
+            parse_requirements("CMPT 125 or CMPT 135, and MACM 101, all with a minimum grade of C-."),
+            [['MACM 101'], ['CMPT 125', 'CMPT 135']],
+        )
+
+    def test_parenthesised_groups(self):
+        self.assertEqual(
+            parse_requirements(
+                "CMPT 225 and (MACM 201 or CMPT 210) and (MATH 150 or MATH 151 or MATH 154 or MATH 157) "
+                "and (MATH 232 or MATH 240), all with a minimum grade of C-."
+            ),
+            [['CMPT 225'], ['CMPT 210', 'MACM 201'], ['MATH 232', 'MATH 240'],
+             ['MATH 150', 'MATH 151', 'MATH 154', 'MATH 157']],
+        )
+
+    def test_or_of_ands_is_distributed(self):
+        self.assertEqual(
+            parse_requirements(
+                "(MACM 101 and (CMPT 125 or CMPT 135)) or (ENSC 251 and ENSC 252), all with a minimum grade of C-."
+            ),
+            [['ENSC 251', 'MACM 101'], ['ENSC 252', 'MACM 101'],
+             ['CMPT 125', 'CMPT 135', 'ENSC 251'], ['CMPT 125', 'CMPT 135', 'ENSC 252']],
+        )
+
+    def test_bare_numbers_in_a_list_share_the_department(self):
+        self.assertEqual(
+            parse_requirements("MATH 150, 151 or 154, with a minimum grade of C-."),
+            [['MATH 150', 'MATH 151', 'MATH 154']],
+        )
+
+    def test_prose_is_not_read_as_courses(self):
+        self.assertEqual(
+            parse_requirements("Completion of 60 units including CMPT 225 and one 300-level CMPT course."),
+            [['CMPT 225']],
+        )
+        self.assertEqual(
+            parse_requirements("Grade of C- or better in CMPT 120 or CMPT 130."),
+            [['CMPT 120', 'CMPT 130']],
+        )
+
+    def test_alternatives_that_are_not_courses_make_the_group_optional(self):
+        self.assertEqual(parse_requirements("CMPT 120 or permission of the instructor."), [])
+        self.assertEqual(parse_requirements("CMPT 120 (or equivalent)."), [])
+        self.assertEqual(
+            parse_requirements(
+                "BC Math 12 (or equivalent) with a grade of at least B, or MATH 100 with a grade of at least C-."
+            ),
+            [],
+        )
+        self.assertEqual(
+            parse_requirements(
+                "Pre-Calculus 12 (or equivalent) with a grade of at least A, or MATH 100 with a grade of at "
+                "least B, or achieving a satisfactory grade on the Simon Fraser University Calculus Readiness Test."
+            ),
+            [],
+        )
+
+    def test_empty(self):
+        self.assertEqual(parse_requirements(""), [])
+        self.assertEqual(parse_requirements(None), [])
+
+
+class PrereqGraphTest(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = PrereqGraph('1247')
+        self.graph.update({
+            'CMPT 120': {'prerequisites': [], 'corequisites': [['MATH 150']]},
+            'CMPT 125': {'prerequisites': [['CMPT 120', 'CMPT 130']], 'corequisites': []},
+            'MACM 101': {'prerequisites': [], 'corequisites': []},
+            'CMPT 225': {'prerequisites': [['MACM 101'], ['CMPT 125', 'CMPT 135']], 'corequisites': []},
+        })
+
+    def eligible(self, completed, **kwargs):
+        return sorted(result['course'] for result in self.graph.eligible(completed, **kwargs))
+
+    def test_eligible(self):
+        self.assertEqual(self.eligible(['CMPT 120']), ['CMPT 125'])
+        self.assertEqual(self.eligible(['CMPT 120', 'CMPT 125']), [])
+        self.assertEqual(self.eligible(['CMPT 125', 'MACM 101']), ['CMPT 225'])
+        self.assertEqual(self.eligible([], include_unrestricted=True), ['CMPT 120', 'MACM 101'])
+
+    def test_chain(self):
+        chain = self.graph.chain('CMPT 225')
+        self.assertEqual(chain['prerequisites'], [['MACM 101'], ['CMPT 125', 'CMPT 135']])
+        self.assertEqual(sorted(chain['chain']), ['CMPT 120', 'CMPT 125', 'CMPT 130', 'CMPT 135', 'MACM 101'])
+        self.assertIsNone(self.graph.chain('CMPT 999'))
+
+    def test_update_refreshes_dependent_closures(self):
+        self.graph.update({'CMPT 125': {'prerequisites': [['CMPT 105']], 'corequisites': []}})
+        self.assertEqual(sorted(self.graph.chain('CMPT 225')['chain']), ['CMPT 105', 'CMPT 125', 'CMPT 135', 'MACM 101'])
+        self.assertEqual(self.eligible(['CMPT 120']), [])
+
+
+if __name__ == '__main__':
+    unittest.main()